@@ -27,15 +27,22 @@ from lute.ankiexport.exceptions import AnkiExportConfigurationError
 
 
 class SentenceLookup:
-    "Sentence lookup, finds in a supplied dictionary or from db."
+    """
+    Sentence lookup, finds in a supplied dictionary or from db.
+
+    Sentences of the term_ids not in the dictionary are looked up
+    together, in one batch, the first time any of them is needed.
+    """
 
-    def __init__(self, default_sentences_by_term_id, references_repo):
+    def __init__(self, default_sentences_by_term_id, references_repo, term_ids=None):
         "init"
         sdict = {}
         for k, v in default_sentences_by_term_id.items():
             sdict[int(k)] = v
         self.default_sentences_by_term_id = sdict
         self.references_repo = references_repo
+        self._pending_term_ids = {int(t) for t in term_ids or []} - set(sdict)
+        self._found_sentences = {}
 
     def get_sentence_for_term(self, term_id):
         "Get sentence from the dict, or do a lookup."
@@ -43,11 +50,15 @@ class SentenceLookup:
         if tid in self.default_sentences_by_term_id:
             return self.default_sentences_by_term_id[tid]
 
-        refs = self.references_repo.find_references_by_id(term_id)
-        term_refs = refs["term"] or []
-        if len(term_refs) == 0:
-            return ""
-        return term_refs[0].sentence
+        if tid not in self._found_sentences:
+            self._pending_term_ids.add(tid)
+            refs = self.references_repo.find_references_for_terms(
+                self._pending_term_ids, limit_per_term=1
+            )
+            self._pending_term_ids = set()
+            for k, term_refs in refs.items():
+                self._found_sentences[k] = term_refs[0].sentence if term_refs else ""
+        return self._found_sentences.get(tid, "")
 
 
 def _all_terms(term):
@@ -199,7 +199,7 @@ class Service:
         repo = TermRepository(db_session)
 
         refsrepo = ReferencesRepository(db_session)
-        sentence_lookup = SentenceLookup(termid_sentences, refsrepo)
+        sentence_lookup = SentenceLookup(termid_sentences, refsrepo, term_ids)
 
         ret = {}
         for tid in term_ids:
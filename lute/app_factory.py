@@ -32,6 +32,7 @@ from lute.db.demo import Service as DemoService
 import lute.utils.formutils
 
 from lute.parse.registry import init_parser_plugins, supported_parsers
+from lute.parse.executor import parse_executor
 
 from lute.models.book import Book
 from lute.models.language import Language
@@ -42,6 +43,9 @@ from lute.settings.current import (
 )
 from lute.models.repositories import UserSettingRepository
 from lute.book.stats import Service as StatsService
+from lute.read.render.multiword_index_registry import multiword_index_registry
+from lute.read.render.page_cache import rendered_page_cache
+from lute.read.prefetch import page_prefetcher
 
 from lute.ankiexport.routes import bp as anki_bp
 from lute.book.routes import bp as book_bp
@@ -326,6 +330,13 @@ def _create_app(app_config, extra_config):
         db.create_all()
         add_default_user_settings(db.session, app_config.default_user_backup_path)
         refresh_global_settings(db.session)
+    # Cached indexes and pages may be from a different db.
+    page_prefetcher.cancel_pending()
+    page_prefetcher.wait()
+    multiword_index_registry.clear()
+    rendered_page_cache.clear()
+    rendered_page_cache.max_bytes = app_config.page_cache_mb * 1024 * 1024
+    parse_executor.workers = app_config.parse_workers
     app.db = db
 
     _add_base_routes(app, app_config)
@@ -15,52 +15,23 @@ def get_data_tables_list(parameters, is_archived, session):
         LgName,
         BkTitle,
         case when currtext.TxID is null then 1 else currtext.TxOrder end as PageNum,
-        textcounts.pagecount AS PageCount,
-        booklastopened.lastopeneddate AS LastOpenedDate,
+        BsPageCount AS PageCount,
+        BsLastOpenedDate AS LastOpenedDate,
         BkArchived,
-        tags.taglist AS TagList,
-        textcounts.wc AS WordCount,
+        BsTagList AS TagList,
+        BsWordCount AS WordCount,
         c.distinctterms as DistinctCount,
         c.distinctunknowns as UnknownCount,
         c.unknownpercent as UnknownPercent,
         c.status_distribution as StatusDistribution,
-        case when completed_books.BkID is null then 0 else 1 end as IsCompleted
+        BsIsCompleted as IsCompleted
 
     FROM books b
     INNER JOIN languages ON LgID = b.BkLgID
+    INNER JOIN booksummary ON BsBkID = b.BkID
     LEFT OUTER JOIN texts currtext ON currtext.TxID = BkCurrentTxID
-    INNER JOIN (
-        select TxBkID, max(TxStartDate) as lastopeneddate from texts group by TxBkID
-    ) booklastopened on booklastopened.TxBkID = b.BkID
-    INNER JOIN (
-        SELECT TxBkID, SUM(TxWordCount) as wc, COUNT(TxID) AS pagecount
-        FROM texts
-        GROUP BY TxBkID
-    ) textcounts on textcounts.TxBkID = b.BkID
     LEFT OUTER JOIN bookstats c on c.BkID = b.BkID
 
-    LEFT OUTER JOIN (
-        SELECT BtBkID as BkID, GROUP_CONCAT(T2Text, ', ') AS taglist
-        FROM
-        (
-            SELECT BtBkID, T2Text
-            FROM booktags bt
-            INNER JOIN tags2 t2 ON t2.T2ID = bt.BtT2ID
-            ORDER BY T2Text
-        ) tagssrc
-        GROUP BY BtBkID
-    ) AS tags ON tags.BkID = b.BkID
-
-    left outer join (
-      select texts.TxBkID as BkID
-      from texts
-      inner join (
-        /* last page in each book */
-        select TxBkID, max(TxOrder) as maxTxOrder from texts group by TxBkID
-      ) last_page on last_page.TxBkID = texts.TxBkID and last_page.maxTxOrder = texts.TxOrder
-      where TxReadDate is not null
-    ) completed_books on completed_books.BkID = b.BkID
-
     WHERE b.BkArchived = {archived}
       and languages.LgParserType in ({ supported_parser_type_criteria() })
     """
@@ -74,4 +45,6 @@ def get_data_tables_list(parameters, is_archived, session):
         base_sql += f" and LgID = {language_id}"
 
     connection = session.connection()
-    return DataTablesSqliteQuery.get_data(base_sql, parameters, connection)
+    return DataTablesSqliteQuery.get_data(
+        base_sql, parameters, connection, key_column="BkID"
+    )
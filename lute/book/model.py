@@ -3,6 +3,7 @@ Book domain objects.
 """
 
 from lute.models.book import BookTag, Book as DBBook, Text as DBText
+from lute.parse.executor import parse_executor
 from lute.models.repositories import (
     BookRepository,
     BookTagRepository,
@@ -33,13 +34,17 @@ def token_group_generator(tokens, group_type, threshold=500):
             return tok.is_end_of_paragraph
         raise RuntimeError("Unhandled type " + group_type)
 
+    current_count = 0
+    buff_count = 0
     for token in tokens:
         buff.append(token)
+        if token.is_word:
+            buff_count += 1
         if _matches_group_delimiter(token):
             current_group.extend(buff)
-            # pylint: disable=consider-using-generator
-            current_count = sum([1 for t in current_group if t.is_word])
+            current_count += buff_count
             buff = []
+            buff_count = 0
 
             # Yield if threshold exceeded.
             # Remove the final paragreph marker if it's there, it's not needed.
@@ -47,6 +52,7 @@ def token_group_generator(tokens, group_type, threshold=500):
                 current_group = trim_paras(current_group)
                 yield current_group
                 current_group = []
+                current_count = 0
 
     # Add any remaining tokens
     if buff:
@@ -154,35 +160,65 @@ class Repository:
         self.session.commit()
 
     def _split_text_at_page_breaks(self, txt):
-        "Break fulltext manually at lines consisting of '---' only."
+        "Yield fulltext segments, broken manually at lines consisting of '---' only."
         # Tried doing this with a regex without success.
-        segments = []
-        current_segment = ""
+        current_lines = []
         for line in txt.split("\n"):
             if line.strip() == "---":
-                segments.append(current_segment.strip())
-                current_segment = ""
+                yield "\n".join(current_lines).strip()
+                current_lines = []
             else:
-                current_segment += line + "\n"
-        if current_segment:
-            segments.append(current_segment.strip())
-        return segments
+                current_lines.append(line)
+        if current_lines:
+            yield "\n".join(current_lines).strip()
 
     def _split_pages(self, book, language):
-        "Split fulltext into pages, respecting sentences."
+        """
+        Yield the fulltext's pages, respecting sentences.
 
-        pages = []
+        The text is parsed incrementally, so the tokens of the whole
+        book are never in memory at once.
+        """
         for segment in self._split_text_at_page_breaks(book.text):
-            tokens = language.parser.get_parsed_tokens(segment, language)
+            tokens = language.parser.iter_parsed_tokens(segment, language)
             for toks in token_group_generator(
                 tokens, book.split_by, book.threshold_page_tokens
             ):
                 s = "".join([t.token for t in toks])
-                s = s.replace("\r", "").replace("¶", "\n")
-                pages.append(s.strip())
-        pages = [p for p in pages if p.strip() != ""]
+                s = s.replace("\r", "").replace("¶", "\n").strip()
+                if s != "":
+                    yield s
 
-        return pages
+    def _add_pages(self, dbbook, pages, language, batch_size=64):
+        """
+        Add Texts for the pages, parsing batches of them with the parse_executor.
+
+        Each batch is flushed to the db and dropped from the session, so
+        the Texts (and their token caches) of the whole book are never
+        in memory at once.  They're saved when the session commits.
+        """
+        order = 0
+        batch = []
+
+        def _add_batch():
+            nonlocal order
+            tokens = parse_executor.get_parsed_tokens_many(language, batch)
+            texts = []
+            for page, toks in zip(batch, tokens):
+                order += 1
+                texts.append(DBText(dbbook, page, order, toks))
+            batch.clear()
+            self.session.add_all(texts)
+            self.session.flush()
+            self.session.expire(dbbook, ["texts"])
+            for t in texts:
+                self.session.expunge(t)
+
+        for page in pages:
+            batch.append(page)
+            if len(batch) >= batch_size:
+                _add_batch()
+        _add_batch()
 
     def _build_db_book(self, book):
         "Convert a book business object to a DBBook."
@@ -199,10 +235,9 @@ class Repository:
 
         b = None
         if book.id is None:
-            pages = self._split_pages(book, lang)
             b = DBBook(book.title, lang)
-            for index, page in enumerate(pages):
-                _ = DBText(b, page, index + 1)
+            self.session.add(b)
+            self._add_pages(b, self._split_pages(book, lang), lang)
         else:
             b = self.book_repo.find(book.id)
 
@@ -5,7 +5,7 @@ Book statistics.
 import json
 from sqlalchemy import select, text
 from lute.read.render.service import Service as RenderService
-from lute.models.book import Book, BookStats
+from lute.models.book import Book, BookStats, Text
 from lute.models.repositories import UserSettingRepository
 
 # from lute.utils.debug_helpers import DebugTimer
@@ -56,7 +56,8 @@ class Service:
         mw = service.get_multiword_indexer(book.language)
         textitems = []
         for tx in texts:
-            textitems.extend(service.get_textitems(tx.text, book.language, mw))
+            toks = tx.get_parsed_tokens()
+            textitems.extend(service.get_textitems(tx.text, book.language, mw, toks))
         # # Old slower code:
         # text_sample = "\n".join([t.text for t in texts])
         # paras = get_paragraphs(text_sample, book.language) ... etc.
@@ -88,6 +89,10 @@ class Service:
             self.session.query(Book).filter(~Book.id.in_(book_ids_with_stats)).all()
         )
         books = [b for b in books_to_update if b.is_supported]
+        # Parse all the sample pages up front, possibly in parallel.
+        Text.load_parsed_tokens(
+            [t for book in books for t in self._get_sample_texts(book)]
+        )
         for book in books:
             stats = self._calculate_stats(book)
             self._update_stats(book, stats)
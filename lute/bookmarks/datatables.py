@@ -16,4 +16,6 @@ def get_data_tables_list(parameters, book_id, session):
     """
 
     connection = session.connection()
-    return DataTablesSqliteQuery.get_data(base_sql, parameters, connection)
+    return DataTablesSqliteQuery.get_data(
+        base_sql, parameters, connection, key_column="TbID"
+    )
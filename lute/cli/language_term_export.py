@@ -14,7 +14,7 @@ haber; 100; 1500; book1,book2; to exist; 99; hay (500), he (200), has (150) ...
 
 import csv
 from lute.db import db
-from lute.models.book import Book
+from lute.models.book import Book, Text
 from lute.read.render.service import Service
 
 
@@ -55,11 +55,14 @@ def _process_book(b, terms, multiword_indexer):
     print(f"Processing {b.title} ...")
     i = 0
     service = Service(db.session)
+    Text.load_parsed_tokens(b.texts)
     for text in b.texts:
         i += 1
         if i % 10 == 0:
             print(f"  page {i} of {b.page_count}", end="\r")
-        textitems = service.get_textitems(text.text, b.language, multiword_indexer)
+        textitems = service.get_textitems(
+            text.text, b.language, multiword_indexer, text.get_parsed_tokens()
+        )
         displayed_terms = [
             ti.term for ti in textitems if ti.is_word and ti.term is not None
         ]
@@ -68,6 +68,13 @@ class AppConfig:  # pylint: disable=too-many-instance-attributes
             "BACKUP_PATH", os.path.join(self.datapath, "backups")
         )
 
+        # Memory budget for the rendered page cache, in MB (0 = off).
+        self.page_cache_mb = int(config.get("PAGE_CACHE_MB", 32))
+
+        # Worker processes for parsing during bulk operations
+        # (0 or 1 = parse in the main process).
+        self.parse_workers = int(config.get("PARSE_WORKERS", 0))
+
     def _get_appdata_dir(self):
         "Get user's appdata directory from platformdirs."
         dirs = PlatformDirs("Lute3", "Lute3")
@@ -7,7 +7,7 @@ These cleanup routines will be called by the app_factory.
 
 from sqlalchemy import select, text as sqltext
 from lute.models.language import Language
-from lute.models.book import Text, Sentence
+from lute.models.book import Text, Sentence, sentence_index_tokens, sqlite_lower
 from lute.models.term import TermImage
 
 
@@ -52,10 +52,11 @@ def _set_texts_word_count(session, output_function):
         return
 
     output_function(f"Fixing word counts for {len(recalc)} Texts.")
+    Text.load_parsed_tokens(recalc)
     pr = ProgressReporter(len(recalc), output_function)
     for t in recalc:
         pr.increment()
-        pt = t.book.language.get_parsed_tokens(t.text)
+        pt = t.get_parsed_tokens()
         words = [w for w in pt if w.is_word]
         t.word_count = len(words)
         session.add(t)
@@ -139,6 +140,57 @@ def _load_sentence_textlc(session, output_function):
     output_function("Done.")
 
 
+def _index_sentence_tokens(session, output_function):
+    """
+    The sentencetokens index was added after deployment, need to
+    load it for existing sentences.
+
+    Sentences without SeTextLC can't be found by reference lookups
+    anyway, and are indexed when their SeTextLC is loaded.  Sentences
+    with only spaces have nothing to index, and are skipped.
+    """
+
+    base_sql = """
+    select SeID, SeText, SeTextLC
+    from sentences
+    where SeText is not null
+    and SeTextLC is not null
+    and trim(replace(SeText, char(8203), ''), ' ') <> ''
+    and not exists (select 1 from sentencetokens where SxSeID = SeID)
+    """
+
+    count = session.execute(sqltext(f"select count(*) from ({base_sql}) src")).scalar()
+    if count == 0:
+        return
+
+    output_function(f"Indexing {count} sentences.")
+    batch_size = 1000
+    pr = ProgressReporter(count, output_function, report_every=batch_size)
+    insert_sql = sqltext(
+        "insert or ignore into sentencetokens (SxTokenLC, SxSeID) values (:t, :s)"
+    )
+    last_batch_ids = []
+    recs = session.execute(sqltext(f"{base_sql} limit {batch_size}")).all()
+    while len(recs) > 0:
+        curr_batch_ids = [rec[0] for rec in recs]
+        if last_batch_ids == curr_batch_ids:
+            raise RuntimeError("Sentences not getting indexed correctly.")
+
+        params = []
+        for seid, setext, setextlc in recs:
+            pr.increment()
+            lc = sqlite_lower(setext) if setextlc == "*" else setextlc
+            params.extend({"t": t, "s": seid} for t in sentence_index_tokens(lc))
+        if len(params) > 0:
+            session.execute(insert_sql, params)
+        session.commit()
+
+        last_batch_ids = curr_batch_ids
+        recs = session.execute(sqltext(f"{base_sql} limit {batch_size}")).all()
+
+    output_function("Done.")
+
+
 def _update_term_images(session, output_function):
     """
     Fix TermImage sources (ref https://github.com/LuteOrg/lute-v3/issues/582)
@@ -188,4 +240,5 @@ def clean_data(session, output_function):
     "Clean all data as required, sending messages to output_function."
     _set_texts_word_count(session, output_function)
     _load_sentence_textlc(session, output_function)
+    _index_sentence_tokens(session, output_function)
     _update_term_images(session, output_function)
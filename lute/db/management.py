@@ -8,6 +8,7 @@ from flask import current_app
 from lute.models.setting import UserSetting
 from lute.settings.hotkey_data import initial_hotkey_defaults
 from lute.models.repositories import UserSettingRepository
+from lute.read.render.page_cache import rendered_page_cache
 
 
 def delete_all_data(session):
@@ -28,6 +29,7 @@ def delete_all_data(session):
     for s in statements:
         session.execute(text(s))
     session.commit()
+    rendered_page_cache.clear()
     add_default_user_settings(session, current_app.env_config.default_user_backup_path)
 
 
@@ -101,6 +103,7 @@ def add_default_user_settings(session, default_user_backup_path):
         "open_popup_in_new_tab": False,
         "stop_audio_on_term_form_open": True,
         "stats_calc_sample_size": 5,
+        "read_prefetch_pages": 1,
         # Term popups:
         "term_popup_promote_parent_translation": True,
         "term_popup_show_components": True,
@@ -0,0 +1,4 @@
+-- The TextTokenCache key (text and parser settings hash) that the
+-- text's sentences were built from, so that sentences are only rebuilt
+-- if the text or the parser settings change.
+alter table texts add column TxSentencesKey VARCHAR(40) null;
@@ -0,0 +1,5 @@
+-- For finding terms' children, e.g. in term searches.  The index
+-- created in 20230621_224416_fk_09_wordparents.sql was lost when
+-- wordparents was recreated.
+
+CREATE INDEX IF NOT EXISTS "WpParentWoID" ON "wordparents" ("WpParentWoID");
@@ -0,0 +1,14 @@
+-- Book listing data, so the listing doesn't aggregate all texts on
+-- each request.  Rows are kept current by triggers, see
+-- migrations_repeatable/trig_booksummary.sql.
+
+CREATE TABLE IF NOT EXISTS "booksummary" (
+       "BsBkID" INTEGER NOT NULL,
+       "BsPageCount" INTEGER NOT NULL,
+       "BsWordCount" INTEGER NULL,
+       "BsLastOpenedDate" DATETIME NULL,
+       "BsIsCompleted" TINYINT NOT NULL,
+       "BsTagList" TEXT NULL,
+       PRIMARY KEY ("BsBkID"),
+       FOREIGN KEY("BsBkID") REFERENCES "books" ("BkID") ON DELETE CASCADE
+);
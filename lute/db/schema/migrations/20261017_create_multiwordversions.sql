@@ -0,0 +1,11 @@
+-- Version of each language's multiword terms, bumped by triggers (see
+-- migrations_repeatable/trig_multiwordversions.sql) whenever one is
+-- added, deleted or changed.  The multiword index registry compares
+-- it with its cached indexes to find stale ones.  Languages with no
+-- row are at version 0.
+
+CREATE TABLE IF NOT EXISTS "multiwordversions" (
+       "MvLgID" INTEGER NOT NULL,
+       "MvVersion" INTEGER NOT NULL,
+       PRIMARY KEY ("MvLgID")
+);
@@ -0,0 +1,15 @@
+-- Inverted index of sentences: each distinct lowercased token of each
+-- sentence, so term references don't need to scan all sentences.
+-- Existing sentences are indexed by data_cleanup.
+
+CREATE TABLE IF NOT EXISTS "sentencetokens" (
+       "SxTokenLC" TEXT NOT NULL,
+       "SxSeID" INTEGER NOT NULL,
+       PRIMARY KEY ("SxTokenLC", "SxSeID"),
+       FOREIGN KEY("SxSeID") REFERENCES "sentences" ("SeID") ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS "SxSeID" ON "sentencetokens" ("SxSeID");
+
+-- For page counts of books.
+CREATE INDEX IF NOT EXISTS "TxBkID" ON "texts" ("TxBkID");
@@ -0,0 +1,11 @@
+-- Parsed tokens for each text, so pages aren't re-parsed every time
+-- they're opened.  TcKey identifies the text content and parser
+-- settings used, the cache is stale if it doesn't match.
+
+CREATE TABLE IF NOT EXISTS "texttokencache" (
+       "TcTxID" INTEGER NOT NULL,
+       "TcKey" VARCHAR(40) NOT NULL,
+       "TcTokens" BLOB NOT NULL,
+       PRIMARY KEY ("TcTxID"),
+       FOREIGN KEY("TcTxID") REFERENCES "texts" ("TxID") ON DELETE CASCADE
+);
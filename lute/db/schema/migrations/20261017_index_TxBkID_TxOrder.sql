@@ -0,0 +1,7 @@
+-- For the last page of a book, see
+-- migrations_repeatable/trig_booksummary.sql.  Not unique, pages are
+-- reordered; it covers index TxBkID, which is replaced.
+
+DROP INDEX IF EXISTS "TxBkID";
+
+CREATE INDEX IF NOT EXISTS "TxBkID_TxOrder" ON "texts" ("TxBkID", "TxOrder");
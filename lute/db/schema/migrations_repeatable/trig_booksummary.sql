@@ -0,0 +1,161 @@
+-- Keep booksummary rows current: when a book's texts or tags change,
+-- its row is reloaded from booksummarydata.  Books without texts have
+-- no row.
+
+DROP VIEW IF EXISTS booksummarydata;
+
+CREATE VIEW booksummarydata AS
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+SELECT
+    BkID,
+    (SELECT COUNT(*) FROM texts WHERE TxBkID = BkID) AS PageCount,
+    (SELECT SUM(TxWordCount) FROM texts WHERE TxBkID = BkID) AS WordCount,
+    (SELECT MAX(TxStartDate) FROM texts WHERE TxBkID = BkID) AS LastOpenedDate,
+
+    /* last page has been read */
+    EXISTS (
+        SELECT 1 FROM texts
+        WHERE TxBkID = BkID AND TxReadDate IS NOT NULL
+        AND TxOrder = (SELECT MAX(TxOrder) FROM texts WHERE TxBkID = BkID)
+    ) AS IsCompleted,
+
+    (
+        SELECT GROUP_CONCAT(T2Text, ', ')
+        FROM (
+            SELECT T2Text
+            FROM booktags bt
+            INNER JOIN tags2 t2 ON t2.T2ID = bt.BtT2ID
+            WHERE BtBkID = BkID
+            ORDER BY T2Text
+        ) tagssrc
+    ) AS TagList
+
+FROM books
+WHERE EXISTS (SELECT 1 FROM texts WHERE TxBkID = BkID);
+
+
+-- Load missing rows, e.g. for books that existed before booksummary.
+INSERT INTO booksummary (
+    BsBkID, BsPageCount, BsWordCount, BsLastOpenedDate, BsIsCompleted, BsTagList
+)
+SELECT * FROM booksummarydata
+WHERE BkID NOT IN (SELECT BsBkID FROM booksummary);
+
+
+-- Pages are inserted and deleted a book at a time (imports, book
+-- deletes), so the insert and delete triggers adjust the counts
+-- rather than reload the row.
+
+DROP TRIGGER IF EXISTS trig_texts_after_insert_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_texts_after_insert_booksummary;
+
+CREATE TRIGGER trig_texts_after_insert_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER INSERT ON texts
+BEGIN
+    UPDATE booksummary
+    SET
+        BsPageCount = BsPageCount + 1,
+        BsWordCount = COALESCE(BsWordCount + new.TxWordCount, BsWordCount, new.TxWordCount),
+        BsLastOpenedDate = COALESCE(
+            MAX(BsLastOpenedDate, new.TxStartDate), BsLastOpenedDate, new.TxStartDate
+        ),
+        BsIsCompleted = (SELECT IsCompleted FROM booksummarydata WHERE BkID = new.TxBkID)
+    WHERE BsBkID = new.TxBkID;
+
+    INSERT INTO booksummary SELECT * FROM booksummarydata
+    WHERE BkID = new.TxBkID
+    AND NOT EXISTS (SELECT 1 FROM booksummary WHERE BsBkID = new.TxBkID);
+END;
+
+
+DROP TRIGGER IF EXISTS trig_texts_after_update_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_texts_after_update_booksummary;
+
+CREATE TRIGGER trig_texts_after_update_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER UPDATE OF TxBkID, TxOrder, TxReadDate, TxWordCount ON texts
+BEGIN
+    DELETE FROM booksummary WHERE BsBkID IN (old.TxBkID, new.TxBkID);
+    INSERT INTO booksummary SELECT * FROM booksummarydata
+    WHERE BkID IN (old.TxBkID, new.TxBkID);
+END;
+
+
+-- Opening a page only changes the last opened date.
+DROP TRIGGER IF EXISTS trig_texts_after_update_TxStartDate_booksummary;
+
+CREATE TRIGGER trig_texts_after_update_TxStartDate_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER UPDATE OF TxStartDate ON texts
+BEGIN
+    UPDATE booksummary
+    SET BsLastOpenedDate = (
+        SELECT MAX(TxStartDate) FROM texts WHERE TxBkID = new.TxBkID
+    )
+    WHERE BsBkID = new.TxBkID;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_texts_after_delete_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_texts_after_delete_booksummary;
+
+CREATE TRIGGER trig_texts_after_delete_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER DELETE ON texts
+BEGIN
+    DELETE FROM booksummary
+    WHERE BsBkID = old.TxBkID
+    AND NOT EXISTS (SELECT 1 FROM texts WHERE TxBkID = old.TxBkID);
+
+    UPDATE booksummary
+    SET
+        BsPageCount = BsPageCount - 1,
+        BsWordCount = BsWordCount - COALESCE(old.TxWordCount, 0),
+        BsLastOpenedDate = CASE
+            WHEN old.TxStartDate IS NULL OR old.TxStartDate < BsLastOpenedDate
+            THEN BsLastOpenedDate
+            ELSE (SELECT LastOpenedDate FROM booksummarydata WHERE BkID = old.TxBkID)
+        END,
+        BsIsCompleted = (SELECT IsCompleted FROM booksummarydata WHERE BkID = old.TxBkID)
+    WHERE BsBkID = old.TxBkID;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_booktags_after_insert_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_booktags_after_insert_booksummary;
+
+CREATE TRIGGER trig_booktags_after_insert_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER INSERT ON booktags
+BEGIN
+    UPDATE booksummary
+    SET BsTagList = (SELECT TagList FROM booksummarydata WHERE BkID = new.BtBkID)
+    WHERE BsBkID = new.BtBkID;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_booktags_after_delete_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_booktags_after_delete_booksummary;
+
+CREATE TRIGGER trig_booktags_after_delete_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER DELETE ON booktags
+BEGIN
+    UPDATE booksummary
+    SET BsTagList = (SELECT TagList FROM booksummarydata WHERE BkID = old.BtBkID)
+    WHERE BsBkID = old.BtBkID;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_tags2_after_update_T2Text_delete_booksummary;
+DROP TRIGGER IF EXISTS trig_tags2_after_update_T2Text_booksummary;
+
+CREATE TRIGGER trig_tags2_after_update_T2Text_booksummary
+-- created by db/schema/migrations_repeatable/trig_booksummary.sql
+AFTER UPDATE OF T2Text ON tags2
+BEGIN
+    UPDATE booksummary
+    SET BsTagList = (SELECT TagList FROM booksummarydata WHERE BkID = BsBkID)
+    WHERE BsBkID IN (SELECT BtBkID FROM booktags WHERE BtT2ID = new.T2ID);
+END;
@@ -0,0 +1,43 @@
+-- Bump the language's multiword term version on any change to its
+-- multiword terms, however it's made (ORM, raw sql, cascades).
+
+DROP TRIGGER IF EXISTS trig_words_after_insert_multiwordversions;
+
+CREATE TRIGGER trig_words_after_insert_multiwordversions
+-- created by db/schema/migrations_repeatable/trig_multiwordversions.sql
+AFTER INSERT ON words
+WHEN new.WoTokenCount > 1
+BEGIN
+    INSERT INTO multiwordversions (MvLgID, MvVersion) VALUES (new.WoLgID, 1)
+    ON CONFLICT (MvLgID) DO UPDATE SET MvVersion = MvVersion + 1;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_words_after_delete_multiwordversions;
+
+CREATE TRIGGER trig_words_after_delete_multiwordversions
+-- created by db/schema/migrations_repeatable/trig_multiwordversions.sql
+AFTER DELETE ON words
+WHEN old.WoTokenCount > 1
+BEGIN
+    INSERT INTO multiwordversions (MvLgID, MvVersion) VALUES (old.WoLgID, 1)
+    ON CONFLICT (MvLgID) DO UPDATE SET MvVersion = MvVersion + 1;
+END;
+
+
+DROP TRIGGER IF EXISTS trig_words_after_update_multiwordversions;
+
+CREATE TRIGGER trig_words_after_update_multiwordversions
+-- created by db/schema/migrations_repeatable/trig_multiwordversions.sql
+AFTER UPDATE OF WoID, WoLgID, WoTextLC, WoTokenCount ON words
+WHEN (old.WoTokenCount > 1 OR new.WoTokenCount > 1)
+AND (old.WoID IS NOT new.WoID OR old.WoLgID IS NOT new.WoLgID
+     OR old.WoTextLC IS NOT new.WoTextLC
+     OR old.WoTokenCount IS NOT new.WoTokenCount)
+BEGIN
+    INSERT INTO multiwordversions (MvLgID, MvVersion)
+    SELECT DISTINCT lgid, 1 FROM (
+      SELECT old.WoLgID AS lgid UNION SELECT new.WoLgID
+    ) WHERE true
+    ON CONFLICT (MvLgID) DO UPDATE SET MvVersion = MvVersion + 1;
+END;
@@ -8,6 +8,10 @@ Database setup:
 Methods:
 
 - setup_db(app_config): setup a db with the given config.
+
+The optional trigram term search index (wordsfts) is also created
+here rather than in a migration, as it needs an sqlite with fts5
+and its trigram tokenizer (3.34+).
 """
 
 from contextlib import closing
@@ -135,6 +139,73 @@ class Setup:  # pylint: disable=too-few-public-methods
         conn.executescript(sql)
 
 
+# Triggers keeping the wordsfts index in sync with words.WoTextLC.
+_TERM_SEARCH_TRIGGERS = {
+    "trig_words_after_insert_add_wordsfts": """
+        AFTER INSERT ON words
+        BEGIN
+          INSERT INTO wordsfts(rowid, WoTextLC) VALUES (new.WoID, new.WoTextLC);
+        END""",
+    "trig_words_after_delete_remove_wordsfts": """
+        AFTER DELETE ON words
+        BEGIN
+          INSERT INTO wordsfts(wordsfts, rowid, WoTextLC)
+          VALUES ('delete', old.WoID, old.WoTextLC);
+        END""",
+    "trig_words_after_update_WoTextLC_update_wordsfts": """
+        AFTER UPDATE OF WoTextLC ON words
+        BEGIN
+          INSERT INTO wordsfts(wordsfts, rowid, WoTextLC)
+          VALUES ('delete', old.WoID, old.WoTextLC);
+          INSERT INTO wordsfts(rowid, WoTextLC) VALUES (new.WoID, new.WoTextLC);
+        END""",
+}
+
+
+def term_search_index_supported():
+    "True if this sqlite has fts5 with the trigram tokenizer."
+    with closing(sqlite3.connect(":memory:")) as conn:
+        try:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(a, tokenize='trigram')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+
+def setup_term_search_index(conn):
+    """
+    Create the wordsfts trigram index of words.WoTextLC and its
+    triggers, loading it if the triggers are new.
+
+    If this sqlite can't support the index, its triggers are dropped
+    (else changing words would fail), and term searches scan words.
+    """
+    existing = {
+        row[0]
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+    }
+    if not term_search_index_supported():
+        for name in _TERM_SEARCH_TRIGGERS:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.commit()
+        return
+
+    conn.execute(
+        """CREATE VIRTUAL TABLE IF NOT EXISTS wordsfts USING fts5(
+        WoTextLC, content='words', content_rowid='WoID',
+        tokenize='trigram case_sensitive 1')"""
+    )
+    if all(name in existing for name in _TERM_SEARCH_TRIGGERS):
+        return
+    for name, body in _TERM_SEARCH_TRIGGERS.items():
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {body}")
+    # The index may be out of date, e.g. if the db was used with an
+    # sqlite without fts5.
+    conn.execute("INSERT INTO wordsfts(wordsfts) VALUES ('rebuild')")
+    conn.commit()
+
+
 def _schema_dir():
     "Where schema files are found."
     thisdir = os.path.dirname(os.path.realpath(__file__))
@@ -167,3 +238,6 @@ def setup_db(app_config, output_func=None):
 
     setup = Setup(dbfile, baseline, bm, migrator, output_func)
     setup.setup()
+
+    with closing(sqlite3.connect(dbfile)) as conn:
+        setup_term_search_index(conn)
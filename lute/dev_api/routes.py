@@ -23,6 +23,7 @@ import lute.parse.registry
 from lute.db import db
 import lute.db.management
 from lute.db.demo import Service as DemoService
+from lute.read.render.page_cache import rendered_page_cache
 
 
 bp = Blueprint("dev_api", __name__, url_prefix="/dev_api")
@@ -94,6 +95,7 @@ def delete_all_terms():
     "Delete all the terms only."
     db.session.query(text("DELETE FROM words"))
     db.session.commit()
+    rendered_page_cache.clear()
     flash("terms deleted")
     return redirect("/", 302)
 
@@ -2,9 +2,15 @@
 Book entity.
 """
 
+import functools
+import hashlib
 import sqlite3
+import struct
+import zlib
 from contextlib import closing
 from lute.db import db
+from lute.parse.base import ParsedToken, ParseContext
+from lute.parse.executor import parse_executor
 
 booktags = db.Table(
     "booktags",
@@ -140,7 +146,7 @@ class Book(
 
 
 # TODO zzfuture fix: rename class and table to Page/pages
-class Text(db.Model):
+class Text(db.Model):  # pylint: disable=too-many-instance-attributes
     """
     Each page in a Book.
     """
@@ -154,6 +160,8 @@ class Text(db.Model):
     _read_date = db.Column("TxReadDate", db.DateTime, nullable=True)
     bk_id = db.Column("TxBkID", db.Integer, db.ForeignKey("books.BkID"), nullable=False)
     word_count = db.Column("TxWordCount", db.Integer, nullable=True)
+    # TextTokenCache.make_key() of the text the sentences were made from.
+    sentences_key = db.Column("TxSentencesKey", db.String(40), nullable=True)
 
     book = db.relationship("Book", back_populates="texts")
     bookmarks = db.relationship(
@@ -167,9 +175,18 @@ class Text(db.Model):
         order_by="Sentence.order",
         cascade="all, delete-orphan",
     )
+    token_cache = db.relationship(
+        "TextTokenCache",
+        uselist=False,
+        cascade="all, delete-orphan",
+    )
 
-    def __init__(self, book, text, order=1):
+    def __init__(self, book, text, order=1, parsed_tokens=None):
         self.book = book
+        if parsed_tokens is not None:
+            # Already parsed (e.g. by the parse_executor), so the text
+            # setter doesn't need to.
+            self._set_token_cache(text, parsed_tokens)
         self.text = text
         self.order = order
         self.sentences = []
@@ -193,7 +210,7 @@ class Text(db.Model):
         self._text = s
         if s.strip() == "":
             return
-        toks = self._get_parsed_tokens()
+        toks = self.get_parsed_tokens()
         wordtoks = [t for t in toks if t.is_word]
         self.word_count = len(wordtoks)
         if self._read_date is not None:
@@ -209,15 +226,64 @@ class Text(db.Model):
         # Ensure loaded.
         self.load_sentences()
 
-    def _get_parsed_tokens(self):
-        "Return the tokens."
+    def get_parsed_tokens(self):
+        """
+        Return the tokens.
+
+        The tokens are cached in the texttokencache table, and only
+        re-parsed if the text or the language's parser cache key changes.
+        """
         lang = self.book.language
-        return lang.parser.get_parsed_tokens(self.text, lang)
+        key = TextTokenCache.make_key(self.text, lang)
+        cache = self.token_cache
+        if cache is not None and cache.key == key:
+            return cache.get_tokens()
+
+        toks = lang.get_parsed_tokens(self.text)
+        self._set_token_cache(self.text, toks)
+        return toks
+
+    def _set_token_cache(self, s, toks):
+        "Cache the tokens of s, the text."
+        key = TextTokenCache.make_key(s, self.book.language)
+        if self.token_cache is None:
+            self.token_cache = TextTokenCache()
+        self.token_cache.key = key
+        self.token_cache.set_tokens(toks)
+
+    @staticmethod
+    def load_parsed_tokens(texts, batch_size=200):
+        """
+        Parse and cache the tokens of any of the texts that aren't
+        cached, so later calls to their get_parsed_tokens() don't
+        parse.
+
+        For bulk operations: the texts are parsed by the
+        parse_executor, in worker processes if it has any.
+        """
+        by_lang = {}
+        for t in texts:
+            lang = t.book.language
+            cache = t.token_cache
+            if cache is None or cache.key != TextTokenCache.make_key(t.text, lang):
+                by_lang.setdefault(lang.id, []).append(t)
+
+        for uncached in by_lang.values():
+            lang = uncached[0].book.language
+            for i in range(0, len(uncached), batch_size):
+                batch = uncached[i : i + batch_size]
+                tokens = parse_executor.get_parsed_tokens_many(
+                    lang, [t.text for t in batch]
+                )
+                for t, toks in zip(batch, tokens):
+                    t._set_token_cache(t.text, toks)  # pylint: disable=protected-access
 
     def _load_sentences_from_tokens(self, parsedtokens):
         "Save sentences using the tokens."
-        parser = self.book.language.parser
+        lang = self.book.language
+        parser = lang.parser
         self._remove_sentences()
+        self.sentences_key = TextTokenCache.make_key(self.text, lang)
         curr_sentence_tokens = []
         sentence_num = 1
 
@@ -241,8 +307,14 @@ class Text(db.Model):
     def load_sentences(self):
         """
         Parse the current text and create Sentence objects.
+
+        The sentences are only replaced if the text or the language's
+        parser cache key has changed since they were made.
         """
-        toks = self._get_parsed_tokens()
+        lang = self.book.language
+        if self.sentences_key == TextTokenCache.make_key(self.text, lang):
+            return
+        toks = self.get_parsed_tokens()
         self._load_sentences_from_tokens(toks)
 
     def _add_sentence(self, sentence):
@@ -258,6 +330,72 @@ class Text(db.Model):
         self.sentences = []
 
 
+class TextTokenCache(db.Model):
+    """
+    Parsed tokens for a Text, so it's not re-parsed every time it's used.
+
+    The tokens are stored as a zlib-compressed blob:
+
+    - token count (uint32)
+    - one flags byte per token (1 = is_word, 2 = is_end_of_sentence)
+    - the utf-8 byte length of each token (uint32)
+    - the utf-8 encoded tokens, concatenated
+
+    Sentence numbers and orders aren't stored, they're recalculated
+    from the end of sentence flags.
+    """
+
+    __tablename__ = "texttokencache"
+
+    tx_id = db.Column(
+        "TcTxID",
+        db.Integer,
+        db.ForeignKey("texts.TxID", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key = db.Column("TcKey", db.String(40), nullable=False)
+    tokens_blob = db.Column("TcTokens", db.LargeBinary, nullable=False)
+
+    @staticmethod
+    def make_key(s, language):
+        "Hash of the text and everything that affects how it's parsed."
+        h = hashlib.sha1(s.encode("utf-8"))
+        h.update(repr(language.parser_cache_key).encode("utf-8"))
+        return h.hexdigest()
+
+    def set_tokens(self, tokens):
+        "Store the tokens."
+        flags = bytes(
+            (1 if t.is_word else 0) | (2 if t.is_end_of_sentence else 0) for t in tokens
+        )
+        encoded = [t.token.encode("utf-8") for t in tokens]
+        n = len(tokens)
+        data = b"".join(
+            [
+                struct.pack("<I", n),
+                flags,
+                struct.pack(f"<{n}I", *[len(e) for e in encoded]),
+                *encoded,
+            ]
+        )
+        self.tokens_blob = zlib.compress(data)
+
+    def get_tokens(self):
+        "Return the stored tokens as ParsedTokens."
+        data = zlib.decompress(self.tokens_blob)
+        n = struct.unpack_from("<I", data)[0]
+        flags = data[4 : 4 + n]
+        lengths = struct.unpack_from(f"<{n}I", data, 4 + n)
+        pos = 4 + 5 * n
+
+        ret = []
+        for f, length in zip(flags, lengths):
+            tok = data[pos : pos + length].decode("utf-8")
+            pos += length
+            ret.append(ParsedToken(tok, bool(f & 1), bool(f & 2)))
+        return ParseContext().number(ret)
+
+
 class WordsRead(db.Model):
     """
     Tracks reading events for Text entities.
@@ -284,6 +422,77 @@ class WordsRead(db.Model):
         self.word_count = word_count
 
 
+def _query_sqlite_lower(s):
+    "Returns result of sqlite LOWER call of s."
+    with sqlite3.connect(":memory:") as conn, closing(conn.cursor()) as cur:
+        cur.execute("SELECT LOWER(?)", (s,))
+        return cur.fetchone()[0]
+
+
+# Bytes of A-Z only occur as those letters in utf-8, so lowercasing
+# the encoded bytes only changes A-Z.
+_ascii_lower = bytes.maketrans(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", b"abcdefghijklmnopqrstuvwxyz"
+)
+
+
+def _ascii_lowercase(s):
+    "s with A-Z lowercased."
+    b = s.encode("utf-8", "surrogatepass")
+    return b.translate(_ascii_lower).decode("utf-8", "surrogatepass")
+
+
+@functools.lru_cache(maxsize=1)
+def _sqlite_lower_is_ascii_only():
+    """
+    True if sqlite's LOWER() only lowercases ASCII letters, which it
+    does unless sqlite was built with the ICU extension.
+    """
+    probe = "ABCXYZ ÀÉÎÕÜ ΑΒΓ АБВ İI ẞ"
+    return _query_sqlite_lower(probe) == _ascii_lowercase(probe)
+
+
+def sqlite_lower(s):
+    """
+    Same as sqlite's LOWER(s), without a db call: LOWER() only
+    lowercases A-Z.
+    """
+    if s is None:
+        return None
+    if not _sqlite_lower_is_ascii_only():
+        return _query_sqlite_lower(s)
+    return _ascii_lowercase(s)
+
+
+def sentence_index_tokens(lc_content):
+    """
+    The distinct tokens of lowercased, zero-width-space-joined content
+    (of a Sentence, or a Term) that are in the SentenceToken index.
+    """
+    return {t for t in lc_content.split("\u200B") if t.strip(" ") != ""}
+
+
+class SentenceToken(db.Model):
+    """
+    Inverted index of sentences: a lowercased token in a sentence.
+
+    A term can only be in the sentences that contain all of its
+    tokens, so references are looked up from here rather than by
+    scanning all sentences.
+    """
+
+    __tablename__ = "sentencetokens"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    token_lc = db.Column("SxTokenLC", db.Text, primary_key=True)
+    se_id = db.Column(
+        "SxSeID",
+        db.Integer,
+        db.ForeignKey("sentences.SeID", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+
 class Sentence(db.Model):
     """
     Parsed sentences for a given Text.
@@ -300,6 +509,9 @@ class Sentence(db.Model):
     textlc_content = db.Column("SeTextLC", db.Text)
 
     text = db.relationship("Text", back_populates="sentences")
+    index_tokens = db.relationship(
+        "SentenceToken", cascade="all, delete-orphan", passive_deletes=True
+    )
 
     def set_lowercase_text(self, parser):
         """
@@ -312,20 +524,17 @@ class Sentence(db.Model):
         sentences were different when lowercased by the LOWER() vs by
         the parser.
 
+        The sentence's SentenceToken index entries are set from the
+        lowercase text too.
+
         This method is public for use in the data_cleanup module.
         """
 
-        def _get_sql_lower(input_string):
-            "Returns result of sqlite LOWER call of input_string."
-            if input_string is None:
-                return None
-            with sqlite3.connect(":memory:") as conn, closing(conn.cursor()) as cur:
-                cur.execute("SELECT LOWER(?)", (input_string,))
-                result = cur.fetchone()
-                return result[0]
-
         lcased = parser.get_lowercase(self.text_content)
-        if lcased == _get_sql_lower(self.text_content):
+        self.index_tokens = [
+            SentenceToken(token_lc=t) for t in sentence_index_tokens(lcased)
+        ]
+        if lcased == sqlite_lower(self.text_content):
             lcased = "*"
         self.textlc_content = lcased
 
@@ -4,6 +4,7 @@ Language entity.
 
 import re
 from lute.db import db
+from lute.parse.base import ParseContext
 from lute.parse.registry import get_parser, is_supported
 
 
@@ -123,8 +124,31 @@ class Language(
         "True if the language's parser is supported."
         return is_supported(self.parser_type)
 
+    @property
+    def parser_settings(self):
+        "Everything that affects how text is parsed, e.g. for cache keys."
+        return (
+            self.parser_type,
+            self.character_substitutions,
+            self.regexp_split_sentences,
+            self.exceptions_split_sentences,
+            self.word_characters,
+        )
+
+    @property
+    def parser_cache_key(self):
+        """
+        parser_settings, plus any parser state outside of the language
+        (e.g. data files), for cache keys.  Just the parser_settings if
+        the parser isn't supported, as nothing can be parsed anyway.
+        """
+        if not self.is_supported:
+            return self.parser_settings
+        return self.parser.cache_key(self)
+
     def get_parsed_tokens(self, s):
-        return self.parser.get_parsed_tokens(s, self)
+        "Parsed tokens of s, numbered."
+        return ParseContext().number(self.parser.get_parsed_tokens(s, self))
 
     def get_lowercase(self, s) -> str:
         return self.parser.get_lowercase(s)
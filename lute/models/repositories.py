@@ -2,11 +2,11 @@
 Repositories.
 """
 
-from sqlalchemy import text as sqltext, and_, func
+from sqlalchemy import text as sqltext, and_, bindparam, func
 from lute.db import db
 from lute.models.setting import UserSetting, BackupSettings, SystemSetting
 from lute.models.language import Language
-from lute.models.term import Term, TermTag
+from lute.models.term import Term, TermTag, get_readings_or_none
 from lute.models.book import Book, BookTag
 
 
@@ -199,6 +199,110 @@ class TermRepository:
             return None
         return terms[0]
 
+    def ensure_unknown_terms(self, terms):
+        """
+        Save new unknown (status 0) single-word terms in bulk.
+
+        The terms are inserted with a single INSERT ... ON CONFLICT DO
+        NOTHING, so any that already exist (e.g. saved by another
+        session) are left alone, and their ids are then fetched with a
+        single select and set on the given Term objects.  The Terms are
+        not added to the session, and no ORM events are fired.
+
+        The caller must commit.
+        """
+        if len(terms) == 0:
+            return
+        insert_sql = """
+            INSERT INTO words
+            (WoLgID, WoText, WoTextLC, WoStatus, WoRomanization, WoTokenCount)
+            VALUES (:lgid, :text, :text_lc, 0, :romanization, :token_count)
+            ON CONFLICT (WoTextLC, WoLgID) DO NOTHING
+            """
+        params = [
+            {
+                "lgid": t.language.id,
+                "text": t.text,
+                "text_lc": t.text_lc,
+                "romanization": t.romanization,
+                "token_count": t.token_count,
+            }
+            for t in terms
+        ]
+        self.session.execute(sqltext(insert_sql), params)
+
+        select_sql = sqltext(
+            """
+            SELECT WoLgID, WoTextLC, WoID FROM words
+            WHERE WoLgID in :lgids and WoTextLC in :text_lcs
+            """
+        ).bindparams(
+            bindparam("lgids", expanding=True), bindparam("text_lcs", expanding=True)
+        )
+        ids = {}
+        lgids = list({t.language.id for t in terms})
+        text_lcs = list({t.text_lc for t in terms})
+        batch_size = 500
+        for i in range(0, len(text_lcs), batch_size):
+            batch = {"lgids": lgids, "text_lcs": text_lcs[i : i + batch_size]}
+            for lgid, text_lc, woid in self.session.execute(select_sql, batch):
+                ids[(lgid, text_lc)] = woid
+        for t in terms:
+            t.id = ids[(t.language.id, t.text_lc)]
+
+    def set_unknown_terms_status(self, language_id, text_lcs, status):
+        """
+        Set the status of the language's unknown (status 0) terms with
+        the given text_lcs, using set-based UPDATEs.  The words
+        triggers (e.g. parent status syncing) are run by the db.
+        Unknown terms don't have readings, so theirs are saved too.
+
+        Terms already in the session are not updated, and no ORM
+        events are fired.  The caller must commit.
+        """
+        sql = sqltext(
+            """
+            UPDATE words SET WoStatus = :status
+            WHERE WoLgID = :lgid AND WoStatus = 0 AND WoTextLC in :text_lcs
+            """
+        ).bindparams(bindparam("text_lcs", expanding=True))
+        language = self.session.get(Language, language_id)
+        text_lcs = list(text_lcs)
+        batch_size = 500
+        for i in range(0, len(text_lcs), batch_size):
+            params = {
+                "status": status,
+                "lgid": language_id,
+                "text_lcs": text_lcs[i : i + batch_size],
+            }
+            if status != 0:
+                self._save_unknown_terms_readings(language, params)
+            self.session.execute(sql, params)
+
+    def _save_unknown_terms_readings(self, language, params):
+        "Save readings of the unknown terms matching the params' text_lcs."
+        if language is None or not language.is_supported:
+            return
+        sql = sqltext(
+            """
+            SELECT WoID, WoText FROM words
+            WHERE WoLgID = :lgid AND WoStatus = 0 AND WoTextLC in :text_lcs
+            AND WoRomanization IS NULL
+            """
+        ).bindparams(bindparam("text_lcs", expanding=True))
+        rows = self.session.execute(sql, params).all()
+        if len(rows) == 0:
+            return
+        readings = get_readings_or_none(language, [r[1] for r in rows])
+        updates = [
+            {"woid": r[0], "reading": reading}
+            for r, reading in zip(rows, readings)
+            if reading is not None
+        ]
+        if len(updates) > 0:
+            update_sql = "UPDATE words SET WoRomanization = :reading WHERE WoID = :woid"
+            self.session.execute(sqltext(update_sql), updates)
+
     def delete_empty_images(self):
         """
         Data clean-up: delete empty images.
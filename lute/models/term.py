@@ -161,12 +161,16 @@ class Term(
         the UI or during CSV import.  This method is used
         when new terms are created from an already-parsed
         and already-tokenized page of text.
+
+        The romanization isn't set: most of these terms are never
+        looked at, so it's only calculated when needed (see
+        get_romanization()), or when the term is saved with another
+        status (see set_missing_readings()).
         """
         t = Term()
         t.language = language
         t._text = text  # pylint: disable=protected-access
         t.text_lc = language.get_lowercase(text)
-        t.romanization = language.parser.get_reading(text)
         t._calc_token_count()  # pylint: disable=protected-access
         return t
 
@@ -209,7 +213,9 @@ class Term(
         """
         Set the text, textlc, and token count.
 
-        For new terms, just parse, downcase, and get the count.
+        For new terms, just parse, downcase, and get the count.  The
+        reading is set when the term is saved (see
+        set_missing_readings()).
 
         For existing terms, ensure that the actual text content has
         not changed.
@@ -222,7 +228,6 @@ class Term(
             t = self._parse_string_add_zws(lang, textstring)
             self._text = t
             self.text_lc = lang.get_lowercase(t)
-            self.romanization = lang.parser.get_reading(t)
             self._calc_token_count()
         else:
             # new_lc = lang.get_lowercase(textstring)
@@ -266,6 +271,17 @@ class Term(
         if len(self.parents) > 1:
             self.sync_status = False
 
+    def get_romanization(self):
+        """
+        Get the romanization.
+
+        Unknown terms created when a page is opened don't have one,
+        so calculate it for them.
+        """
+        if self.romanization is None and self.status == 0:
+            return self.language.parser.get_reading(self.text)
+        return self.romanization
+
     def get_current_image(self):
         "Get the current (first) image for the term."
         if len(self.images) == 0:
@@ -321,3 +337,37 @@ class Status(db.Model):  # pylint: disable=too-few-public-methods
     id = db.Column("StID", db.SmallInteger, primary_key=True)
     text = db.Column("StText", db.String(250))
     abbreviation = db.Column("StAbbreviation", db.String(250))
+
+
+def get_readings_or_none(language, texts):
+    """
+    Get the language parser's readings of the texts, or all None if
+    the parser fails (e.g. a broken MeCab install): a missing reading
+    mustn't stop terms being saved.
+    """
+    try:
+        return language.parser.get_readings(texts)
+    except Exception:  # pylint: disable=broad-exception-caught
+        return [None] * len(texts)
+
+
+def set_missing_readings(terms):
+    """
+    Set the romanization of the terms that don't have one, getting
+    each language's readings with a single get_readings() call.
+
+    Unknown (status 0) terms only get a reading when it's needed (see
+    get_romanization()), so the term save paths call this for terms
+    that are new or leaving status 0.
+    """
+    by_lang = {}
+    for t in {id(t): t for t in terms}.values():
+        if t.romanization is None and t.language is not None and t.text:
+            by_lang.setdefault(id(t.language), (t.language, []))[1].append(t)
+    for lang, lang_terms in by_lang.values():
+        if not lang.is_supported:
+            continue
+        readings = get_readings_or_none(lang, [t.text for t in lang_terms])
+        for t, reading in zip(lang_terms, readings):
+            if reading is not None:
+                t.romanization = reading
@@ -3,45 +3,25 @@ Common classes use for all parsing.
 """
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List, Union
 
 
 class ParsedToken:
     """
     A single parsed token from an input text.
 
-    As tokens are created, the class counters
-    (starting with cls_) are assigned to the ParsedToken
-    and then incremented appropriately.
+    The token's order and sentence_number are assigned by the
+    ParseContext of the parse that created it.
     """
 
-    # Class counters.
-    cls_sentence_number = 0
-    cls_order = 0
-
-    @classmethod
-    def reset_counters(cls):
-        """
-        Reset all the counters.
-        """
-        ParsedToken.cls_sentence_number = 0
-        ParsedToken.cls_order = 0
+    __slots__ = ("token", "is_word", "is_end_of_sentence", "order", "sentence_number")
 
     def __init__(self, token: str, is_word: bool, is_end_of_sentence: bool = False):
         self.token = token
         self.is_word = is_word
         self.is_end_of_sentence = is_end_of_sentence
-
-        ParsedToken.cls_order += 1
-        self.order = ParsedToken.cls_order
-
-        self.sentence_number = ParsedToken.cls_sentence_number
-
-        # Increment counters after the TextToken has been
-        # completed, so that it belongs to the correct
-        # sentence.
-        if self.is_end_of_sentence:
-            ParsedToken.cls_sentence_number += 1
+        self.order = 0
+        self.sentence_number = 0
 
     @property
     def is_end_of_paragraph(self):
@@ -57,6 +37,67 @@ class ParsedToken:
         return f'<"{self.token}" ({attrs})>'
 
 
+class ParseContext:
+    """
+    Assigns ParsedToken order and sentence numbers for a single parse.
+
+    Each parse has its own context, so texts can be parsed in
+    parallel threads.  Numbering continues across calls to number(),
+    e.g. for a text parsed in chunks.
+    """
+
+    def __init__(self):
+        self.order = 0
+        self.sentence_number = 0
+
+    def number(self, tokens: List[ParsedToken]) -> List[ParsedToken]:
+        "Number the tokens, following any already numbered; returns them."
+        for t in tokens:
+            self.order += 1
+            t.order = self.order
+            t.sentence_number = self.sentence_number
+            # Increment after the token is done, so that it belongs
+            # to the correct sentence.
+            if t.is_end_of_sentence:
+                self.sentence_number += 1
+        return tokens
+
+
+def paragraph_chunks(
+    stream: Union[str, Iterable[str]], chunk_size: int = 65536
+) -> Iterator[str]:
+    """
+    Regroup a string, or strings (e.g. the lines of a file), into
+    chunks of at least chunk_size characters that end at a newline.
+
+    The last chunk has whatever is left over.  A paragraph longer
+    than chunk_size is kept whole.
+    """
+    if isinstance(stream, str):
+        stream = (stream,)
+    buff = []
+    size = 0
+    for piece in stream:
+        buff.append(piece)
+        size += len(piece)
+        if size < chunk_size:
+            continue
+        text = "".join(buff)
+        start = 0
+        while len(text) - start >= chunk_size:
+            end = text.find("\n", start + chunk_size - 1)
+            if end == -1:
+                break
+            yield text[start : end + 1]
+            start = end + 1
+        buff = [text[start:]]
+        size = len(buff[0])
+
+    rest = "".join(buff)
+    if rest != "":
+        yield rest
+
+
 class AbstractParser(ABC):
     """
     Abstract parser, inherited from by all parsers.
@@ -100,12 +141,42 @@ class AbstractParser(ABC):
         Parser name, for displaying in UI.
         """
 
+    def cache_key(self, language):
+        """
+        Everything that affects how text is parsed for the language,
+        for the keys of cached parse results (tokens, sentences,
+        rendered pages).
+
+        Parsers that use state outside of the Language, such as data
+        files or dictionaries, should add it to the key.
+        """
+        return language.parser_settings
+
     @abstractmethod
     def get_parsed_tokens(self, text: str, language) -> List:
         """
         Get an array of ParsedTokens from the input text for the given language.
+
+        The tokens don't need to be numbered, see ParseContext.
         """
 
+    def iter_parsed_tokens(
+        self, stream: Union[str, Iterable[str]], language, chunk_size: int = 65536
+    ) -> Iterator:
+        """
+        Yield the ParsedTokens of a (possibly very large) text, given
+        as a string or as an iterable of strings, without parsing it
+        all at once.
+
+        By default, the text is parsed in chunks that end at
+        paragraph breaks, which gives the same tokens as
+        get_parsed_tokens() for parsers that don't look across
+        paragraphs.  Parsers that can stream should override this.
+        """
+        context = ParseContext()
+        for chunk in paragraph_chunks(stream, chunk_size):
+            yield from context.number(self.get_parsed_tokens(chunk, language))
+
     def get_reading(self, text: str):  # pylint: disable=unused-argument
         """
         Get the pronunciation for the given text.  For most
@@ -113,6 +184,15 @@ class AbstractParser(ABC):
         """
         return None
 
+    def get_readings(self, texts: List[str]) -> List:
+        """
+        Get the pronunciations for many texts, in the same order.
+
+        Parsers that can do this faster than one text at a time
+        (e.g. by reusing a tokenizer) should override this.
+        """
+        return [self.get_reading(t) for t in texts]
+
     def get_lowercase(self, text: str):
         """
         Return the lowcase text.
@@ -10,11 +10,61 @@ Includes classes:
 
 """
 
+import functools
 import re
 from typing import List
 from lute.parse.base import ParsedToken, AbstractParser
 
 
+class CharacterClassTable:
+    """
+    A language's parser settings, compiled for parsing character by
+    character.
+
+    Each distinct character is classified (word character or not,
+    end of sentence or not) the first time it's seen, and the result
+    is kept, so parsing a text is a single table lookup per character.
+    """
+
+    def __init__(self, character_substitutions, split_sentences, word_characters):
+        self.substitutions = []
+        for replacement in character_substitutions.split("|"):
+            fromto = replacement.strip().split("=")
+            if len(fromto) >= 2:
+                self.substitutions.append((fromto[0].strip(), fromto[1].strip()))
+
+        self.word_re = re.compile(f"[{word_characters}]")
+        self.eos_chars = frozenset(split_sentences) | {"¶"}
+        self.classes = {}
+
+    def classify(self, char):
+        "(is_word, is_end_of_sentence) for the char."
+        c = self.classes.get(char)
+        if c is None:
+            c = (self.word_re.match(char) is not None, char in self.eos_chars)
+            self.classes[char] = c
+        return c
+
+    def clean(self, text):
+        "Text with the language's substitutions, and Lute's own, applied."
+        text = re.sub(r"[ \t]+", "", text)
+        for rfrom, rto in self.substitutions:
+            text = text.replace(rfrom, rto)
+        text = text.replace("\r\n", "\n")
+        text = text.replace("{", "[")
+        text = text.replace("}", "]")
+        text = text.replace("\n", "¶")
+        return text.strip()
+
+    def parse(self, text) -> List[ParsedToken]:
+        "One ParsedToken per character of the cleaned text."
+        text = self.clean(text)
+        for char in set(text).difference(self.classes):
+            self.classify(char)
+        classes = self.classes
+        return [ParsedToken(char, *classes[char]) for char in text]
+
+
 class ClassicalChineseParser(AbstractParser):
     """
     A general parser for space-delimited languages,
@@ -25,34 +75,16 @@ class ClassicalChineseParser(AbstractParser):
     def name(cls):
         return "Classical Chinese"
 
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _get_table(settings) -> CharacterClassTable:
+        "Table for the Language.parser_settings."
+        _, substitutions, split_sentences, _, word_characters = settings
+        return CharacterClassTable(substitutions, split_sentences, word_characters)
+
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         """
         Returns ParsedToken array for given language.
         """
-        text = re.sub(r"[ \t]+", "", text)
-
-        replacements = language.character_substitutions.split("|")
-        for replacement in replacements:
-            fromto = replacement.strip().split("=")
-            if len(fromto) >= 2:
-                rfrom = fromto[0].strip()
-                rto = fromto[1].strip()
-                text = text.replace(rfrom, rto)
-
-        text = text.replace("\r\n", "\n")
-        text = text.replace("{", "[")
-        text = text.replace("}", "]")
-        text = text.replace("\n", "¶")
-        text = text.strip()
-
-        tokens = []
-        pattern = f"[{language.word_characters}]"
-        for char in text:
-            is_word_char = re.match(pattern, char) is not None
-            is_end_of_sentence = char in language.regexp_split_sentences
-            if char == "¶":
-                is_end_of_sentence = True
-            p = ParsedToken(char, is_word_char, is_end_of_sentence)
-            tokens.append(p)
-
-        return tokens
+        table = ClassicalChineseParser._get_table(language.parser_settings)
+        return table.parse(text)
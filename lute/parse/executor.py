@@ -0,0 +1,164 @@
+"""
+Parsing many texts at once, in worker processes.
+
+Bulk operations (book stats, term exports, data fixes, book imports)
+parse many texts, and parsing is CPU-bound, so those texts can be
+spread over a pool of worker processes.  Each worker keeps its own
+parser instances, so parsers with expensive setup (MeCab, jieba) are
+only loaded once per worker.
+
+Language entities can't be sent to other processes, so the workers
+get a ParserLanguage with the language's parser_settings instead, and
+send back compact (tokens, flags) batches rather than ParsedTokens.
+
+The worker count is set by PARSE_WORKERS in the config file.  With
+fewer than two workers, texts are parsed in the calling process.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+from typing import List
+
+from lute.parse.base import ParsedToken, ParseContext
+from lute.parse.registry import get_parser, init_parser_plugins, supported_parsers
+
+
+class ParserLanguage:  # pylint: disable=too-few-public-methods
+    """
+    The parts of a Language that parsers use, so that they can be
+    sent to worker processes.
+
+    Created from Language.parser_settings.
+    """
+
+    def __init__(self, parser_settings):
+        (
+            self.parser_type,
+            self.character_substitutions,
+            self.regexp_split_sentences,
+            self.exceptions_split_sentences,
+            self.word_characters,
+        ) = parser_settings
+
+    @property
+    def parser_settings(self):
+        "Same as Language.parser_settings."
+        return (
+            self.parser_type,
+            self.character_substitutions,
+            self.regexp_split_sentences,
+            self.exceptions_split_sentences,
+            self.word_characters,
+        )
+
+
+def to_compact(tokens):
+    "Compact, picklable (tokens, flags) for ParsedTokens."
+    flags = bytes(
+        (1 if t.is_word else 0) | (2 if t.is_end_of_sentence else 0) for t in tokens
+    )
+    return (tuple(t.token for t in tokens), flags)
+
+
+def from_compact(compact):
+    "Numbered ParsedTokens from to_compact() data."
+    toks, flags = compact
+    ret = [ParsedToken(tok, bool(f & 1), bool(f & 2)) for tok, f in zip(toks, flags)]
+    return ParseContext().number(ret)
+
+
+# Parser instances of the current worker process, by parser type.
+_worker_parsers = {}
+
+
+def _init_worker(data_directories):
+    "Load plugins in a new worker, and set their data directories."
+    init_parser_plugins()
+    for typename, klass in supported_parsers():
+        if typename in data_directories:
+            klass.data_directory = data_directories[typename]
+
+
+def _parse_in_worker(language, text):
+    "Parse the text with this worker's parser, returning compact tokens."
+    parser = _worker_parsers.get(language.parser_type)
+    if parser is None:
+        parser = get_parser(language.parser_type)
+        _worker_parsers[language.parser_type] = parser
+    return to_compact(parser.get_parsed_tokens(text, language))
+
+
+class ParseExecutor:
+    """
+    Parses many texts, in a pool of worker processes if more than
+    one worker is configured.
+
+    The pool is started when it's first needed, and restarted if the
+    number of workers changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pool_workers = 0
+        self.workers = 0
+
+    def _get_pool(self):
+        "The pool, started if needed."
+        with self._lock:
+            if self._pool is not None and self._pool_workers != self.workers:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+            if self._pool is None:
+                data_directories = {
+                    typename: klass.data_directory
+                    for typename, klass in supported_parsers()
+                    if klass.uses_data_directory()
+                }
+                # Spawn rather than fork: the app has threads (e.g. the
+                # page prefetcher) and open db connections.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(data_directories,),
+                )
+                self._pool_workers = self.workers
+            return self._pool
+
+    def shutdown(self):
+        "Stop the worker processes, if any."
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            self._pool = None
+            self._pool_workers = 0
+
+    def get_parsed_tokens_many(self, language, texts: List[str]) -> List[List]:
+        """
+        Numbered ParsedTokens for each of the texts, in the same order;
+        each the same as language.get_parsed_tokens(text).
+        """
+        if self.workers < 2 or len(texts) < 2:
+            return [language.get_parsed_tokens(s) for s in texts]
+
+        pl = ParserLanguage(language.parser_settings)
+        pool = self._get_pool()
+        chunksize = max(1, len(texts) // (self.workers * 4))
+        try:
+            compacts = list(
+                pool.map(
+                    _parse_in_worker, [pl] * len(texts), texts, chunksize=chunksize
+                )
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed by the OS); parse here instead,
+            # and start a new pool next time.
+            self.shutdown()
+            return [language.get_parsed_tokens(s) for s in texts]
+        return [from_compact(c) for c in compacts]
+
+
+parse_executor = ParseExecutor()
@@ -6,14 +6,17 @@ MeCab to do parsing.
 
 Includes classes:
 
+- MeCabPool
 - JapaneseParser
 
 """
 
+from contextlib import contextmanager
 from io import StringIO
 import sys
 import os
 import re
+import threading
 from typing import List
 from natto import MeCab
 import jaconv
@@ -21,6 +24,72 @@ from lute.parse.base import ParsedToken, AbstractParser
 from lute.settings.current import current_settings
 
 
+class MeCabPool:
+    """
+    Long-lived MeCab taggers, by flags.
+
+    Creating a MeCab loads its dictionary, which is slow, so taggers
+    are reused.  A tagger is only used by one thread at a time: each
+    call to tagger() takes an idle one for the flags, or makes a new
+    one, and returns it to the pool when done.
+
+    The taggers are dropped if the MECAB_PATH changes, as they may be
+    using a different library and dictionary.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._mecab_path = None
+        self._generation = 0
+        self.counters = {"created": 0, "reused": 0}
+
+    def clear(self):
+        "Drop all idle taggers.  Taggers in use are dropped when released."
+        with self._lock:
+            self._idle = {}
+            self._generation += 1
+
+    def _acquire(self, flags):
+        "Idle tagger for the flags, or a new one."
+        mecab_path = os.environ.get("MECAB_PATH")
+        with self._lock:
+            if mecab_path != self._mecab_path:
+                self._idle = {}
+                self._generation += 1
+                self._mecab_path = mecab_path
+            generation = self._generation
+            idle = self._idle.get(flags)
+            if idle:
+                self.counters["reused"] += 1
+                return idle.pop(), generation
+            self.counters["created"] += 1
+        return MeCab(flags), generation
+
+    def _release(self, flags, nm, generation):
+        "Return the tagger to the pool, unless it's stale."
+        with self._lock:
+            if generation == self._generation:
+                self._idle.setdefault(flags, []).append(nm)
+
+    @contextmanager
+    def tagger(self, flags):
+        "A MeCab tagger for the flags, for use by the current thread only."
+        nm, generation = self._acquire(flags)
+        try:
+            yield nm
+        except:
+            # The tagger's state is unknown, so don't reuse it.
+            generation = None
+            raise
+        finally:
+            self._release(flags, nm, generation)
+
+
+# The app-wide pool.
+mecab_pool = MeCabPool()
+
+
 class JapaneseParser(AbstractParser):
     """
     Japanese parser.
@@ -36,6 +105,17 @@ class JapaneseParser(AbstractParser):
     _is_supported = None
     _old_mecab_path = None
 
+    # Map of MECAB_PATH => (filepath, version, size) of the dictionaries
+    # that its taggers use.
+    _dictionaries = {}
+
+    # Flags of the tagger used for parsing.  Ref
+    # https://github.com/buruzaemon/natto-py:
+    #    -F = node format
+    #    -U = unknown format
+    #    -E = EOP format
+    _parse_flags = r"-F %m\t%t\t%h\n -U %m\t%t\t%h\n -E EOP\t3\t7\n"
+
     @classmethod
     def is_supported(cls):
         """
@@ -72,12 +152,37 @@ class JapaneseParser(AbstractParser):
 
         JapaneseParser._old_mecab_path = mecab_path
         JapaneseParser._is_supported = mecab_works
+        mecab_pool.clear()
         return mecab_works
 
     @classmethod
     def name(cls):
         return "Japanese"
 
+    @classmethod
+    def _dictionary_key(cls):
+        """
+        The MECAB_PATH, and the dictionaries MeCab uses with it, with
+        their file modification times.
+        """
+        mecab_path = os.environ.get("MECAB_PATH")
+        dicts = cls._dictionaries.get(mecab_path)
+        if dicts is None:
+            with mecab_pool.tagger(cls._parse_flags) as nm:
+                dicts = tuple((d.filepath, d.version, d.size) for d in nm.dicts)
+            cls._dictionaries[mecab_path] = dicts
+        mtimes = []
+        for filepath, _, _ in dicts:
+            try:
+                mtimes.append(os.stat(filepath).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (mecab_path, dicts, tuple(mtimes))
+
+    def cache_key(self, language):
+        "Parse results also depend on the MeCab install and dictionaries."
+        return (super().cache_key(language), self._dictionary_key())
+
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         "Parse the string using MeCab."
         text = re.sub(r"[ \t]+", " ", text).strip()
@@ -86,11 +191,7 @@ class JapaneseParser(AbstractParser):
 
         # If the string contains a "\n", MeCab appears to silently
         # remove it.  Splitting it works (ref test_JapaneseParser).
-        # Flags: ref https://github.com/buruzaemon/natto-py:
-        #    -F = node format
-        #    -U = unknown format
-        #    -E = EOP format
-        with MeCab(r"-F %m\t%t\t%h\n -U %m\t%t\t%h\n -E EOP\t3\t7\n") as nm:
+        with mecab_pool.tagger(self._parse_flags) as nm:
             for para in text.split("\n"):
                 for n in nm.parse(para, as_nodes=True):
                     lines.append(n.feature)
@@ -133,36 +234,60 @@ class JapaneseParser(AbstractParser):
     def _string_is_hiragana(self, s: str) -> bool:
         return all(self._char_is_hiragana(c) for c in s)
 
-    def get_reading(self, text: str):
-        """
-        Get the pronunciation for the given text.
-
-        Returns None if the text is all hiragana, or the pronunciation
-        doesn't add value (same as text).
-        """
-        if self._string_is_hiragana(text):
-            return None
-
+    def _reading_setting(self):
+        "The japanese_reading setting, or None if readings aren't wanted."
         jp_reading_setting = current_settings.get("japanese_reading", "").strip()
         if jp_reading_setting == "":
             # Don't set reading if nothing specified.
             return None
+        if jp_reading_setting not in ("katakana", "hiragana", "alphabet"):
+            raise RuntimeError(f"Bad reading type {jp_reading_setting}")
+        return jp_reading_setting
 
-        flags = r"-O yomi"
+    def _tagger_reading(self, nm, text: str, jp_reading_setting):
+        "Get the reading of the text using the yomi tagger."
         readings = []
-        with MeCab(flags) as nm:
-            for n in nm.parse(text, as_nodes=True):
-                readings.append(n.feature)
+        for n in nm.parse(text, as_nodes=True):
+            readings.append(n.feature)
         readings = [r.strip() for r in readings if r is not None and r.strip() != ""]
 
         ret = "".join(readings).strip()
         if ret in ("", text):
             return None
 
-        if jp_reading_setting == "katakana":
-            return ret
         if jp_reading_setting == "hiragana":
             return jaconv.kata2hira(ret)
         if jp_reading_setting == "alphabet":
             return jaconv.kata2alphabet(ret)
-        raise RuntimeError(f"Bad reading type {jp_reading_setting}")
+        return ret
+
+    def get_reading(self, text: str):
+        """
+        Get the pronunciation for the given text.
+
+        Returns None if the text is all hiragana, or the pronunciation
+        doesn't add value (same as text).
+        """
+        return self.get_readings([text])[0]
+
+    def get_readings(self, texts: List[str]):
+        """
+        Get the pronunciations for the given texts, using a single
+        tagger for all of them.
+
+        Returns a list of the same length as texts, with None for the
+        texts that don't need a reading (see get_reading).
+        """
+        ret = [None] * len(texts)
+        todo = [(i, t) for i, t in enumerate(texts) if not self._string_is_hiragana(t)]
+        if len(todo) == 0:
+            return ret
+
+        jp_reading_setting = self._reading_setting()
+        if jp_reading_setting is None:
+            return ret
+
+        with mecab_pool.tagger(r"-O yomi") as nm:
+            for i, text in todo:
+                ret[i] = self._tagger_reading(nm, text, jp_reading_setting)
+        return ret
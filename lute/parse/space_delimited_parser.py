@@ -6,6 +6,7 @@ perform the actual parsing.
 
 Includes classes:
 
+- CompiledLanguageTokenizer
 - SpaceDelimitedParser
 - TurkishParser
 """
@@ -30,12 +31,6 @@ class SpaceDelimitedParser(AbstractParser):
     def name(cls):
         return "Space Delimited"
 
-    @staticmethod
-    @functools.lru_cache
-    def compile_re_pattern(pattern: str, *args, **kwargs) -> re.Pattern:
-        """Compile regular expression pattern, cache result for fast re-use."""
-        return re.compile(pattern, *args, **kwargs)
-
     @staticmethod
     @functools.lru_cache
     def get_default_word_characters() -> str:
@@ -157,6 +152,24 @@ class SpaceDelimitedParser(AbstractParser):
             ]
         )
 
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _get_tokenizer(settings) -> "CompiledLanguageTokenizer":
+        "Tokenizer for the Language.parser_settings."
+        _, substitutions, split_sentences, exceptions, word_characters = settings
+        return CompiledLanguageTokenizer(
+            substitutions, split_sentences, exceptions, word_characters
+        )
+
+    def get_tokenizer(self, language) -> "CompiledLanguageTokenizer":
+        """
+        Get the tokenizer for the language's current settings.
+
+        Tokenizers are cached by the settings, so a new one is built
+        when the language settings change.
+        """
+        return SpaceDelimitedParser._get_tokenizer(language.parser_settings)
+
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         "Return parsed tokens."
 
@@ -168,39 +181,18 @@ class SpaceDelimitedParser(AbstractParser):
 
         return self._parse_to_tokens(clean_text, language)
 
-    def preg_match_capture(self, pattern, subject):
-        """
-        Return the matched text and their start positions in the subject.
-
-        E.g. search for r'cat' in "there is a CAT and a Cat" returns:
-        [['CAT', 11], ['Cat', 21]]
-        """
-        compiled = SpaceDelimitedParser.compile_re_pattern(pattern, flags=re.IGNORECASE)
-        matches = compiled.finditer(subject)
-        result = [[match.group(), match.start()] for match in matches]
-        return result
-
     def _parse_to_tokens(self, text: str, lang):
         """
         Returns ParsedToken array for given language.
         """
-        replacements = lang.character_substitutions.split("|")
-        for replacement in replacements:
-            fromto = replacement.strip().split("=")
-            if len(fromto) >= 2:
-                rfrom = fromto[0].strip()
-                rto = fromto[1].strip()
-                text = text.replace(rfrom, rto)
-
-        text = text.replace("\r\n", "\n")
-        text = text.replace("{", "[")
-        text = text.replace("}", "]")
+        tokenizer = self.get_tokenizer(lang)
+        text = tokenizer.substitute(text)
 
         tokens = []
         paras = text.split("\n")
         pcount = len(paras)
         for i, para in enumerate(paras):
-            self.parse_para(para, lang, tokens)
+            tokenizer.parse_para(para, tokens)
             if i != (pcount - 1):
                 tokens.append(ParsedToken("¶", False, True))
 
@@ -210,50 +202,86 @@ class SpaceDelimitedParser(AbstractParser):
         """
         Parse a string, appending the tokens to the list of tokens.
         """
-        termchar = lang.word_characters.strip()
+        self.get_tokenizer(lang).parse_para(text, tokens)
+
+
+class CompiledLanguageTokenizer:
+    """
+    Language parsing settings, compiled for SpaceDelimitedParser.
+
+    Building the regexes is slow (the default word characters are
+    ~10K of ranges), so they are only built once per set of settings.
+    """
+
+    def __init__(
+        self,
+        character_substitutions: str,
+        regexp_split_sentences: str,
+        exceptions_split_sentences: str,
+        word_characters: str,
+    ):
+        # Substitutions are applied in order, so a later one can
+        # change the result of an earlier one.
+        self.substitutions = []
+        for replacement in (character_substitutions or "").split("|"):
+            fromto = replacement.strip().split("=")
+            if len(fromto) >= 2:
+                self.substitutions.append((fromto[0].strip(), fromto[1].strip()))
+        self.substitutions += [("\r\n", "\n"), ("{", "["), ("}", "]")]
+
+        termchar = (word_characters or "").strip()
         if not termchar:
             termchar = SpaceDelimitedParser.get_default_word_characters()
-
-        splitex = lang.exceptions_split_sentences.replace(".", "\\.")
-        pattern = rf"({splitex}|[{termchar}]*)"
+        splitex = (exceptions_split_sentences or "").replace(".", "\\.")
+        pattern = rf"({splitex}|[{termchar}]+)"
         if splitex.strip() == "":
-            pattern = rf"([{termchar}]*)"
-
-        m = self.preg_match_capture(pattern, text)
-        wordtoks = list(filter(lambda t: t[0] != "", m))
-
-        def add_non_words(s):
-            """
-            Add non-word token s to the list of tokens.  If s
-            matches any of the split_sentence values, mark it as an
-            end-of-sentence.
-            """
-            if not s:
-                return
-            splitchar = lang.regexp_split_sentences.strip()
-            if not splitchar:
-                splitchar = SpaceDelimitedParser.get_default_regexp_split_sentences()
-            pattern = f"[{re.escape(splitchar)}]"
-            has_eos = False
-            if pattern != "[]":  # Should never happen, but ...
-                allmatches = self.preg_match_capture(pattern, s)
-                has_eos = len(allmatches) > 0
-            tokens.append(ParsedToken(s, False, has_eos))
-
-        # For each wordtok, add all non-words before the wordtok, and
-        # then add the wordtok.
+            pattern = rf"([{termchar}]+)"
+        self.word_re = re.compile(pattern, flags=re.IGNORECASE)
+
+        splitchar = (regexp_split_sentences or "").strip()
+        if not splitchar:
+            splitchar = SpaceDelimitedParser.get_default_regexp_split_sentences()
+        # Any of the splitchar characters ends a sentence.  The
+        # characters are matched ignoring case, so a plain set can
+        # only be used if none of them have case.
+        self.eos_chars = frozenset(splitchar)
+        self.eos_re = None
+        if any(c.lower() != c or c.upper() != c for c in splitchar):
+            self.eos_re = re.compile(f"[{re.escape(splitchar)}]", flags=re.IGNORECASE)
+
+    def substitute(self, text: str) -> str:
+        "Apply the character substitutions."
+        for rfrom, rto in self.substitutions:
+            text = text.replace(rfrom, rto)
+        return text
+
+    def is_end_of_sentence(self, s: str) -> bool:
+        "True if the non-word string s contains a sentence split char."
+        if self.eos_re is not None:
+            return self.eos_re.search(s) is not None
+        return not self.eos_chars.isdisjoint(s)
+
+    def parse_para(self, text: str, tokens: List[ParsedToken]):
+        """
+        Parse a paragraph, appending the tokens to the list of tokens.
+        """
+        is_eos = self.is_end_of_sentence
+        append = tokens.append
         pos = 0
-        for wt in wordtoks:
-            w = wt[0]
-            wp = wt[1]
-            s = text[pos:wp]
-            add_non_words(s)
-            tokens.append(ParsedToken(w, True, False))
-            pos = wp + len(w)
+        for m in self.word_re.finditer(text):
+            wp = m.start()
+            w = m.group()
+            # Add all non-words before the word, then the word.
+            if wp > pos:
+                s = text[pos:wp]
+                append(ParsedToken(s, False, is_eos(s)))
+            append(ParsedToken(w, True, False))
+            pos = m.end()
 
         # Add anything left over.
-        s = text[pos:]
-        add_non_words(s)
+        if pos < len(text):
+            s = text[pos:]
+            append(ParsedToken(s, False, is_eos(s)))
 
 
 class TurkishParser(SpaceDelimitedParser):
@@ -0,0 +1,107 @@
+"""
+Background rendering of the next pages of the book being read.
+
+When a page is opened, the next few pages are rendered into the
+rendered_page_cache by a single background thread, using its own app
+context and db session, so that moving to the next page doesn't stall
+on parsing and rendering (notably for Japanese and Mandarin).
+
+Only one prefetch runs at a time.  Before the reader renders a page,
+it calls cancel_pending(), which drops queued work without waiting for
+a prefetch that is already running: the reader's page shouldn't wait
+on the render of a page it may not need.  The running prefetch
+finishes in the background.  This is safe because its rendered page is
+cached under the term state it was rendered with, and new terms are
+inserted with ON CONFLICT DO NOTHING, so it can save them at the same
+time as the reader.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from lute.db import db
+from lute.models.repositories import BookRepository
+from lute.read.service import Service
+
+
+class PagePrefetcher:
+    "Renders pages into the rendered page cache in a background thread."
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="lute-prefetch"
+        )
+        self._generation = 0
+        self._futures = []
+        self.counters = {}
+        self.reset_counters()
+
+    def reset_counters(self):
+        "Reset the counters."
+        self.counters = {
+            "scheduled": 0,
+            "rendered": 0,
+            "cancelled": 0,
+            "errors": 0,
+        }
+
+    def stats(self):
+        "Counters."
+        with self._lock:
+            return dict(self.counters)
+
+    def cancel_pending(self):
+        """
+        Drop queued work.  Doesn't wait for a running prefetch, which
+        is left to finish in the background; call wait() for that.
+        """
+        with self._lock:
+            self._generation += 1
+            for f in self._futures:
+                if f.cancel():
+                    self.counters["cancelled"] += 1
+            self._futures = [f for f in self._futures if not f.done()]
+
+    def wait(self):
+        "Wait for all queued and running work to finish."
+        with self._lock:
+            futures = list(self._futures)
+        for f in futures:
+            if not f.cancelled():
+                f.result()
+
+    def schedule(self, app, bookid, pagenum, depth):
+        "Cancel pending work, and queue the depth pages after pagenum."
+        self.cancel_pending()
+        with self._lock:
+            generation = self._generation
+            for n in range(pagenum + 1, pagenum + 1 + depth):
+                f = self._executor.submit(self._prefetch, app, generation, bookid, n)
+                self._futures.append(f)
+                self.counters["scheduled"] += 1
+
+    def _prefetch(self, app, generation, bookid, pagenum):
+        "Render the page, unless the work is stale."
+        with self._lock:
+            if generation != self._generation:
+                self.counters["cancelled"] += 1
+                return
+        try:
+            with app.app_context():
+                book = BookRepository(db.session).find(bookid)
+                if book is not None and Service(db.session).prefetch_page(
+                    book, pagenum
+                ):
+                    with self._lock:
+                        self.counters["rendered"] += 1
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Prefetching is only an optimization, the page is
+            # rendered again when it's opened.
+            with self._lock:
+                self.counters["errors"] += 1
+            app.logger.warning(f"Prefetch of book {bookid} page {pagenum}: {e}")
+
+
+# The app-wide prefetcher.
+page_prefetcher = PagePrefetcher()
@@ -19,9 +19,8 @@ with some of the Terms overlapping:
   [A][B C][-D E][-F G H I]
 """
 
-import re
-from collections import Counter
 from lute.models.term import Term
+from lute.read.render.multiword_indexer import MultiwordTermIndexer
 from lute.read.render.text_item import TextItem
 
 # from lute.utils.debug_helpers import DebugTimer
@@ -36,26 +35,17 @@ def get_string_indexes(strings, content):
     e.g., _get_string_indexes(["is a", "cat"], "here is a cat")
     returns [("is a", 1), ("cat", 3)].
 
-    strings and content must be lowercased!
-    """
-    searchcontent = zws + content + zws
-    zwsindexes = [index for index, letter in enumerate(searchcontent) if letter == zws]
-
-    ret = []
+    strings and content must be lowercased, and zws-joined
+    (the spaces in the above example are really zws)!
 
+    All of the strings are found in a single pass over the content's
+    tokens, including overlapping matches (e.g. _b_b_ has _b_ *twice*).
+    Matches are returned in the order they're found.
+    """
+    mw = MultiwordTermIndexer()
     for s in strings:
-        # "(?=())" is required because sometimes the search pattern can
-        # overlap -- e.g. _b_b_ has _b_ *twice*.
-        # https://stackoverflow.com/questions/5616822/
-        #   how-to-use-regex-to-find-all-overlapping-matches
-        pattern = rf"(?=({re.escape(zws + s + zws)}))"
-        add_matches = [
-            (s, zwsindexes.index(m.start()))
-            for m in re.finditer(pattern, searchcontent)
-        ]
-        ret.extend(add_matches)
-
-    return ret
+        mw.add(s)
+    return list(mw.search_all(content.split(zws)))
 
 
 # pylint: disable=too-many-arguments,too-many-positional-arguments
@@ -95,23 +85,48 @@ def _create_missing_status_0_terms(tokens, terms, language):
     return new_terms
 
 
+def _get_longest_match_lengths(tokens_lc, all_terms, multiword_term_indexer):
+    """
+    Return array of the longest term token count starting at each token.
+
+    Each token is a match of length 1 (its own single-word term); any
+    multiword term matches starting at the token may be longer.
+    """
+    longest = [1] * len(tokens_lc)
+
+    if multiword_term_indexer is None:
+        multiword_term_indexer = MultiwordTermIndexer()
+        for t in all_terms:
+            if t.token_count > 1:
+                multiword_term_indexer.add(t.text_lc)
+
+    text_to_term = {t.text_lc: t for t in all_terms}
+    for text_lc, index in multiword_term_indexer.search_all(tokens_lc):
+        # A shared indexer may briefly contain a term that another
+        # session has added or deleted, so skip unknown terms.
+        mwt = text_to_term.get(text_lc)
+        if mwt is not None and mwt.token_count > longest[index]:
+            longest[index] = mwt.token_count
+
+    return longest
+
+
 def get_textitems(tokens, terms, language, multiword_term_indexer=None):
     """
     Return TextItems that will **actually be rendered**.
 
     Method to determine what should be rendered:
 
-    - Create TextItems for all of the tokens, finding their
-      starting index in the tokens.
+    - Find the longest term match (single- or multiword) starting at
+      each token.  Shorter matches at the same start are always
+      completely hidden by the longest one, so they're discarded.
 
-    - "Write" the TextItems to an array in correctly sorted
-      order, so that the correct TextItems take precendence
-      in the final rendering.
+    - Sweep through the tokens once.  Earlier matches take precedence
+      over later ones, so a match is only shown if it extends past the
+      end of everything that started before it.  Its displayed part is
+      from the end of the previously shown match to its own end.
 
-    - Calculate any term overlaps.
-
-    - Return the final list of TextItems that will actually
-      be rendered.
+    - Create TextItems for the shown matches only.
 
     ---
 
@@ -129,63 +144,27 @@ def get_textitems(tokens, terms, language, multiword_term_indexer=None):
       "F G"       (L)
       "C D E"     (M)
 
-    Creating TextItems for all of the terms, finding their starting
-    indices in the tokens:
-
-      TextToken    index   length
-      ----         -----   ------
-      [A]          0       1
-      [B]          1       1
-      ...
-      [I]          8       1
-      [B C]        1       2
-      [E F G H I]  4       5
-      [F G]        5       2
-      [C D E]      2       3
-
-    Sorting by index, then decreasing token count:
-
-      TextToken    index   length   ID (for later reference)
-      ----         -----   ------   ------------------------
-      [A]          0       1        t1
-      [B C]        1       2        t2
-      [B]          1       1        t3
-      [C D E]      2       3        t4
-      [C]          2       1        t5
-      [D]          3       1        t6
-      [E F G H I]  4       5        t7
-      [E]          4       1        t8
-      [F G]        5       2        t9
-      [F]          5       1        t10
-      [G]          6       1        t11
-      [H]          7       1        t12
-      [I]          8       1        t13
-
-    Starting at the bottom of the above list and
-    working upwards:
-
-      - ID of [I] is written to index 8: [] [] [] [] [] [] [] [] [t13]
-      - ID of [H] to index 7: [] [] [] [] [] [] [] [t12] [t13]
-      - ...
-      - [F G] to index 5 *and* 6: [] [] [] [] [] [t9] [t9] [t12] [t13]
-      - [E] to index 4:  [] [] [] [] [t8] [t9] [t9] [t12] [t13]
-      - [E F G H I] to indexes 4-8:   [] [] [] [] [t7] [t7] [t7] [t7] [t7]
-      - ... etc
-
-    Using the TextItem IDs, the resulting array would be:
-
-      output array: [t1] [t2] [t2] [t4] [t4] [t7] [t7] [t7] [t7]
-                    [A]  [B     C] [-D    E] [-F    G    H    I]
-
-    The only TextItems that will be shown are therefore:
-      t1, t2, t3, t7
-
-    To calculate what text is actually displayed, the count
-    of each ID is used.  e.g.:
-      - ID t7 appears 4 times in the output array.  The last 4 tokens of
-        [E F G H I] are [F G H I], which will be used as t7's display text.
-      - ID t2 appears 2 times.  The last 2 tokens of [B C] are [B C],
-        so that will be the display text. etc.
+    The longest match at each token index, and where it ends:
+
+      index   longest match   end   covered_until   shown?
+      -----   -------------   ---   -------------   ------
+      0       [A]             1     0               yes, shows [A]
+      1       [B C]           3     1               yes, shows [B C]
+      2       [C D E]         5     3               yes, shows [-D E]
+      3       [D]             4     5               no
+      4       [E F G H I]     9     5               yes, shows [-F G H I]
+      5       [F G]           7     9               no
+      6-8     ...             ...   9               no
+
+    ("covered_until" is the end of the shown matches so far.)
+
+    The TextItems rendered are therefore:
+
+      [A][B C][-D E][-F G H I]
+
+    Each TextItem's display_count is the number of tokens actually
+    shown, e.g. [E F G H I] has a display_count of 4, showing
+    [F G H I].
     """
     # pylint: disable=too-many-locals
 
@@ -198,57 +177,31 @@ def get_textitems(tokens, terms, language, multiword_term_indexer=None):
     text_to_term = {dt.text_lc: dt for dt in all_terms}
 
     tokens_orig = [t.token for t in tokens]
-    tokens_lc = [language.parser.get_lowercase(t) for t in tokens_orig]
+    get_lowercase = language.parser.get_lowercase
+    tokens_lc = [get_lowercase(t) for t in tokens_orig]
 
-    textitems = []
+    longest = _get_longest_match_lengths(tokens_lc, all_terms, multiword_term_indexer)
+    # dt.step("longest matches")
 
-    def _add_textitem(index, text_lc, count):
-        "Add a TextItem for position index in tokens."
+    textitems = []
+    covered_until = 0
+    for index, count in enumerate(longest):
+        end = index + count
+        if end <= covered_until:
+            # Completely hidden by earlier matches.
+            continue
         text_orig = tokens_orig[index]
+        text_lc = tokens_lc[index]
         if count > 1:
-            text_orig = zws.join(tokens_orig[index : index + count])
-        text_lc = zws.join(tokens_lc[index : index + count])
+            text_orig = zws.join(tokens_orig[index:end])
+            text_lc = zws.join(tokens_lc[index:end])
         sentence_number = tokens[index].sentence_number
         term = text_to_term.get(text_lc, None)
         ti = _make_textitem(index, text_orig, text_lc, count, sentence_number, term)
+        ti.display_count = end - max(index, covered_until)
         textitems.append(ti)
-
-    # Single-word terms.
-    for index, _ in enumerate(tokens):
-        _add_textitem(index, tokens_lc[index], 1)
-    # dt.step("single word textitems")
-
-    # Multiword terms.
-    if multiword_term_indexer is not None:
-        for r in multiword_term_indexer.search_all(tokens_lc):
-            mwt = text_to_term[r[0]]
-            count = mwt.token_count
-            _add_textitem(r[1], r[0], count)
-        # dt.step(f"get mw textitems w indexer")
-    else:
-        multiword_terms = [t.text_lc for t in all_terms if t.token_count > 1]
-        for e in get_string_indexes(multiword_terms, zws.join(tokens_lc)):
-            count = e[0].count(zws) + 1
-            _add_textitem(e[1], e[0], count)
-        # dt.step("mw textitems without indexer")
-
-    # Sorting by index, then decreasing token count.
-    textitems = sorted(textitems, key=lambda x: (x.index, -x.token_count))
-
-    # "Write out" TextItems to the output array.
-    output_textitem_ids = [None] * len(tokens)
-    for ti in reversed(textitems):
-        for c in range(ti.index, ti.index + ti.token_count):
-            output_textitem_ids[c] = id(ti)
-
-    # Calc display_counts; e.g. if a textitem's id shows up 3 times
-    # in the output_textitem_ids, it should display 3 tokens.
-    id_counts = dict(Counter(output_textitem_ids))
-    for ti in textitems:
-        ti.display_count = id_counts.get(id(ti), 0)
-    # dt.step("display_count")
-
-    textitems = [ti for ti in textitems if ti.display_count > 0]
+        covered_until = end
+    # dt.step("textitems")
 
     current_paragraph = 0
     for ti in textitems:
@@ -0,0 +1,268 @@
+"""
+Long-lived multiword term indexes, one per language.
+
+Building a MultiwordTermIndexer means loading every multiword term for
+a language, which is slow if the user has many of them.  The registry
+keeps one index per language for the life of the app, and keeps it in
+sync with the words table:
+
+- Triggers bump the language's version in the multiwordversions
+  table on every change to its multiword terms, however it's made
+  (e.g. cascade deletes, raw sql, other processes).  Each lookup
+  compares the cached index's version with the db, and rebuilds the
+  index if they differ.
+
+- Term inserts and deletes made through the ORM are applied to the
+  cached index when they're committed (see the listeners at the
+  bottom of this module), so they don't force a rebuild.  A change is
+  only applied if the index is at the version just before it;
+  otherwise the index is dropped, and rebuilt on next use.
+
+- An index loaded while the session has uncommitted writes may
+  include them, so it's dropped if the session doesn't commit.
+"""
+
+import threading
+import time
+from sqlalchemy import event, text as sqltext
+from sqlalchemy.orm import Session, object_session
+
+from lute.models.term import Term
+from lute.read.render.multiword_indexer import MultiwordTermIndexer
+
+
+class _LanguageIndex:
+    "Multiword terms for a single language, and the indexer built from them."
+
+    def __init__(self, terms, version):
+        # Map of multiword text_lc => WoID.
+        self.terms = terms
+        # The language's multiwordversions version these terms are from.
+        self.version = version
+        # Built lazily, and discarded whenever the terms change.
+        self.indexer = None
+
+    def add(self, text_lc, woid):
+        "Add term, if it's not already present."
+        if self.terms.get(text_lc) == woid:
+            return
+        self.terms[text_lc] = woid
+        self.indexer = None
+
+    def remove(self, text_lc):
+        "Remove term, if present."
+        if self.terms.pop(text_lc, None) is not None:
+            self.indexer = None
+
+
+class MultiwordIndexRegistry:
+    """
+    Per-language MultiwordTermIndexers, shared by all callers.
+
+    Indexers returned by get_indexer() are never modified after they
+    are returned, so they can be safely used by several threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._indexes = {}
+        self.counters = {}
+        self.reset_counters()
+
+    def reset_counters(self):
+        "Reset the hit/miss/rebuild counters."
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "rebuilds": 0,
+            "rebuild_seconds": 0.0,
+            "last_rebuild_seconds": 0.0,
+            "updates": 0,
+        }
+
+    def stats(self):
+        "Counters, plus the number of terms in each cached index."
+        with self._lock:
+            ret = dict(self.counters)
+            ret["languages"] = {k: len(v.terms) for k, v in self._indexes.items()}
+        return ret
+
+    def clear(self):
+        "Drop all cached indexes, e.g. when the app is (re)created."
+        with self._lock:
+            self._indexes = {}
+
+    def invalidate(self, language_id):
+        "Drop the index for the language, forcing a rebuild on next use."
+        with self._lock:
+            self._indexes.pop(language_id, None)
+
+    def _apply(self, language_id, version, change):
+        """
+        Apply the change to the language index, if loaded.  version is
+        the language's version after the change.  If the index is at
+        that version, it was loaded after the change and already has
+        it.  If it's not at the version just before it, it's dropped.
+        """
+        with self._lock:
+            entry = self._indexes.get(language_id)
+            if entry is None or entry.version == version:
+                return
+            if entry.version != version - 1:
+                del self._indexes[language_id]
+                return
+            change(entry)
+            entry.version = version
+            self.counters["updates"] += 1
+
+    def term_added(self, language_id, text_lc, woid, version):
+        "Add a saved multiword term to the language index, if loaded."
+        self._apply(language_id, version, lambda e: e.add(text_lc, woid))
+
+    def term_removed(self, language_id, text_lc, version):
+        "Remove a deleted multiword term from the language index, if loaded."
+        self._apply(language_id, version, lambda e: e.remove(text_lc))
+
+    def _load_terms(self, session, language_id):
+        "Get all multiword terms."
+        sql = """
+            SELECT WoTextLC, WoID FROM words
+            WHERE WoLgID=:language_id and WoTokenCount>1
+            """
+        rows = session.execute(sqltext(sql), {"language_id": language_id}).all()
+        return {r[0]: r[1] for r in rows}
+
+    def _build_indexer(self, terms):
+        "Build the indexer for the terms, tracking time taken."
+        start = time.perf_counter()
+        mw = MultiwordTermIndexer()
+        for t in terms:
+            mw.add(t)
+        mw.finalize()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.counters["rebuilds"] += 1
+            self.counters["rebuild_seconds"] += elapsed
+            self.counters["last_rebuild_seconds"] = elapsed
+        return mw
+
+    def get_indexer(self, session, language):
+        """
+        Return indexer loaded with all of the language's multiword terms.
+
+        The terms are loaded and the indexer built outside of the lock,
+        so a slow language doesn't block the others.  If several threads
+        load the same language, the newest version is kept.
+        """
+        if language.id is None:
+            # Unsaved language, can't have any saved terms.
+            mw = MultiwordTermIndexer()
+            mw.finalize()
+            return mw
+
+        # Read the version before the terms, so that a concurrent change
+        # leaves the loaded index looking stale rather than current.
+        version = multiword_version(session.connection(), language.id)
+        with self._lock:
+            entry = self._indexes.get(language.id)
+            if entry is not None and entry.version == version:
+                self.counters["hits"] += 1
+                if entry.indexer is not None:
+                    return entry.indexer
+                # Changes were applied, copy the terms to rebuild.
+                terms = dict(entry.terms)
+            else:
+                self.counters["misses"] += 1
+                entry = None
+
+        if entry is None:
+            terms = self._load_terms(session, language.id)
+            entry = _LanguageIndex(terms, version)
+        indexer = self._build_indexer(terms)
+
+        with self._lock:
+            current = self._indexes.get(language.id)
+            if current is entry and entry.version == version:
+                if entry.indexer is None:
+                    entry.indexer = indexer
+                return entry.indexer
+            if current is None or current.version < version:
+                entry.indexer = indexer
+                self._indexes[language.id] = entry
+                if _in_write_transaction(session):
+                    _track_loaded_language(session, language.id)
+        return indexer
+
+
+def multiword_version(connection, language_id):
+    "The language's multiwordversions version."
+    sql = "SELECT MvVersion FROM multiwordversions WHERE MvLgID=:language_id"
+    version = connection.execute(sqltext(sql), {"language_id": language_id}).scalar()
+    return version or 0
+
+
+# The app-wide registry.
+multiword_index_registry = MultiwordIndexRegistry()
+
+
+## Listeners to keep the registry in sync with the words table.
+
+# Session.info keys: ORM changes to apply on commit, and languages
+# whose indexes were loaded while the session had uncommitted writes.
+_PENDING_KEY = "multiword_index_registry_changes"
+_LOADED_KEY = "multiword_index_registry_languages"
+
+
+def _in_write_transaction(session):
+    "True if the session's db connection has uncommitted writes."
+    dbapi_con = session.connection().connection.dbapi_connection
+    return bool(getattr(dbapi_con, "in_transaction", True))
+
+
+def _track_loaded_language(session, language_id):
+    "Note the language in the session, in case it doesn't commit."
+    session.info.setdefault(_LOADED_KEY, set()).add(language_id)
+
+
+def _add_pending(target, connection, method, *args):
+    "Queue registry method call, to apply if the session commits."
+    session = object_session(target)
+    if session is None:
+        return
+    version = multiword_version(connection, target.language_id)
+    change = (method, target.language_id, *args, version)
+    session.info.setdefault(_PENDING_KEY, []).append(change)
+
+
+@event.listens_for(Term, "after_insert")
+def _term_inserted(mapper, connection, target):  # pylint: disable=unused-argument
+    "Add new multiword term."
+    if (target.token_count or 0) <= 1:
+        return
+    _add_pending(target, connection, "term_added", target.text_lc, target.id)
+
+
+@event.listens_for(Term, "after_delete")
+def _term_deleted(mapper, connection, target):  # pylint: disable=unused-argument
+    "Remove deleted multiword term."
+    if (target.token_count or 0) <= 1:
+        return
+    _add_pending(target, connection, "term_removed", target.text_lc)
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session):
+    "Changes are permanent, apply them."
+    session.info.pop(_LOADED_KEY, None)
+    for method, *args in session.info.pop(_PENDING_KEY, []):
+        getattr(multiword_index_registry, method)(*args)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _session_transaction_ended(session, transaction):
+    "If the session didn't commit, drop indexes that may have its changes."
+    if transaction.parent is not None:
+        return
+    session.info.pop(_PENDING_KEY, None)
+    for language_id in session.info.pop(_LOADED_KEY, set()):
+        multiword_index_registry.invalidate(language_id)
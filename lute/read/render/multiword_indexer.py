@@ -1,5 +1,5 @@
 """
-Find terms in contest string using ahocorapy.
+Find terms in lists of tokens using ahocorapy.
 """
 
 from ahocorapy.keywordtree import KeywordTree
@@ -7,34 +7,53 @@ from ahocorapy.keywordtree import KeywordTree
 
 class MultiwordTermIndexer:
     """
-    Find terms in strings using ahocorapy.
+    Find terms in lists of lowercase tokens using ahocorapy.
+
+    Each distinct term token is interned as an int in the indexer's
+    token vocabulary, and terms are stored in the tree as sequences of
+    those ids.  Searching maps the page tokens to ids as it goes (page
+    tokens that aren't in any term map to None, which never matches),
+    so a single pass finds all (possibly overlapping) term occurrences
+    and their starting token indexes.
     """
 
     zws = "\u200B"  # zero-width space
 
     def __init__(self):
-        self.kwtree = KeywordTree(case_insensitive=True)
+        self.kwtree = KeywordTree()
         self.finalized = False
+        # Map of lowercase token => int id.
+        self.vocab = {}
+        # Map of token id tuple => zws-joined term.
+        self.terms = {}
+
+    def _token_id(self, tok):
+        "Id for the token, adding it to the vocabulary if needed."
+        tid = self.vocab.get(tok)
+        if tid is None:
+            tid = len(self.vocab)
+            self.vocab[tok] = tid
+        return tid
 
     def add(self, t):
-        "Add zws-enclosed term to tree."
-        add_t = f"{self.zws}{t}{self.zws}"
-        self.kwtree.add(add_t)
+        "Add zws-joined term to tree."
+        key = tuple(self._token_id(tok) for tok in t.split(self.zws))
+        self.terms[key] = t
+        self.kwtree.add(key)
 
-    def search_all(self, lc_tokens):
-        "Find all terms and starting token index."
+    def finalize(self):
+        "Finalize the tree; no terms can be added after this."
         if not self.finalized:
             self.kwtree.finalize()
             self.finalized = True
 
-        zws = self.zws
-        content = zws + zws.join(lc_tokens) + zws
-        zwsindexes = [i for i, char in enumerate(content) if char == zws]
-        results = self.kwtree.search_all(content)
-
-        for result in results:
-            # print(f"{result}\n", flush=True)
-            t = result[0].strip(zws)
-            charpos = result[1]
-            index = zwsindexes.index(charpos)
-            yield (t, index)
+    def token_ids(self, lc_tokens):
+        "Vocabulary ids for the tokens, None if not in any term."
+        return map(self.vocab.get, lc_tokens)
+
+    def search_all(self, lc_tokens):
+        "Find all terms and starting token index."
+        self.finalize()
+        terms = self.terms
+        for key, index in self.kwtree.search_all(self.token_ids(lc_tokens)):
+            yield (terms[key], index)
@@ -0,0 +1,213 @@
+"""
+Cache of rendered pages.
+
+Rendering a page means parsing its text, loading all of its terms, and
+calculating the TextItems, which is wasted work if nothing has changed
+since the page was last shown (e.g. when flipping back and forth
+between pages, or refreshing).
+
+Pages are cached in compact (tuple) form, keyed by:
+
+- the text id, and a hash of the text content
+- the language's parser cache key (its parser settings, and parser
+  state such as exceptions files or dictionaries)
+- the language's "term state version", which is bumped every time
+  a term in the language is added, deleted, or has its text, status
+  or parents changed.
+
+A bump also drops all of the language's cached pages, as they can't
+be used again.  Versions are bumped when changes are flushed and again
+when they're committed or rolled back, so a page rendered by another
+session in between is never cached under a current version.
+
+Changes that bypass the ORM (e.g. raw sql deletes) must call
+invalidate_language() or clear().
+"""
+
+from collections import OrderedDict
+import hashlib
+import threading
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from lute.models.language import Language
+from lute.models.term import Term
+from lute.read.render.text_item import TextItem
+
+
+class RenderedPageCache:
+    """
+    LRU cache of rendered paragraphs, limited by approximate memory use.
+
+    A max_bytes of 0 disables the cache.
+    """
+
+    # Rough per-TextItem overhead of the compact tuple, in bytes.
+    item_overhead = 150
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()
+        self._term_versions = {}
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.counters = {}
+        self.reset_counters()
+
+    def reset_counters(self):
+        "Reset the hit/miss/eviction counters."
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def stats(self):
+        "Counters, plus current size."
+        with self._lock:
+            ret = dict(self.counters)
+            ret["entries"] = len(self._entries)
+            ret["bytes"] = self.current_bytes
+            ret["max_bytes"] = self.max_bytes
+        return ret
+
+    def clear(self):
+        "Drop all cached pages, e.g. when the app is (re)created."
+        with self._lock:
+            self._entries = OrderedDict()
+            self.current_bytes = 0
+
+    def term_version(self, language_id):
+        "Current term state version for the language."
+        with self._lock:
+            return self._term_versions.get(language_id, 0)
+
+    def invalidate_language(self, language_id):
+        "Bump the language's term state version, dropping its pages."
+        with self._lock:
+            self._term_versions[language_id] = self.term_version(language_id) + 1
+            stale = [k for k in self._entries if k[0] == language_id]
+            for k in stale:
+                self._remove(k)
+            self.counters["invalidations"] += len(stale)
+
+    def _remove(self, key):
+        "Remove entry."
+        _, size = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def make_key(self, text, language):
+        "Cache key for the text, or None if it can't be cached."
+        if text.id is None or language.id is None:
+            return None
+        text_hash = hashlib.sha1(text.text.encode("utf-8")).hexdigest()
+        return (
+            language.id,
+            text.id,
+            text_hash,
+            hash(language.parser_cache_key),
+            self.term_version(language.id),
+        )
+
+    def get(self, key):
+        "Get paragraphs of TextItems for the key, or None if not cached."
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            compact = entry[0]
+        return [
+            [[TextItem.from_compact(c) for c in sentence] for sentence in para]
+            for para in compact
+        ]
+
+    def put(self, key, paragraphs):
+        "Cache the paragraphs, evicting least recently used pages as needed."
+        if key is None or self.max_bytes <= 0:
+            return
+        compact = tuple(
+            tuple(tuple(ti.to_compact() for ti in sentence) for sentence in para)
+            for para in paragraphs
+        )
+        size = sum(
+            self.item_overhead + 2 * len(c[1])
+            for para in compact
+            for sentence in para
+            for c in sentence
+        )
+        with self._lock:
+            if key[-1] != self.term_version(key[0]):
+                # Terms changed while rendering, don't cache.
+                return
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (compact, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.counters["evictions"] += 1
+
+
+# The app-wide cache.
+rendered_page_cache = RenderedPageCache()
+
+
+## Listeners to bump term state versions.
+
+_TOUCHED_KEY = "rendered_page_cache_languages"
+
+# Term attributes that change what's rendered.
+_RENDERED_ATTRS = ["_text", "text_lc", "status", "parents"]
+
+
+def _term_changed(target):
+    "Bump the version now, and again when the transaction ends."
+    rendered_page_cache.invalidate_language(target.language_id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_TOUCHED_KEY, set()).add(target.language_id)
+
+
+@event.listens_for(Term, "after_insert")
+def _term_inserted(mapper, connection, target):  # pylint: disable=unused-argument
+    """
+    New terms change rendering, except for new unknown single words,
+    which are saved when a page is rendered: any cached page containing
+    the word already has this term.
+    """
+    if target.status == 0 and (target.token_count or 0) <= 1:
+        return
+    _term_changed(target)
+
+
+@event.listens_for(Term, "after_update")
+def _term_updated(mapper, connection, target):  # pylint: disable=unused-argument
+    "Only bump if something rendered has changed."
+    state = inspect(target)
+    if any(state.attrs[a].history.has_changes() for a in _RENDERED_ATTRS):
+        _term_changed(target)
+
+
+@event.listens_for(Term, "after_delete")
+def _term_deleted(mapper, connection, target):  # pylint: disable=unused-argument
+    _term_changed(target)
+
+
+@event.listens_for(Language, "after_delete")
+def _language_deleted(mapper, connection, target):  # pylint: disable=unused-argument
+    rendered_page_cache.invalidate_language(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _session_ended(session):
+    "Pages may have been rendered with pending changes, so bump again."
+    for language_id in session.info.pop(_TOUCHED_KEY, set()):
+        rendered_page_cache.invalidate_language(language_id)
@@ -4,12 +4,10 @@ Reading rendering helpers.
 
 import itertools
 import re
-from sqlalchemy import text as sqltext
 
 from lute.models.term import Term
-from lute.parse.base import ParsedToken
 from lute.read.render.calculate_textitems import get_textitems as calc_get_textitems
-from lute.read.render.multiword_indexer import MultiwordTermIndexer
+from lute.read.render.multiword_index_registry import multiword_index_registry
 
 # from lute.utils.debug_helpers import DebugTimer
 
@@ -32,63 +30,10 @@ class Service:
         """
         cleaned = re.sub(r" +", " ", s)
         tokens = language.get_parsed_tokens(cleaned)
-        return self._find_all_terms_in_tokens(tokens, language)
-
-    def _get_multiword_terms(self, language):
-        "Get all multiword terms."
-        sql = sqltext(
-            """
-            SELECT WoID, WoTextLC FROM words
-            WHERE WoLgID=:language_id and WoTokenCount>1
-            """
-        )
-        sql = sql.bindparams(language_id=language.id)
-        return self.session.execute(sql).all()
-
-    def _find_all_multi_word_term_text_lcs_in_content(self, text_lcs, language):
-        "Find multiword terms, return list of text_lcs."
+        mw = self.get_multiword_indexer(language)
+        return self._find_all_terms_in_tokens(tokens, language, mw)
 
-        # There are a few ways of finding multi-word Terms
-        # (with token_count > 1) in the content:
-        #
-        # 1. load each mword term text_lc via sql and check.
-        # 2. using the model
-        # 3. SQL with "LIKE"
-        #
-        # During reasonable test runs with my data, the times in seconds
-        # for each are similar (~0.02, ~0.05, ~0.025).  This method is
-        # only used for small amounts of data, and the user experience hit
-        # is negligible, so I'll use the first method which IMO is the clearest
-        # code.
-
-        zws = "\u200B"  # zero-width space
-        content = zws + zws.join(text_lcs) + zws
-
-        # Method 1:
-        reclist = self._get_multiword_terms(language)
-        return [p[1] for p in reclist if f"{zws}{p[1]}{zws}" in content]
-
-        ## # Method 2: use the model.
-        ## contained_term_qry = self.session.query(Term).filter(
-        ##     Term.language == language,
-        ##     Term.token_count > 1,
-        ##     func.instr(content, Term.text_lc) > 0,
-        ## )
-        ## return [r.text_lc for r in contained_term_qry.all()]
-
-        ## # Method 3: Query with LIKE
-        ## sql = sqltext(
-        ##     """
-        ##     SELECT WoTextLC FROM words
-        ##     WHERE WoLgID=:lid and WoTokenCount>1
-        ##     AND :content LIKE '%' || :zws || WoTextLC || :zws || '%'
-        ##     """
-        ## )
-        ## sql = sql.bindparams(lid=language.id, content=content, zws=zws)
-        ## recs = self.session.execute(sql).all()
-        ## return [r[0] for r in recs]
-
-    def _find_all_terms_in_tokens(self, tokens, language, kwtree=None):
+    def _find_all_terms_in_tokens(self, tokens, language, kwtree):
         """
         Find all terms contained in the (ordered) parsed tokens tokens.
 
@@ -100,7 +45,7 @@ class Service:
 
         Method:
         - build list of lowercase text in the tokens
-        - append all multword term strings that exist in the content
+        - append all multword term strings found by the kwtree
         - query for Terms that exist in the list
 
         Note: this method only uses indexes for multiword terms, as any
@@ -118,13 +63,8 @@ class Service:
         text_lcs = [parser.get_lowercase(t.token) for t in tokens]
 
         # Step 1: get the multiwords in the content.
-        if kwtree is None:
-            mword_terms = self._find_all_multi_word_term_text_lcs_in_content(
-                text_lcs, language
-            )
-        else:
-            results = kwtree.search_all(text_lcs)
-            mword_terms = [r[0] for r in results]
+        results = kwtree.search_all(text_lcs)
+        mword_terms = [r[0] for r in results]
         # dt.step("filtered mword terms")
 
         # Step 2: load the Term objects.
@@ -152,38 +92,44 @@ class Service:
 
         return all_terms
 
-    def get_textitems(self, s, language, multiword_term_indexer=None):
+    def get_textitems(
+        self, s, language, multiword_term_indexer=None, parsed_tokens=None
+    ):
         """
         Get array of TextItems for the string s.
 
-        The multiword_term_indexer is a big performance boost, but takes
-        time to initialize.
-        """
-        # Hacky reset of state of ParsedToken state.
-        # _Shouldn't_ be needed but doesn't hurt, even if it's lame.
-        ParsedToken.reset_counters()
+        If no multiword_term_indexer is given, the language's shared
+        indexer is used.
 
+        parsed_tokens are the already-parsed tokens of s, if available
+        (e.g. from Text.get_parsed_tokens()).
+        """
+        mw = multiword_term_indexer
+        if mw is None:
+            mw = self.get_multiword_indexer(language)
         cleaned = re.sub(r" +", " ", s)
-        tokens = language.get_parsed_tokens(cleaned)
-        terms = self._find_all_terms_in_tokens(tokens, language, multiword_term_indexer)
-        textitems = calc_get_textitems(tokens, terms, language, multiword_term_indexer)
+        tokens = parsed_tokens
+        if tokens is None or cleaned != s:
+            # The given tokens are of the uncleaned string.
+            tokens = language.get_parsed_tokens(cleaned)
+        terms = self._find_all_terms_in_tokens(tokens, language, mw)
+        textitems = calc_get_textitems(tokens, terms, language, mw)
         return textitems
 
     def get_multiword_indexer(self, language):
-        "Return indexer loaded with all multiword terms."
-        mw = MultiwordTermIndexer()
-        for r in self._get_multiword_terms(language):
-            mw.add(r[1])
-        return mw
+        """
+        Return indexer loaded with all multiword terms.
 
-    def get_paragraphs(self, s, language):
+        The indexer is shared and kept up to date by the
+        multiword_index_registry, so this is cheap to call.
         """
-        Get array of arrays of TextItems for the given string s.
+        return multiword_index_registry.get_indexer(self.session, language)
 
-        This doesn't use an indexer, as it should only be used
-        for a single page of text!
+    def get_paragraphs(self, s, language, parsed_tokens=None):
+        """
+        Get array of arrays of TextItems for the given string s.
         """
-        textitems = self.get_textitems(s, language)
+        textitems = self.get_textitems(s, language, parsed_tokens=parsed_tokens)
 
         def _split_textitems_by_paragraph(textitems):
             "Split by ¶"
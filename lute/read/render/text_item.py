@@ -9,10 +9,28 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
 
     Data structure for template read/textitem.html
 
-    Some elements are lazy loaded, because they're only needed in
-    certain situations.
+    A page can have thousands of these, so they use __slots__, and
+    the values used by the template are computed at most once.
     """
 
+    __slots__ = (
+        "index",
+        "lang_id",
+        "text",
+        "text_lc",
+        "is_word",
+        "token_count",
+        "display_count",
+        "sentence_number",
+        "paragraph_number",
+        "wo_status",
+        "extra_html_classes",
+        "_term",
+        "_wo_id",
+        "_display_text",
+        "_display_text_count",
+    )
+
     def __init__(self, term=None):
         self.index: int
         self.lang_id: int
@@ -33,13 +51,15 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
         # Calls setter
         self.term = term
 
-        self.extra_html_classes = []
+        self.extra_html_classes = ()
+
+        # Term id: set from the term once it has one, or from the
+        # cached data if there is no term (see from_compact).
+        self._wo_id = None
 
-        # TODO code
-        # # The flash message can be None, so we need an extra flag
-        # # to determine if it has been loaded or not.
-        # self._flash_message_loaded: bool = False
-        # self._flash_message: str = None
+        # display_text, and the display_count it was calculated for.
+        self._display_text = None
+        self._display_text_count = None
 
     def __repr__(self):
         return f'<TextItem "{self.text}" (wo_id={self.wo_id}, sent={self.sentence_number})>'
@@ -48,13 +68,6 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
     def term(self):
         return self._term
 
-    @property
-    def wo_id(self):
-        "The term id is the wo_id."
-        if self._term is None:
-            return None
-        return self._term.id
-
     @term.setter
     def term(self, t):
         self.wo_status = None
@@ -64,6 +77,57 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
         self.lang_id = t.language.id
         self.wo_status = t.status
 
+    @property
+    def wo_id(self):
+        """
+        The term id is the wo_id.
+
+        New terms only get their id when they're saved, after the
+        TextItem is created, so it's only cached once it's set.
+        """
+        if self._wo_id is None and self._term is not None:
+            self._wo_id = self._term.id
+        return self._wo_id
+
+    def to_compact(self):
+        "Tuple of everything needed to render this item."
+        return (
+            self.index,
+            self.text,
+            self.text_lc,
+            self.token_count,
+            self.display_count,
+            self.sentence_number,
+            self.paragraph_number,
+            self.is_word,
+            getattr(self, "lang_id", None),
+            self.wo_id,
+            self.wo_status,
+            self.extra_html_classes,
+        )
+
+    @staticmethod
+    def from_compact(c):
+        "Make a TextItem from to_compact() data, without a Term."
+        ti = TextItem()
+        (
+            ti.index,
+            ti.text,
+            ti.text_lc,
+            ti.token_count,
+            ti.display_count,
+            ti.sentence_number,
+            ti.paragraph_number,
+            ti.is_word,
+            lang_id,
+            ti._wo_id,  # pylint: disable=protected-access
+            ti.wo_status,
+            ti.extra_html_classes,
+        ) = c
+        if lang_id is not None:
+            ti.lang_id = lang_id
+        return ti
+
     # TODO - reactivate with non-lazy query results.
     # @property
     # def flash_message(self):
@@ -83,9 +147,14 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
     @property
     def display_text(self):
         "Show last n tokens, if some of the textitem is covered."
-        toks = self.text.split(zws)
-        disp_toks = toks[-self.display_count :]
-        return zws.join(disp_toks)
+        if self._display_text_count != self.display_count:
+            if self.display_count >= self.token_count:
+                self._display_text = self.text
+            else:
+                toks = self.text.split(zws)
+                self._display_text = zws.join(toks[-self.display_count :])
+            self._display_text_count = self.display_count
+        return self._display_text
 
     @property
     def html_display_text(self):
@@ -110,7 +179,7 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
 
     def add_html_class(self, c):
         "Add extra class to term."
-        self.extra_html_classes.append(c)
+        self.extra_html_classes += (c,)
 
     @property
     def html_class_string(self):
@@ -127,7 +196,7 @@ class TextItem:  # pylint: disable=too-many-instance-attributes
             "word" + str(self.wo_id),
         ]
 
-        if self.display_text != self.text:
+        if self.display_count < self.token_count:
             classes.append("overlapped")
         classes.extend(self.extra_html_classes)
 
@@ -2,8 +2,19 @@
 /read endpoints.
 """
 
-from flask import Blueprint, flash, request, render_template, redirect, jsonify
+from flask import (
+    Blueprint,
+    current_app,
+    flash,
+    request,
+    render_template,
+    redirect,
+    jsonify,
+)
 from lute.read.service import Service
+from lute.read.prefetch import page_prefetcher
+from lute.read.render.multiword_index_registry import multiword_index_registry
+from lute.read.render.page_cache import rendered_page_cache
 from lute.read.forms import TextForm
 from lute.term.model import Repository
 from lute.term.routes import handle_term_form
@@ -41,6 +52,14 @@ def _render_book_page(book, pagenum, track_page_open=True):
     )
 
 
+def _prefetch_after(book, pagenum):
+    "Render the pages after pagenum in the background."
+    depth = int(current_settings.get("read_prefetch_pages") or 0)
+    if depth > 0:
+        app = current_app._get_current_object()  # pylint: disable=protected-access
+        page_prefetcher.schedule(app, book.id, pagenum, depth)
+
+
 def _find_book(bookid):
     "Find book from db."
     br = BookRepository(db.session)
@@ -104,8 +123,12 @@ def page_done():
     pagenum = int(data.get("pagenum"))
     restknown = data.get("restknown")
 
+    page_prefetcher.cancel_pending()
     service = Service(db.session)
     service.mark_page_read(bookid, pagenum, restknown)
+    # The reader is about to open the next page, and marking the rest
+    # as known may have invalidated its rendered cache.
+    _prefetch_after(_find_book(bookid), pagenum)
     return jsonify("ok")
 
 
@@ -179,8 +202,10 @@ def start_reading(bookid, pagenum):
     if book is None:
         flash(f"No book matching id {bookid}")
         return redirect("/", 302)
+    page_prefetcher.cancel_pending()
     service = Service(db.session)
     paragraphs = service.start_reading(book, pagenum)
+    _prefetch_after(book, pagenum)
     return render_template("read/page_content.html", paragraphs=paragraphs)
 
 
@@ -191,11 +216,26 @@ def refresh_page(bookid, pagenum):
     if book is None:
         flash(f"No book matching id {bookid}")
         return redirect("/", 302)
+    page_prefetcher.cancel_pending()
     service = Service(db.session)
     paragraphs = service.get_paragraphs(book, pagenum)
+    # Term changes may have invalidated the following pages.
+    _prefetch_after(book, pagenum)
     return render_template("read/page_content.html", paragraphs=paragraphs)
 
 
+@bp.route("/render_cache_stats", methods=["GET"])
+def render_cache_stats():
+    "Rendered page cache, multiword index and prefetch stats."
+    return jsonify(
+        {
+            "rendered_pages": rendered_page_cache.stats(),
+            "multiword_indexes": multiword_index_registry.stats(),
+            "prefetch": page_prefetcher.stats(),
+        }
+    )
+
+
 @bp.route("/empty", methods=["GET"])
 def empty():
     "Show an empty/blank page."
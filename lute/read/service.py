@@ -7,10 +7,15 @@ from datetime import datetime
 import functools
 from lute.models.term import Term, Status
 from lute.models.book import Text, WordsRead
-from lute.models.repositories import BookRepository, UserSettingRepository
+from lute.models.repositories import (
+    BookRepository,
+    TermRepository,
+    UserSettingRepository,
+)
 from lute.book.stats import Service as StatsService
 from lute.read.render.service import Service as RenderService
-from lute.read.render.calculate_textitems import get_string_indexes
+from lute.read.render.multiword_indexer import MultiwordTermIndexer
+from lute.read.render.page_cache import rendered_page_cache
 from lute.term.model import Repository
 
 # from lute.utils.debug_helpers import DebugTimer
@@ -25,7 +30,7 @@ class TermPopup:
         self.term_text = self._clean(term.text)
         self.parents_text = ", ".join([self._clean(p.text) for p in term.parents])
         self.translation = self._clean(term.translation)
-        self.romanization = self._clean(term.romanization)
+        self.romanization = self._clean(term.get_romanization())
         self.tags = [tt.text for tt in term.term_tags]
         self.flash = self._clean(term.get_flash_message())
         self.image = term.get_current_image()
@@ -99,31 +104,27 @@ class Service:
         """
         Given a text, create new Terms with status Well-Known
         for any new Terms.
-        """
-        rs = RenderService(self.session)
-        paragraphs = rs.get_paragraphs(text.text, text.book.language)
-        self._save_new_status_0_terms(paragraphs)
 
-        unknowns = [
-            ti.term
+        The page's unknown terms are found from its rendered
+        TextItems (usually cached), so that terms hidden by
+        multiword terms aren't changed.  The new terms are then
+        saved and all of the unknowns updated in bulk.
+        """
+        paragraphs = self._get_page_paragraphs(text)
+        unknown_text_lcs = {
+            ti.text_lc
             for para in paragraphs
             for sentence in para
             for ti in sentence
-            if ti.is_word and ti.term.status == 0
-        ]
+            if ti.is_word and ti.wo_status == 0
+        }
 
-        batch_size = 100
-        i = 0
-
-        for t in unknowns:
-            t.status = Status.WELLKNOWN
-            self.session.add(t)
-            i += 1
-            if i % batch_size == 0:
-                self.session.commit()
-
-        # Commit any remaining.
+        language_id = text.book.language.id
+        repo = TermRepository(self.session)
+        repo.set_unknown_terms_status(language_id, unknown_text_lcs, Status.WELLKNOWN)
         self.session.commit()
+        # The updates bypassed the ORM.
+        rendered_page_cache.invalidate_language(language_id)
 
     def bulk_status_update(self, text: Text, terms_text_array, new_status):
         """
@@ -139,17 +140,20 @@ class Service:
         repo.commit()
 
     def _save_new_status_0_terms(self, paragraphs):
-        "Add status 0 terms for new textitems in paragraph."
-        tis_with_new_terms = [
-            ti
+        """
+        Add status 0 terms for new textitems in paragraph.
+
+        The terms are bulk-inserted, and are not added to the session.
+        """
+        new_terms = {
+            id(ti.term): ti.term
             for para in paragraphs
             for sentence in para
             for ti in sentence
             if ti.is_word and ti.term.id is None and ti.term.status == 0
-        ]
-
-        for ti in tis_with_new_terms:
-            self.session.add(ti.term)
+        }
+        repo = TermRepository(self.session)
+        repo.ensure_unknown_terms(list(new_terms.values()))
         self.session.commit()
 
     def _get_reading_data(self, dbbook, pagenum, track_page_open=False):
@@ -167,13 +171,33 @@ class Service:
         self.session.add(text)
         self.session.commit()
 
+        return self._get_page_paragraphs(text)
+
+    def _get_page_paragraphs(self, text):
+        "Get paragraphs, from the rendered page cache if possible."
         lang = text.book.language
+        cache_key = rendered_page_cache.make_key(text, lang)
+        paragraphs = rendered_page_cache.get(cache_key)
+        if paragraphs is not None:
+            return paragraphs
+
         rs = RenderService(self.session)
-        paragraphs = rs.get_paragraphs(text.text, lang)
+        paragraphs = rs.get_paragraphs(text.text, lang, text.get_parsed_tokens())
         self._save_new_status_0_terms(paragraphs)
+        rendered_page_cache.put(cache_key, paragraphs)
 
         return paragraphs
 
+    def prefetch_page(self, dbbook, pagenum):
+        """
+        Render the page into the rendered page cache, without
+        marking it as opened.  Returns False if there's no such page.
+        """
+        if pagenum < 1 or pagenum > dbbook.page_count:
+            return False
+        self._get_page_paragraphs(dbbook.text_at_page(pagenum))
+        return True
+
     def get_paragraphs(self, dbbook, pagenum):
         "Get the paragraphs for the book."
         return self._get_reading_data(dbbook, pagenum, False)
@@ -184,17 +208,19 @@ class Service:
 
     def _sort_components(self, term, components):
         "Sort components by min position in string and length."
-        component_and_pos = []
+        mw = MultiwordTermIndexer()
         for c in components:
-            c_indices = [
-                loc[1] for loc in get_string_indexes([c.text_lc], term.text_lc)
-            ]
-
-            # Sometimes the components aren't found
-            # in the string, which makes no sense ...
-            # ref https://github.com/LuteOrg/lute-v3/issues/474
-            if len(c_indices) > 0:
-                component_and_pos.append([c, min(c_indices)])
+            mw.add(c.text_lc)
+        first_index = {}
+        for text_lc, index in mw.search_all(term.text_lc.split(mw.zws)):
+            first_index[text_lc] = min(index, first_index.get(text_lc, index))
+
+        # Sometimes the components aren't found
+        # in the string, which makes no sense ...
+        # ref https://github.com/LuteOrg/lute-v3/issues/474
+        component_and_pos = [
+            [c, first_index[c.text_lc]] for c in components if c.text_lc in first_index
+        ]
 
         def compare(a, b):
             # Lowest position (closest to front of string) sorts first.
@@ -39,6 +39,11 @@ class UserSettingsForm(FlaskForm):
         validators=[InputRequired(), NumberRange(min=1, max=500)],
         render_kw={"title": "Number of pages to use for book stats calculation."},
     )
+    read_prefetch_pages = IntegerField(
+        "Pages to prepare in advance while reading",
+        validators=[InputRequired(), NumberRange(min=0, max=10)],
+        render_kw={"title": "Number of following pages to render in the background."},
+    )
 
     term_popup_promote_parent_translation = BooleanField(
         "Promote parent translation to term translation if possible"
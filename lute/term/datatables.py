@@ -97,5 +97,8 @@ def get_data_tables_list(parameters, session):
 
     # Phew.
     return DataTablesSqliteQuery.get_data(
-        base_sql + " WHERE " + " AND ".join(wheres), parameters, session.connection()
+        base_sql + " WHERE " + " AND ".join(wheres),
+        parameters,
+        session.connection(),
+        key_column="WoID",
     )
@@ -8,7 +8,8 @@ them in the database.
 import re
 import sqlalchemy
 
-from lute.models.term import Term as DBTerm, TermTag
+from lute.models.book import sentence_index_tokens
+from lute.models.term import Term as DBTerm, TermTag, set_missing_readings
 from lute.models.repositories import (
     LanguageRepository,
     TermRepository,
@@ -85,6 +86,10 @@ class Repository:
         # plus language ID.
         self.identity_map = {}
 
+        # DBTerms that are new or were unknown (status 0), which need
+        # a reading on commit if they're saved with another status.
+        self.maybe_needing_readings = []
+
     def _id_map_key(self, langid, text):
         return f"key-{langid}-{text}"
 
@@ -205,42 +210,77 @@ class Repository:
         if search == "":
             return []
 
-        sql_query = """SELECT
+        params = {
+            "text_lc": text_lc,
+            "text_lc_wildcard": f"%{text_lc}%",
+            "text_lc_starts_with": f"{text_lc}%",
+            "langid": langid,
+            "max_results": max_results,
+        }
+        has_wildcards = "%" in search or "_" in search
+
+        if len(search) < 3 and not has_wildcards:
+            # The wordsfts index can't find short strings, but if
+            # enough terms start with the search, the others (which
+            # sort after them) aren't needed, so only check the range
+            # of WoTextLC starting with it.
+            params["text_lc_next"] = text_lc[:-1] + chr(ord(text_lc[-1]) + 1)
+            starting = self._query_matches(
+                "AND t.WoTextLC >= :text_lc AND t.WoTextLC < :text_lc_next", params
+            )
+            if len(starting) == max_results:
+                return starting
+
+        # The wordsfts trigram index can only find strings of 3+
+        # chars, and LIKE wildcards in the search must still work.
+        fts_filter = ""
+        if len(search) >= 3 and not has_wildcards and self._term_search_index_exists():
+            fts_filter = """AND t.WoID IN (
+              SELECT rowid FROM wordsfts WHERE wordsfts MATCH :fts_query
+            )"""
+            params["fts_query"] = '"' + search.replace('"', '""') + '"'
+        return self._query_matches(fts_filter, params)
+
+    def _query_matches(self, extra_filter, params):
+        "Matching terms for find_matches, with the extra where filter."
+        # The unary + stops sqlite from using the WoLgID index (i.e.
+        # scanning all of the language's terms) if there's a filter.
+        langid_col = "+t.WoLgID" if extra_filter else "t.WoLgID"
+        sql_query = f"""SELECT
         t.WoID as id,
         t.WoText as text,
         t.WoTextLC as text_lc,
         t.WoTranslation as translation,
         t.WoStatus as status,
         t.WoLgID as language_id,
-        CASE WHEN wp.WpParentWoID IS NOT NULL THEN 1 ELSE 0 END AS has_children,
+        CASE WHEN EXISTS (
+          SELECT 1 FROM wordparents WHERE WpParentWoID = t.WoID
+        ) THEN 1 ELSE 0 END AS has_children,
         CASE WHEN t.WoTextLC = :text_lc THEN 2
           WHEN t.WoTextLC LIKE :text_lc_starts_with THEN 1
           ELSE 0
         END as text_starts_with_search_string
 
         FROM words AS t
-        LEFT JOIN (
-          select WpParentWoID from wordparents group by WpParentWoID
-        ) wp on wp.WpParentWoID = t.WoID
 
-        WHERE t.WoLgID = :langid AND t.WoTextLC LIKE :text_lc_wildcard
+        WHERE {langid_col} = :langid AND t.WoTextLC LIKE :text_lc_wildcard
+        {extra_filter}
 
         ORDER BY text_starts_with_search_string DESC, has_children DESC, t.WoTextLC
         LIMIT :max_results
         """
         # print(sql_query)
-        params = {
-            "text_lc": text_lc,
-            "text_lc_wildcard": f"%{text_lc}%",
-            "text_lc_starts_with": f"{text_lc}%",
-            "langid": langid,
-            "max_results": max_results,
-        }
         # print(params)
 
         alchsql = sqlalchemy.text(sql_query)
         return self.session.execute(alchsql, params).fetchall()
 
+    def _term_search_index_exists(self):
+        "True if the wordsfts index was set up, see lute.db.setup.main."
+        sql = """SELECT COUNT(*) FROM sqlite_master
+          WHERE type = 'trigger' AND name = 'trig_words_after_insert_add_wordsfts'"""
+        return self.session.execute(sqlalchemy.text(sql)).scalar() > 0
+
     def get_term_tags(self):
         "Get all available term tags, helper method."
         tags = self.session.query(TermTag).all()
@@ -272,6 +312,8 @@ class Repository:
         """
         Commit everything, flush the map to force refetches.
         """
+        set_missing_readings([t for t in self.maybe_needing_readings if t.status != 0])
+        self.maybe_needing_readings = []
         self.identity_map = {}
         self.session.commit()
 
@@ -292,6 +334,9 @@ class Repository:
             t = term_repo.find_by_spec(spec) or DBTerm()
             t.language = spec.language
 
+        if t.id is None or t.status == 0:
+            self.maybe_needing_readings.append(t)
+
         t.text = term.text
         t.original_text = term.text
         t.status = term.status
@@ -352,6 +397,7 @@ class Repository:
 
         if new_or_unknown_parent:
             p.status = term.status
+            self.maybe_needing_readings.append(p)
 
         # Copy translation, image if missing, but _not_ if we're just
         # re-saving an existing term.
@@ -392,11 +438,10 @@ class Repository:
         term.text = text
 
         term.translation = dbterm.translation
-        term.romanization = dbterm.romanization
+        term.romanization = dbterm.get_romanization()
         term.current_image = dbterm.get_current_image()
         term.flash_message = dbterm.get_flash_message()
         term.parents = [p.text for p in dbterm.parents]
-        term.romanization = dbterm.romanization
         term.term_tags = [tt.text for tt in dbterm.term_tags]
 
         # pylint: disable=protected-access
@@ -460,12 +505,31 @@ class ReferencesRepository:
         searchterm = term_repo.find(term_id)
         return self._find_references(searchterm)
 
+    def find_references_for_terms(self, term_ids, limit_per_term=None):
+        """
+        Find references for many terms at once.
+
+        Returns dict of term id to list of TermReferences, using
+        at most limit_per_term (default self.limit) references for
+        each term.  Only the terms' own references are returned, not
+        those of their children or parents.
+        """
+        ids = list({int(tid) for tid in term_ids})
+        terms = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            terms.extend(self.session.query(DBTerm).filter(DBTerm.id.in_(chunk)).all())
+        ret = {tid: [] for tid in ids}
+        ret.update(self._get_references_many(terms, limit_per_term or self.limit))
+        return ret
+
     def _find_references(self, searchterm):
         "Find refs."
+        children, parents = self._get_family_references(searchterm)
         references = {
             "term": self._get_references(searchterm),
-            "children": self._get_child_references(searchterm),
-            "parents": self._get_parent_references(searchterm),
+            "children": children,
+            "parents": parents,
         }
         return references
 
@@ -484,7 +548,36 @@ class ReferencesRepository:
             ret.append(TermReference(row[0], row[1], row[2], row[3], sentence))
         return ret
 
-    def _get_references(self, term):
+    def _index_tokens(self, term_lc):
+        """
+        Sorted sentencetokens index tokens of the term, or [] if the
+        index can't be used for it.
+        """
+        if "%" in term_lc or "_" in term_lc:
+            return []
+        return sorted(sentence_index_tokens(term_lc))
+
+    def _sentence_index_filter(self, term_lc, params):
+        """
+        SQL restricting the sentences to those with all of the term's
+        tokens in the sentencetokens index, adding the tokens to params.
+
+        Returns "" if the index can't be used, i.e. if the term has no
+        indexed tokens, or has LIKE wildcards which could match other
+        tokens.
+        """
+        tokens = self._index_tokens(term_lc)
+        if len(tokens) == 0:
+            return ""
+        selects = []
+        for i, tok in enumerate(tokens):
+            params[f"tok{i}"] = tok
+            selects.append(
+                f"SELECT SxSeID FROM sentencetokens WHERE SxTokenLC = :tok{i}"
+            )
+        return f"AND SeID IN ({' INTERSECT '.join(selects)})"
+
+    def _get_references(self, term, limit=None):
         """
         Search the sentences.text_content (or textlc_content if needed).
 
@@ -492,6 +585,10 @@ class ReferencesRepository:
         returns the same data as using the sentence Language.parser.  This
         saves a pile of space, at least in my case with Spanish, as only
         0.5% of the lowercased sentences actually differ.
+
+        Only the sentences with all of the term's tokens (found from
+        the sentencetokens index) are searched.  The LIKE then checks
+        that the tokens are together and in order.
         """
         if term is None:
             return []
@@ -501,60 +598,168 @@ class ReferencesRepository:
             only_include_read = "1=1"  # include everything.
 
         term_lc = term.text_lc
+        pattern = f"%{chr(0x200B)}{term_lc}{chr(0x200B)}%"
+        params = {"pattern": pattern}
+        index_filter = self._sentence_index_filter(term_lc, params)
         query = sqlalchemy.text(
             f"""
             SELECT DISTINCT
                 texts.TxBkID,
                 TxID,
                 TxOrder,
-                BkTitle || ' (' || TxOrder || '/' || pc.c || ')' AS TxTitle,
+                BkTitle || ' (' || TxOrder || '/' || (
+                    SELECT COUNT(*) FROM texts pc WHERE pc.TxBkID = texts.TxBkID
+                ) || ')' AS TxTitle,
                 SeText
             FROM sentences
             INNER JOIN texts ON TxID = SeTxID
             INNER JOIN books ON BkID = texts.TxBkID
-            INNER JOIN (
-                SELECT TxBkID, COUNT(*) AS c
-                FROM texts
-                GROUP BY TxBkID
-            ) pc ON pc.TxBkID = texts.TxBkID
             WHERE { only_include_read }
+            { index_filter }
             AND SeText IS NOT NULL
             AND CASE WHEN SeTextLC == '*' THEN SeText ELSE SeTextLC END LIKE :pattern
             AND BkLgID = {term.language.id}
             ORDER BY TxReadDate desc, TxID desc
-            LIMIT {self.limit}
+            LIMIT {limit or self.limit}
         """
         )
         # print(query)
 
-        pattern = f"%{chr(0x200B)}{term_lc}{chr(0x200B)}%"
-        params = {"pattern": pattern}
         result = self.session.execute(query, params)
         return self._build_term_references(term_lc, result)
 
-    def _get_all_refs(self, terms):
-        all_references = []
-        for term in terms:
-            references = self._get_references(term)
-            all_references.extend(references)
-        return all_references
-
-    def _get_parent_references(self, term):
-        parent_references = []
-        for parent in term.parents:
-            parent_term_lc = parent.text_lc
-            references = self._get_family_references(parent, term)
-            parent_references.append({"term": parent_term_lc, "refs": references})
-        return parent_references
-
-    def _get_family_references(self, parent, term):
-        if term is None or parent is None:
-            return []
-        family = [parent] + parent.children
-        family = [t for t in family if t.id != term.id]
-        return self._get_all_refs(family)
+    def _get_references_many(self, terms, limit):
+        """
+        References of many terms, as dict of term id to
+        TermReferences, with at most limit references per term.
+
+        Terms that can use the sentencetokens index are searched
+        together, in batches, with a window function limiting the
+        references per term.  The others are searched one at a time.
+        """
+        ret = {}
+        indexed = []
+        for t in {t.id: t for t in terms}.values():
+            tokens = self._index_tokens(t.text_lc)
+            if len(tokens) == 0:
+                ret[t.id] = self._get_references(t, limit)
+            else:
+                indexed.append((t, tokens))
+
+        # Keep the number of query params well under sqlite's limit.
+        batch = []
+        batch_params = 0
+        for t, tokens in indexed:
+            if batch_params + len(tokens) + 1 > 900 and len(batch) > 0:
+                ret.update(self._get_indexed_references_batch(batch, limit))
+                batch = []
+                batch_params = 0
+            batch.append((t, tokens))
+            batch_params += len(tokens) + 1
+        if len(batch) > 0:
+            ret.update(self._get_indexed_references_batch(batch, limit))
+        return ret
+
+    def _get_indexed_references_batch(self, terms_and_tokens, limit):
+        """
+        References of the terms, all found in one query.
+
+        The candidate sentences for each term are those with all of
+        its tokens in the sentencetokens index; the LIKE then checks
+        that the tokens are together and in order, as in
+        _get_references.
+        """
+        only_include_read = "TxReadDate IS NOT NULL"
+        if self.include_unread:
+            only_include_read = "1=1"  # include everything.
+
+        zws = chr(0x200B)
+        params = {}
+        searchterms = []
+        termtokens = []
+        for t, tokens in terms_and_tokens:
+            params[f"pattern{t.id}"] = f"%{zws}{t.text_lc}{zws}%"
+            searchterms.append(f"({t.id}, {t.language.id}, :pattern{t.id})")
+            for i, tok in enumerate(tokens):
+                params[f"tok{t.id}_{i}"] = tok
+                termtokens.append(f"({t.id}, {len(tokens)}, :tok{t.id}_{i})")
 
-    def _get_child_references(self, term):
+        query = sqlalchemy.text(
+            f"""
+            WITH searchterms(tid, lgid, pattern) AS (
+                VALUES {', '.join(searchterms)}
+            ),
+            termtokens(tid, ntoks, tok) AS (
+                VALUES {', '.join(termtokens)}
+            ),
+            candidates(tid, sentence_id) AS (
+                SELECT termtokens.tid, SxSeID
+                FROM termtokens
+                INNER JOIN sentencetokens ON SxTokenLC = termtokens.tok
+                GROUP BY termtokens.tid, SxSeID
+                HAVING COUNT(*) = MAX(termtokens.ntoks)
+            ),
+            matches AS (
+                SELECT DISTINCT
+                    searchterms.tid, texts.TxBkID, TxID, TxOrder, TxReadDate,
+                    BkTitle, SeText
+                FROM candidates
+                INNER JOIN searchterms ON searchterms.tid = candidates.tid
+                INNER JOIN sentences ON SeID = candidates.sentence_id
+                INNER JOIN texts ON TxID = SeTxID
+                INNER JOIN books ON BkID = texts.TxBkID
+                WHERE { only_include_read }
+                AND SeText IS NOT NULL
+                AND CASE WHEN SeTextLC == '*' THEN SeText ELSE SeTextLC END
+                    LIKE searchterms.pattern
+                AND BkLgID = searchterms.lgid
+            ),
+            ranked AS (
+                SELECT matches.*, ROW_NUMBER() OVER (
+                    PARTITION BY tid ORDER BY TxReadDate desc, TxID desc
+                ) AS rownum
+                FROM matches
+            )
+            SELECT
+                TxBkID,
+                TxID,
+                TxOrder,
+                BkTitle || ' (' || TxOrder || '/' || (
+                    SELECT COUNT(*) FROM texts pc WHERE pc.TxBkID = ranked.TxBkID
+                ) || ')' AS TxTitle,
+                SeText,
+                tid
+            FROM ranked
+            WHERE rownum <= {limit}
+            ORDER BY tid, rownum
+        """
+        )
+
+        rows_by_term = {t.id: [] for t, _ in terms_and_tokens}
+        for row in self.session.execute(query, params):
+            rows_by_term[row[5]].append(row)
+        return {
+            t.id: self._build_term_references(t.text_lc, rows_by_term[t.id])
+            for t, _ in terms_and_tokens
+        }
+
+    def _get_family_references(self, term):
+        """
+        References of the term's children, and of each of its
+        parents' families (the parent and its other children), found
+        together.
+        """
         if term is None:
-            return []
-        return self._get_all_refs(term.children)
+            return [], []
+        families = [
+            (p, [p] + [c for c in p.children if c.id != term.id]) for p in term.parents
+        ]
+        all_terms = term.children + [t for _, fam in families for t in fam]
+        refs = self._get_references_many(all_terms, self.limit)
+
+        def _all_refs(terms):
+            return [r for t in terms for r in refs[t.id]]
+
+        children = _all_refs(term.children)
+        parents = [{"term": p.text_lc, "refs": _all_refs(fam)} for p, fam in families]
+        return children, parents
@@ -4,7 +4,7 @@
 
 from dataclasses import dataclass, field
 from typing import List, Optional
-from lute.models.term import Status
+from lute.models.term import Status, set_missing_readings
 from lute.models.repositories import TermRepository, TermTagRepository
 from lute.term.model import Repository
 
@@ -70,7 +70,9 @@ class Service:
             ttrepo.find_or_create_by_text(a) for a in bulk_update_data.remove_tags
         ]
 
+        left_unknown = []
         for term in terms:
+            was_unknown = term.status == Status.UNKNOWN
             if bulk_update_data.lowercase_terms:
                 term.text = term.text_lc
             if bulk_update_data.remove_parents:
@@ -94,8 +96,12 @@ class Service:
             for tag in remove_tags:
                 term.remove_term_tag(tag)
 
+            if was_unknown and term.status != Status.UNKNOWN:
+                left_unknown.append(term)
             self.session.add(term)
-            self.session.commit()
+
+        set_missing_readings(left_unknown)
+        self.session.commit()
 
     def apply_ajax_update(self, term_id, update_type, value):
         "Apply single update from datatables updatable cells interactions."
@@ -19,10 +19,7 @@ class Service:
         "Export unknown terms in the book to outfile."
         lang = book.language
         unique_tokens = {
-            t
-            for txt in book.texts
-            for t in lang.get_parsed_tokens(txt.text)
-            if t.is_word
+            t for txt in book.texts for t in txt.get_parsed_tokens() if t.is_word
         }
         unique_lcase_toks = {lang.get_lowercase(t.token) for t in unique_tokens}
 
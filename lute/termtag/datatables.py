@@ -21,4 +21,6 @@ def get_data_tables_list(parameters, session):
           ) src on src.WtTgID = TgID
     """
     connection = session.connection()
-    return DataTablesSqliteQuery.get_data(base_sql, parameters, connection)
+    return DataTablesSqliteQuery.get_data(
+        base_sql, parameters, connection, key_column="TgID"
+    )
@@ -2,7 +2,10 @@
 Helper methods to get data for datatables display.
 """
 
+from collections import OrderedDict
+import itertools
 import re
+import threading
 from sqlalchemy.sql import text
 from lute.parse.registry import supported_parser_types
 
@@ -137,8 +140,73 @@ class DataTablesFlaskParamParser:
         }
 
 
+class _QueryCache:
+    """
+    Small LRU cache for DataTablesSqliteQuery: record counts, and the
+    sort values of the last rows of pages already served.
+
+    Keys include the data version (see _data_version), so entries are
+    never used after the data changes.
+    """
+
+    def __init__(self, max_entries=256):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key):
+        "Cached value, or None."
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        "Cache the value, dropping the least recently used if full."
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        "Drop everything."
+        with self._lock:
+            self._entries = OrderedDict()
+
+
+_query_cache = _QueryCache()
+_connection_ids = itertools.count()
+
+
+def _data_version(conn):
+    """
+    Value that changes whenever the data seen by the connection may
+    have changed: sqlite's total_changes() counts the connection's own
+    inserts, updates and deletes, and PRAGMA data_version changes when
+    other connections commit.
+    """
+    if "datatables_connection_id" not in conn.info:
+        conn.info["datatables_connection_id"] = next(_connection_ids)
+    connection_id = conn.info["datatables_connection_id"]
+    changes = conn.execute(text("SELECT total_changes()")).scalar()
+    data_version = conn.execute(text("PRAGMA data_version")).scalar()
+    return (connection_id, changes, data_version)
+
+
 class DataTablesSqliteQuery:
-    "Get data for datatables rendering."
+    """
+    Get data for datatables rendering.
+
+    The total record count is cached until the data changes, and the
+    filtered count is only run if there's a search.
+
+    If a unique key_column is given, it's added to the end of the
+    sort, and pages following one already served are found by seeking
+    past that page's last row (keyset pagination) rather than using
+    an OFFSET.
+    """
 
     @staticmethod
     def where_and_params(searchable_cols, parameters):
@@ -172,15 +240,15 @@ class DataTablesSqliteQuery:
         return ["WHERE " + " AND ".join(part_wheres), params]
 
     @staticmethod
-    def get_sql(base_sql, parameters):
-        "Build sql used for datatables queries."
+    def _order_terms(parameters, key_column=None):
+        """
+        The (column, direction) terms of the ORDER BY: the indicated
+        sorting, then all cols marked orderable, then the key_column.
+        """
         columns = parameters["columns"]
 
-        def cols_with(attr):
-            return [c["name"] for c in columns if c[attr] is True]
-
         # Default sorting order is all cols marked orderable.
-        orderby = ", ".join(cols_with("orderable"))
+        terms = [(c["name"], None) for c in columns if c["orderable"] is True]
 
         # Prepend indicated sorting.
         for order in parameters["order"]:
@@ -188,7 +256,60 @@ class DataTablesSqliteQuery:
             col = columns[col_index]
             sort_field = col["name"] or ""
             if col["orderable"] is True and sort_field != "":
-                orderby = f"{sort_field} {order['dir']}, {orderby}"
+                terms.insert(0, (sort_field, order["dir"]))
+
+        if key_column is not None:
+            terms.append((key_column, None))
+        return terms
+
+    @staticmethod
+    def _seek_condition(order_terms, seek_after, params):
+        """
+        Condition for rows sorting after seek_after, the sort values of
+        a row, adding the values to params.  sqlite sorts NULLs first
+        in ascending order, and last in descending order.
+        """
+        # Later terms for the same column don't change the order.
+        seen = set()
+        terms = []
+        for (col, direction), val in zip(order_terms, seek_after):
+            if col not in seen:
+                seen.add(col)
+                terms.append((col, (direction or "").lower() == "desc", val))
+
+        cond = None
+        for i, (col, desc, val) in reversed(list(enumerate(terms))):
+            if val is None:
+                after = "0" if desc else f"{col} IS NOT NULL"
+                same = f"{col} IS NULL"
+            else:
+                params[f"seek{i}"] = val
+                after = f"({col} < :seek{i} OR {col} IS NULL)"
+                if not desc:
+                    after = f"{col} > :seek{i}"
+                same = f"{col} = :seek{i}"
+            cond = after if cond is None else f"({after} OR ({same} AND {cond}))"
+        return cond
+
+    @staticmethod
+    def get_sql(base_sql, parameters, key_column=None, seek_after=None):
+        """
+        Build sql used for datatables queries.
+
+        If seek_after (the sort values of the last row of the previous
+        page) is given, the data query seeks past it instead of using
+        the start offset.
+        """
+        columns = parameters["columns"]
+
+        def cols_with(attr):
+            return [c["name"] for c in columns if c[attr] is True]
+
+        order_terms = DataTablesSqliteQuery._order_terms(parameters, key_column)
+        orderby = ", ".join(
+            col if direction is None else f"{col} {direction}"
+            for col, direction in order_terms
+        )
         orderby = f"ORDER BY {orderby}"
 
         [where, params] = DataTablesSqliteQuery.where_and_params(
@@ -196,10 +317,16 @@ class DataTablesSqliteQuery:
         )
 
         realbase = f"({base_sql}) realbase".replace("\n", " ")
-        start = parameters["start"]
-        length = parameters["length"]
+        limit = f"LIMIT {parameters['start']}, {parameters['length']}"
+        data_where = where
+        if seek_after is not None:
+            seek = DataTablesSqliteQuery._seek_condition(
+                order_terms, seek_after, params
+            )
+            data_where = f"{where} AND {seek}" if where else f"WHERE {seek}"
+            limit = f"LIMIT {parameters['length']}"
         # pylint: disable=line-too-long
-        data_sql = f"SELECT * FROM (select * from {realbase} {where} {orderby} LIMIT {start}, {length}) src {orderby}"
+        data_sql = f"SELECT * FROM (select * from {realbase} {data_where} {orderby} {limit}) src {orderby}"
 
         return {
             "recordsTotal": f"select count(*) from {realbase}",
@@ -210,31 +337,82 @@ class DataTablesSqliteQuery:
         }
 
     @staticmethod
-    def get_data(base_sql, parameters, conn):
-        "Return dict required for datatables rendering."
-        recordsTotal = None
-        recordsFiltered = None
-
-        try:
-            sql_dict = DataTablesSqliteQuery.get_sql(base_sql, parameters)
-
-            def runqry(name, use_params=True):
-                "Run the given query from the datatables list of queries."
-                prms = None
-                if use_params:
-                    prms = sql_dict["params"]
-                return conn.execute(text(sql_dict[name]), prms)
-
-            recordsTotal = runqry("recordsTotal", False).fetchone()[0]
-            recordsFiltered = runqry("recordsFiltered").fetchone()[0]
-            res = runqry("data")
-            column_names = res.keys()
-            # Convert each row into a dict, { fieldname: value ... }
-            ret = [dict(zip(column_names, row)) for row in res.fetchall()]
-
-        except Exception as e:
-            raise e
+    def _page_end(column_names, order_terms, row):
+        "Sort values of the row, or None if a sort column isn't in it."
+        names = {c.lower(): c for c in column_names}
+        order_cols = [names.get(col.lower()) for col, _ in order_terms]
+        if None in order_cols:
+            return None
+        return [row[c] for c in order_cols]
+
+    @staticmethod
+    def _counts(conn, base_sql, sql_dict, version):
+        "The total (cached) and filtered record counts."
+        total_key = ("total", base_sql, version)
+        total = _query_cache.get(total_key)
+        if total is None:
+            total = conn.execute(text(sql_dict["recordsTotal"])).fetchone()[0]
+            _query_cache.put(total_key, total)
+
+        params = sql_dict["params"]
+        if len(params) == 0:
+            # No search, so nothing filtered.
+            return total, total
+        filtered_sql = text(sql_dict["recordsFiltered"])
+        return total, conn.execute(filtered_sql, params).fetchone()[0]
 
+    @staticmethod
+    def _page_rows(conn, base_sql, parameters, key_column, version):
+        """
+        Rows of the page as dicts, { fieldname: value ... }.
+
+        Pages following one already served start after its last row.
+        """
+
+        def _rows(sql_dict):
+            res = conn.execute(text(sql_dict["data"]), sql_dict["params"])
+            column_names = list(res.keys())
+            return column_names, [dict(zip(column_names, r)) for r in res.fetchall()]
+
+        sql_dict = DataTablesSqliteQuery.get_sql(base_sql, parameters, key_column)
+        start = int(parameters["start"])
+        length = int(parameters["length"])
+        if key_column is None or length <= 0:
+            return _rows(sql_dict)[1]
+
+        order_terms = DataTablesSqliteQuery._order_terms(parameters, key_column)
+        page_key = (base_sql, tuple(sorted(sql_dict["params"].items())))
+        page_key = ("page_end", page_key, tuple(order_terms), version)
+        seek_after = _query_cache.get(page_key + (start,)) if start > 0 else None
+        if seek_after is not None:
+            sql_dict = DataTablesSqliteQuery.get_sql(
+                base_sql, parameters, key_column, seek_after
+            )
+
+        column_names, ret = _rows(sql_dict)
+        if len(ret) == length:
+            page_end = DataTablesSqliteQuery._page_end(
+                column_names, order_terms, ret[-1]
+            )
+            if page_end is not None:
+                _query_cache.put(page_key + (start + length,), page_end)
+        return ret
+
+    @staticmethod
+    def get_data(base_sql, parameters, conn, key_column=None):
+        """
+        Return dict required for datatables rendering.
+
+        key_column, if given, must be unique in the base_sql rows.
+        """
+        version = _data_version(conn)
+        sql_dict = DataTablesSqliteQuery.get_sql(base_sql, parameters)
+        recordsTotal, recordsFiltered = DataTablesSqliteQuery._counts(
+            conn, base_sql, sql_dict, version
+        )
+        ret = DataTablesSqliteQuery._page_rows(
+            conn, base_sql, parameters, key_column, version
+        )
         result = {
             "recordsTotal": recordsTotal,
             "recordsFiltered": recordsFiltered,
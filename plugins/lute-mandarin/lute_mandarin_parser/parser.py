@@ -11,6 +11,7 @@ Includes classes:
 
 import re
 import os
+import threading
 from typing import List
 import jieba
 from pypinyin import pinyin
@@ -26,6 +27,9 @@ class MandarinParser(AbstractParser):
     data file.
     """
 
+    # (file stat key, exceptions map) of the last exceptions file read.
+    _exceptions_cache = (None, {})
+
     @classmethod
     def name(cls):
         return "Lute Mandarin Chinese"
@@ -57,7 +61,7 @@ class MandarinParser(AbstractParser):
 
     @classmethod
     def init_data_directory(cls):
-        "Set up necessary files."
+        "Set up necessary files, and start loading jieba."
         fp = cls.parser_exceptions_file()
         if not os.path.exists(fp):
             with open(fp, "w", encoding="utf8") as f:
@@ -65,14 +69,27 @@ class MandarinParser(AbstractParser):
                 f.write("# Place each rule on a separate line. e.g.:\n")
                 f.write("# 清华,大学\n")
                 f.write("# Lines preceded with # are ignored.\n")
+        cls.warm_up()
+
+    @classmethod
+    def warm_up(cls):
+        """
+        Load jieba's dictionary in a background thread, so that the
+        first parse doesn't have to wait for it.  jieba locks its
+        initialization, so parsing during the load is safe.
+        """
+        threading.Thread(target=jieba.initialize, daemon=True).start()
 
     @classmethod
     def _build_parser_exceptions_map(cls):
-        "Convert exceptions file to map."
-        if cls.data_directory is None:
-            return {}
+        """
+        Convert exceptions file to map of token => final parts.
 
-        ret = {}
+        Rules can split the parts of other rules, so each token's
+        parts are fully expanded here, rather than for every parsed
+        token.
+        """
+        rules = {}
         with open(cls.parser_exceptions_file(), "r", encoding="utf8") as f:
             for line in f:
                 stripped_line = line.strip()
@@ -80,30 +97,51 @@ class MandarinParser(AbstractParser):
                     continue
                 parts = [p.strip() for p in stripped_line.split(",")]
                 orig_token = "".join(parts)
-                ret[orig_token] = parts
-        return ret
-
-    def _reparse_with_exceptions_map(self, original_token, exceptions_map):
-        "Check the token s against the map, break down further if needed."
+                rules[orig_token] = parts
 
-        # pylint: disable=dangerous-default-value
-        def _get_mapped(tok, accum=[]):
-            parts = exceptions_map.get(tok)
+        def _expand(tok):
+            parts = rules.get(tok)
             if parts is None or len(parts) == 1:
-                accum.append(tok)
-            else:
-                for p in parts:
-                    _get_mapped(p, accum)
-            return accum
+                return [tok]
+            # A part the same as the token (other parts empty) isn't
+            # split again.
+            return [x for p in parts for x in (_expand(p) if p != tok else [p])]
+
+        return {tok: _expand(tok) for tok, parts in rules.items() if len(parts) > 1}
 
-        return _get_mapped(original_token)
+    @classmethod
+    def _parser_exceptions_file_key(cls):
+        "Stat key of the exceptions file, None if there's no file."
+        if cls.data_directory is None:
+            return None
+        try:
+            st = os.stat(cls.parser_exceptions_file())
+        except FileNotFoundError:
+            return None
+        return (cls.parser_exceptions_file(), st.st_mtime_ns, st.st_size)
+
+    @classmethod
+    def _get_parser_exceptions_map(cls):
+        "The exceptions map, only re-read if the file changes."
+        key = cls._parser_exceptions_file_key()
+        if key is None:
+            return {}
+        cached_key, cached_map = cls._exceptions_cache
+        if cached_key != key:
+            cached_map = cls._build_parser_exceptions_map()
+            cls._exceptions_cache = (key, cached_map)
+        return cached_map
+
+    def cache_key(self, language):
+        "Parse results also depend on the exceptions file."
+        return (super().cache_key(language), self._parser_exceptions_file_key())
 
     def get_parsed_tokens(self, text: str, language) -> List[ParsedToken]:
         """
         Returns ParsedToken array for given language.
         """
 
-        exceptions_map = self._build_parser_exceptions_map()
+        exceptions_map = self._get_parser_exceptions_map()
 
         # Ensure standard carriage returns so that paragraph
         # markers are used correctly.  Lute uses paragraph markers
@@ -121,8 +159,7 @@ class MandarinParser(AbstractParser):
             if word == "¶":
                 is_word_char = False
                 is_end_of_sentence = True
-            parts = self._reparse_with_exceptions_map(word, exceptions_map)
-            for p in parts:
+            for p in exceptions_map.get(word, (word,)):
                 t = ParsedToken(p, is_word_char, is_end_of_sentence)
                 tokens.append(t)
         return tokens
@@ -142,3 +179,13 @@ class MandarinParser(AbstractParser):
         if ret in ("", text):
             return None
         return ret
+
+    def get_readings(self, texts: List[str]):
+        """
+        Get the pinyin for many texts.
+
+        pypinyin has no call that keeps separate strings apart, so
+        each distinct text is only converted once.
+        """
+        readings = {t: self.get_reading(t) for t in set(texts)}
+        return [readings[t] for t in texts]
@@ -151,3 +151,45 @@ def test_term_found_in_exceptions_file_is_split(mandarin_chinese, _datadir):
 
     set_parse_exceptions(["清华, 大学", " 大 ,  学 "])
     assert ["清华", "大", "学"] == parsed_tokens(), "Spaces are ignored"
+
+
+def test_exceptions_file_only_reread_if_changed(
+    mandarin_chinese, _datadir, monkeypatch
+):
+    "The exceptions are cached until the file changes."
+    reads = []
+    # pylint: disable=protected-access
+    build_map = MandarinParser._build_parser_exceptions_map.__func__
+
+    def _counting_build(cls):
+        reads.append(1)
+        return build_map(cls)
+
+    monkeypatch.setattr(
+        MandarinParser, "_build_parser_exceptions_map", classmethod(_counting_build)
+    )
+
+    def parsed_tokens():
+        p = MandarinParser()
+        return [t.token for t in p.get_parsed_tokens("清华大学", mandarin_chinese)]
+
+    with open(MandarinParser.parser_exceptions_file(), "w", encoding="utf8") as ef:
+        ef.write("清华,大学")
+    assert ["清华", "大学"] == parsed_tokens()
+    assert ["清华", "大学"] == parsed_tokens()
+    assert len(reads) == 1, "cached"
+
+    with open(MandarinParser.parser_exceptions_file(), "w", encoding="utf8") as ef:
+        ef.write("清华,大学\n大,学")
+    assert ["清华", "大", "学"] == parsed_tokens()
+    assert len(reads) == 2, "re-read after change"
+
+
+def test_cache_key_changes_if_exceptions_file_changes(mandarin_chinese, _datadir):
+    "Cached parse results are stale if the exceptions file is edited."
+    p = MandarinParser()
+    key = p.cache_key(mandarin_chinese)
+    assert p.cache_key(mandarin_chinese) == key, "unchanged"
+    with open(MandarinParser.parser_exceptions_file(), "a", encoding="utf8") as ef:
+        ef.write("清华,大学\n")
+    assert p.cache_key(mandarin_chinese) != key, "changed"
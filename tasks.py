@@ -283,6 +283,17 @@ def playwright(c):
     _run_browser_tests(5001, run_test)
 
 
+@task(pre=[_ensure_test_db], help={"kflag": "optional -k flag argument"})
+def bench(c, kflag=None):
+    """
+    Run the micro-benchmarks in tests/benchmark, printing timings.
+    """
+    cmd = "pytest tests/benchmark -s"
+    if kflag:
+        cmd += f' -k "{kflag}"'
+    c.run(cmd)
+
+
 @task(pre=[_ensure_test_db], help={"html": "open html report"})
 def coverage(c, html=False):
     """
@@ -328,6 +339,7 @@ ns.add_task(full)
 ns.add_task(lint)
 ns.add_task(lint_changed)
 ns.add_task(test)
+ns.add_task(bench)
 ns.add_task(accept)
 ns.add_task(acceptmobile)
 ns.add_task(playwright)
@@ -0,0 +1,102 @@
+"""
+Book import benchmarks: peak memory of splitting a large book into pages,
+and of importing it.
+"""
+
+import gc
+import random
+import tracemalloc
+
+from lute.book.model import Book, Repository, token_group_generator
+from lute.db import db
+from tests.benchmark.timing import best_time
+
+
+def _legacy_split_pages(book, language):
+    "The original split: parse each segment all at once."
+    pages = []
+    for segment in book.text.split("\n---\n"):
+        tokens = language.parser.get_parsed_tokens(segment.strip(), language)
+        for toks in token_group_generator(
+            tokens, book.split_by, book.threshold_page_tokens
+        ):
+            s = "".join([t.token for t in toks])
+            s = s.replace("\r", "").replace("¶", "\n")
+            pages.append(s.strip())
+    return [p for p in pages if p.strip() != ""]
+
+
+def _peak_mb(func):
+    "Peak memory allocated while running func."
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def _book(english, size):
+    "Book of random paragraphs."
+    rnd = random.Random(42)
+    words = "the cat sat on a mat and Mr. Smith said it was fine".split()
+    paras = []
+    length = 0
+    while length < size:
+        p = ". ".join(
+            " ".join(rnd.choice(words) for _ in range(rnd.randint(4, 20)))
+            for _ in range(rnd.randint(1, 6))
+        )
+        paras.append(p + ".")
+        length += len(p) + 2
+    b = Book()
+    b.title = "Bench"
+    b.language_id = english.id
+    b.text = "\n".join(paras)
+    b.threshold_page_tokens = 250
+    b.split_by = "paragraphs"
+    return b
+
+
+def test_split_large_book(app_context, english):
+    "Peak memory and time, whole-segment vs incremental parsing."
+    repo = Repository(db.session)
+    print("\nsplit book into pages")
+    for mb in [1, 5]:
+        b = _book(english, mb * 1024 * 1024)
+        # pylint: disable=protected-access
+        assert list(repo._split_pages(b, english)) == _legacy_split_pages(b, english)
+        for label, func in [
+            ("whole segment", lambda b=b: _legacy_split_pages(b, english)),
+            ("incremental", lambda b=b: list(repo._split_pages(b, english))),
+        ]:
+            peak = _peak_mb(func)
+            secs = best_time(func, repeat=1)
+            print(f"  {mb}MB {label:<16} {secs * 1000:10.0f} ms  peak {peak:7.1f} MB")
+
+
+def test_import_large_book(app_context, english):
+    "Peak memory and time of adding and committing a whole book."
+    repo = Repository(db.session)
+
+    def _import(b):
+        repo.add(b)
+        repo.commit()
+
+    def _delete_books():
+        db.session.execute(db.text("delete from books"))
+        db.session.commit()
+
+    # Warm up, so one-time allocations (e.g. parser caches) aren't counted.
+    _import(_book(english, 256 * 1024))
+    _delete_books()
+
+    print("\nimport book")
+    for mb in [1, 5]:
+        b = _book(english, mb * 1024 * 1024)
+        peak = _peak_mb(lambda b=b: _import(b))
+        pages = db.session.execute(db.text("select count(*) from texts")).scalar()
+        _delete_books()
+        secs = best_time(lambda b=b: _import(b), repeat=1, setup=_delete_books)
+        _delete_books()
+        print(f"  {mb}MB {secs * 1000:10.0f} ms  peak {peak:7.1f} MB  {pages} pages")
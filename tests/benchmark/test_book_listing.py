@@ -0,0 +1,161 @@
+"""
+Book listing benchmark: booksummary vs aggregating all texts.
+"""
+
+from lute.book.datatables import get_data_tables_list
+from lute.db import db
+from lute.utils.data_tables import DataTablesSqliteQuery
+from tests.benchmark.timing import best_time, report
+
+# The listing query before booksummary, for comparison.
+_AGGREGATE_SQL = """
+    SELECT
+        b.BkID As BkID, LgName, BkTitle,
+        case when currtext.TxID is null then 1 else currtext.TxOrder end as PageNum,
+        textcounts.pagecount AS PageCount,
+        booklastopened.lastopeneddate AS LastOpenedDate,
+        BkArchived,
+        tags.taglist AS TagList,
+        textcounts.wc AS WordCount,
+        c.distinctterms as DistinctCount,
+        c.distinctunknowns as UnknownCount,
+        c.unknownpercent as UnknownPercent,
+        c.status_distribution as StatusDistribution,
+        case when completed_books.BkID is null then 0 else 1 end as IsCompleted
+    FROM books b
+    INNER JOIN languages ON LgID = b.BkLgID
+    LEFT OUTER JOIN texts currtext ON currtext.TxID = BkCurrentTxID
+    INNER JOIN (
+        select TxBkID, max(TxStartDate) as lastopeneddate from texts group by TxBkID
+    ) booklastopened on booklastopened.TxBkID = b.BkID
+    INNER JOIN (
+        SELECT TxBkID, SUM(TxWordCount) as wc, COUNT(TxID) AS pagecount
+        FROM texts GROUP BY TxBkID
+    ) textcounts on textcounts.TxBkID = b.BkID
+    LEFT OUTER JOIN bookstats c on c.BkID = b.BkID
+    LEFT OUTER JOIN (
+        SELECT BtBkID as BkID, GROUP_CONCAT(T2Text, ', ') AS taglist
+        FROM (
+            SELECT BtBkID, T2Text FROM booktags bt
+            INNER JOIN tags2 t2 ON t2.T2ID = bt.BtT2ID ORDER BY T2Text
+        ) tagssrc
+        GROUP BY BtBkID
+    ) AS tags ON tags.BkID = b.BkID
+    left outer join (
+      select texts.TxBkID as BkID
+      from texts
+      inner join (
+        select TxBkID, max(TxOrder) as maxTxOrder from texts group by TxBkID
+      ) last_page on last_page.TxBkID = texts.TxBkID
+        and last_page.maxTxOrder = texts.TxOrder
+      where TxReadDate is not null
+    ) completed_books on completed_books.BkID = b.BkID
+    WHERE b.BkArchived = false
+"""
+
+
+def _add_books(language, books, pages):
+    "Add books with pages and tags, with raw sql for speed."
+    conn = db.session.connection()
+    conn.exec_driver_sql(
+        "insert into books (BkID, BkLgID, BkTitle) values (?, ?, ?)",
+        [(i, language.id, f"Book {i}") for i in range(1, books + 1)],
+    )
+    conn.exec_driver_sql(
+        """insert into texts (TxBkID, TxOrder, TxText, TxWordCount, TxStartDate,
+        TxReadDate) values (?, ?, 'Hola.', 100, ?, ?)""",
+        [
+            (b, p, "2025-01-01", "2025-01-02" if p < pages // 2 else None)
+            for b in range(1, books + 1)
+            for p in range(1, pages + 1)
+        ],
+    )
+    conn.exec_driver_sql("insert into tags2 (T2ID, T2Text) values (1, 'a'), (2, 'b')")
+    conn.exec_driver_sql(
+        "insert into booktags (BtBkID, BtT2ID) select BkID, 1 + BkID % 2 from books"
+    )
+    db.session.commit()
+
+
+def test_book_listing(app_context, spanish):
+    "Time to get the first page of the book listing."
+    _add_books(spanish, 2000, 50)
+    columns = [
+        {"name": n, "searchable": n == "BkTitle", "orderable": n == "BkTitle"}
+        for n in ["BkID", "BkTitle", "PageCount", "WordCount", "TagList"]
+    ]
+    params = {
+        "draw": "1",
+        "columns": columns,
+        "order": [{"column": "1", "dir": "asc"}],
+        "start": "0",
+        "length": "25",
+        "search": {"value": "", "regex": False},
+        "filtLanguage": "0",
+    }
+
+    def _aggregate():
+        conn = db.session.connection()
+        return DataTablesSqliteQuery.get_data(_AGGREGATE_SQL, params, conn)
+
+    def _summary():
+        return get_data_tables_list(params, False, db.session)
+
+    def _one_book_changed():
+        db.session.execute(
+            db.text("update texts set TxStartDate = '2025-02-01' where TxID = 10")
+        )
+        db.session.commit()
+
+    assert _summary() == _aggregate()
+    aggregate = best_time(_aggregate)
+    summary = best_time(_summary)
+    report(
+        "book listing, 2000 books, 100k pages",
+        [("aggregate texts", aggregate), ("booksummary", summary)],
+    )
+
+
+def test_booksummary_trigger_cost(app_context, spanish):
+    "Time to add, open and delete 1000 pages, with and without triggers."
+    _add_books(spanish, 1, 1)
+    conn = db.session.connection()
+
+    def _add_pages():
+        conn.exec_driver_sql(
+            """insert into texts (TxBkID, TxOrder, TxText, TxWordCount,
+            TxStartDate) values (1, ?, 'Hola.', 100, ?)""",
+            [(p, "2025-01-01" if p < 100 else None) for p in range(2, 1002)],
+        )
+
+    def _delete_pages():
+        conn.exec_driver_sql("delete from texts where TxOrder > 1")
+
+    def _open_page():
+        conn.exec_driver_sql(
+            "update texts set TxStartDate = '2025-02-01' where TxOrder = 500"
+        )
+
+    def _times():
+        ret = [
+            best_time(_add_pages, setup=_delete_pages),
+            best_time(_open_page),
+            best_time(_delete_pages, setup=_add_pages),
+        ]
+        _delete_pages()
+        return ret
+
+    with_triggers = _times()
+    triggers = conn.exec_driver_sql(
+        "select name from sqlite_master where type = 'trigger' "
+        + "and tbl_name = 'texts' and name like '%booksummary'"
+    ).all()
+    for (name,) in triggers:
+        conn.exec_driver_sql(f"drop trigger {name}")
+    without_triggers = _times()
+    db.session.rollback()
+
+    for i, name in enumerate(["add 1000 pages", "open page", "delete 1000 pages"]):
+        report(
+            name, [("no triggers", without_triggers[i]), ("triggers", with_triggers[i])]
+        )
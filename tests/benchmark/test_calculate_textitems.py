@@ -0,0 +1,150 @@
+"""
+get_textitems benchmark: 5k-token pages with dense multiword overlaps.
+"""
+
+import random
+import tracemalloc
+
+from lute.models.term import Term
+from lute.parse.base import ParsedToken
+from lute.read.render.calculate_textitems import get_textitems, get_string_indexes
+from lute.read.render.multiword_indexer import MultiwordTermIndexer
+from tests.unit.read.render.legacy_calculate_textitems import (
+    legacy_get_textitems,
+    legacy_get_string_indexes,
+)
+from tests.benchmark.timing import best_time, report
+
+
+def _page_and_terms(language, token_count):
+    "Page of token_count tokens, with long overlapping terms."
+    rnd = random.Random(42)
+    vocab = ["a", "b", "c"]
+    tokens = []
+    while len(tokens) < token_count:
+        tokens.append(ParsedToken(rnd.choice(vocab), True))
+        tokens.append(ParsedToken(" ", False))
+
+    # All single words exist, so no new terms are created during the run.
+    terms = [Term(language, w) for w in vocab]
+    mwords = set()
+    for _ in range(200):
+        start = rnd.randrange(0, len(tokens) // 2) * 2
+        n = rnd.randint(2, 12)
+        mwords.add(" ".join(t.token for t in tokens[start : start + 2 * n : 2]))
+    terms += [Term(language, t) for t in mwords]
+    return tokens, terms
+
+
+class _PrecomputedMatches:
+    "Indexer returning already-found matches, to time overlap resolution only."
+
+    def __init__(self, mw, tokens_lc):
+        self.matches = list(mw.search_all(tokens_lc))
+
+    def search_all(self, lc_tokens):  # pylint: disable=unused-argument
+        return self.matches
+
+
+def test_get_textitems_5k_tokens(english):
+    "Legacy vs current, with and without an indexer."
+    tokens, terms = _page_and_terms(english, 5000)
+    mw = MultiwordTermIndexer()
+    for t in terms:
+        if t.token_count > 1:
+            mw.add(t.text_lc)
+    mw.finalize()
+
+    results = [
+        ("legacy", best_time(lambda: legacy_get_textitems(tokens, terms, english))),
+        ("current", best_time(lambda: get_textitems(tokens, terms, english))),
+        (
+            "legacy, indexer",
+            best_time(lambda: legacy_get_textitems(tokens, terms, english, mw)),
+        ),
+        (
+            "current, indexer",
+            best_time(lambda: get_textitems(tokens, terms, english, mw)),
+        ),
+    ]
+    report(f"get_textitems, {len(tokens)} tokens, {len(terms)} terms", results)
+
+    pre = _PrecomputedMatches(mw, [t.token.lower() for t in tokens])
+    results = [
+        (
+            "legacy",
+            best_time(lambda: legacy_get_textitems(tokens, terms, english, pre)),
+        ),
+        ("current", best_time(lambda: get_textitems(tokens, terms, english, pre))),
+    ]
+    report(f"overlap resolution only, {len(pre.matches)} matches", results)
+
+
+def test_multiword_matching_5k_tokens(english):
+    "Regex-per-term vs single-pass token matching."
+    tokens, terms = _page_and_terms(english, 5000)
+    zws = "\u200B"
+    content = zws.join([t.token.lower() for t in tokens])
+    strings = [t.text_lc for t in terms if t.token_count > 1]
+
+    results = [
+        (
+            "regex per term",
+            best_time(lambda: legacy_get_string_indexes(strings, content)),
+        ),
+        ("single pass", best_time(lambda: get_string_indexes(strings, content))),
+    ]
+    report(f"matching {len(strings)} terms in {len(tokens)} tokens", results)
+
+
+class _StringTokenIndexer(MultiwordTermIndexer):
+    "Indexer matching on token strings rather than interned ids."
+
+    def add(self, t):
+        key = tuple(t.split(self.zws))
+        self.terms[key] = t
+        self.kwtree.add(key)
+
+    def token_ids(self, lc_tokens):
+        return lc_tokens
+
+
+def test_multiword_indexer_large_vocabulary():
+    "20k terms over a 5k word vocabulary, page mostly of other words."
+    rnd = random.Random(42)
+    zws = "\u200B"
+    term_vocab = [f"w{i}" for i in range(5000)]
+    page_vocab = term_vocab + [f"x{i}" for i in range(20000)]
+    terms = {
+        zws.join(rnd.choice(term_vocab) for _ in range(rnd.randint(2, 5)))
+        for _ in range(20000)
+    }
+    tokens = [rnd.choice(page_vocab) for _ in range(4000)]
+    for t in rnd.sample(sorted(terms), 300):
+        pos = rnd.randrange(0, len(tokens))
+        tokens[pos:pos] = t.split(zws)
+
+    def _build(cls):
+        mw = cls()
+        for t in terms:
+            mw.add(t)
+        mw.finalize()
+        return mw
+
+    def _peak_kb(cls):
+        tracemalloc.start()
+        mw = _build(cls)  # pylint: disable=unused-variable
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak // 1024
+
+    strs = _build(_StringTokenIndexer)
+    ids = _build(MultiwordTermIndexer)
+    assert list(strs.search_all(tokens)) == list(ids.search_all(tokens))
+    results = [
+        ("string tokens", best_time(lambda: list(strs.search_all(tokens)))),
+        ("token ids", best_time(lambda: list(ids.search_all(tokens)))),
+    ]
+    report(f"search, {len(terms)} terms, {len(tokens)} tokens", results)
+    print(f"  build peak KB: strings {_peak_kb(_StringTokenIndexer)}", end="")
+    print(f", ids {_peak_kb(MultiwordTermIndexer)}")
@@ -0,0 +1,76 @@
+"""
+Datatables paging benchmark: paging deep into the term listing.
+"""
+
+from sqlalchemy import text
+
+from lute.db import db
+from lute.term.datatables import get_data_tables_list
+from lute.utils.data_tables import DataTablesSqliteQuery
+from tests.benchmark.test_term_search import _add_words
+from tests.benchmark.timing import best_time, report
+
+
+def _params(start):
+    "Term listing params, sorted by text."
+    names = ["WoID", "WoText", "ParentText", "WoTranslation", "StID"]
+    columns = [
+        {"name": n, "searchable": n == "WoText", "orderable": n != "WoID"}
+        for n in names
+    ]
+    return {
+        "draw": "1",
+        "columns": columns,
+        "order": [{"column": "1", "dir": "asc"}],
+        "start": str(start),
+        "length": "25",
+        "search": {"value": "", "regex": False},
+        "filtLanguage": "null",
+        "filtParentsOnly": "false",
+        "filtAgeMin": "",
+        "filtAgeMax": "",
+        "filtStatusMin": "0",
+        "filtStatusMax": "99",
+        "filtIncludeIgnored": "false",
+        "filtTermIDs": "",
+    }
+
+
+def test_page_through_term_listing(app_context, spanish, monkeypatch):
+    "Time to get 10 consecutive pages deep in the listing."
+    count = len(_add_words(spanish, 200000))
+    first = count // 2
+    pages = [first + 25 * i for i in range(10)]
+
+    # Before: counts and the OFFSET query for every page.
+    def _old_get_data(base_sql, parameters, conn, key_column=None):
+        # pylint: disable=unused-argument
+        sql_dict = DataTablesSqliteQuery.get_sql(base_sql, parameters)
+        prms = sql_dict["params"]
+        res = conn.execute(text(sql_dict["data"]), prms)
+        return {
+            "recordsTotal": conn.execute(text(sql_dict["recordsTotal"])).scalar(),
+            "recordsFiltered": conn.execute(
+                text(sql_dict["recordsFiltered"]), prms
+            ).scalar(),
+            "data": [dict(zip(res.keys(), r)) for r in res.fetchall()],
+        }
+
+    def _page_through():
+        return [get_data_tables_list(_params(s), db.session) for s in pages]
+
+    def _ids(results):
+        return [[r["WoID"] for r in d["data"]] for d in results]
+
+    new_results = _page_through()
+    new = best_time(_page_through)
+    get_data = DataTablesSqliteQuery.get_data
+    monkeypatch.setattr(DataTablesSqliteQuery, "get_data", _old_get_data)
+    assert _ids(_page_through()) == _ids(new_results)
+    old = best_time(_page_through)
+    monkeypatch.setattr(DataTablesSqliteQuery, "get_data", get_data)
+
+    report(
+        f"10 term listing pages from row {first} of {count}",
+        [("counts + OFFSET each page", old), ("cached counts + keyset", new)],
+    )
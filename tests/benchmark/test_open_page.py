@@ -0,0 +1,59 @@
+"""
+Page open benchmark: first open of a page of never-seen words.
+"""
+
+import random
+from sqlalchemy import text as sqltext
+
+from lute.db import db
+from lute.read.render.page_cache import rendered_page_cache
+from lute.read.service import Service
+from tests.benchmark.timing import best_time, report
+from tests.utils import make_book
+
+
+def _orm_save_new_status_0_terms(self, paragraphs):
+    "The original save: add each new Term to the session, and commit."
+    tis_with_new_terms = [
+        ti
+        for para in paragraphs
+        for sentence in para
+        for ti in sentence
+        if ti.is_word and ti.term.id is None and ti.term.status == 0
+    ]
+    for ti in tis_with_new_terms:
+        self.session.add(ti.term)
+    self.session.commit()
+
+
+def test_open_page_500_new_words(app_context, english, monkeypatch):
+    "ORM unit-of-work vs bulk insert of the page's new terms."
+    rnd = random.Random(42)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < 500:
+        words.add("".join(rnd.choice(letters) for _ in range(rnd.randint(4, 10))))
+    content = ". ".join(" ".join(list(words)[i : i + 10]) for i in range(0, 500, 10))
+    b = make_book("Bench", content, english)
+    db.session.add(b)
+    db.session.commit()
+    svc = Service(db.session)
+
+    def _reset():
+        "Forget all terms, so the page's words are new again."
+        db.session.execute(sqltext("delete from words"))
+        db.session.commit()
+        rendered_page_cache.clear()
+
+    def _open():
+        svc.start_reading(b, 1)
+
+    bulk = best_time(_open, setup=_reset)
+    monkeypatch.setattr(
+        Service, "_save_new_status_0_terms", _orm_save_new_status_0_terms
+    )
+    orm = best_time(_open, setup=_reset)
+    count = db.session.execute(sqltext("select count(*) from words")).first()[0]
+    assert count == 500, "all words saved"
+
+    report("open page, 500 new words", [("orm add", orm), ("bulk insert", bulk)])
@@ -0,0 +1,65 @@
+"""
+Page open benchmark for Japanese: new terms need MeCab readings.
+"""
+
+from contextlib import contextmanager
+import pytest
+from natto import MeCab
+from sqlalchemy import text as sqltext
+
+from lute.db import db
+from lute.parse import mecab_parser
+from lute.parse.mecab_parser import JapaneseParser
+from lute.read.render.page_cache import rendered_page_cache
+from lute.read.service import Service
+from lute.settings.current import current_settings
+from tests.benchmark.timing import best_time, report
+from tests.utils import make_book
+
+
+@contextmanager
+def _unpooled_tagger(flags):
+    "The original behaviour: load MeCab for every call."
+    with MeCab(flags) as nm:
+        yield nm
+
+
+def test_open_japanese_page(app_context, japanese, monkeypatch):
+    "New MeCab per call vs pooled taggers."
+    if not JapaneseParser.is_supported():
+        pytest.skip("MeCab not available")
+    current_settings["japanese_reading"] = "hiragana"
+
+    content = "元気です。" + "。".join(
+        [
+            "私は東京の大学で日本語と経済学を勉強しています",
+            "昨日は友達と一緒に新しい映画を見に行きました",
+            "天気予報によると明日は全国的に雨が降るそうです",
+            "駅前の図書館で歴史の本を三冊借りて読みました",
+            "毎朝六時に起きて近所の公園を散歩しています",
+        ]
+        * 4
+    )
+    b = make_book("Bench", content, japanese)
+    db.session.add(b)
+    db.session.commit()
+    svc = Service(db.session)
+
+    def _reset():
+        "Forget all terms, so the page's words are new again."
+        db.session.execute(sqltext("delete from words"))
+        db.session.commit()
+        rendered_page_cache.clear()
+
+    def _open():
+        svc.start_reading(b, 1)
+
+    pooled = best_time(_open, setup=_reset)
+    monkeypatch.setattr(mecab_parser.mecab_pool, "tagger", _unpooled_tagger)
+    unpooled = best_time(_open, setup=_reset)
+    count = db.session.execute(sqltext("select count(*) from words")).first()[0]
+
+    report(
+        f"open japanese page, {count} new words",
+        [("mecab per call", unpooled), ("pooled mecab", pooled)],
+    )
@@ -0,0 +1,35 @@
+"""
+ClassicalChineseParser benchmark: throughput on a large text.
+"""
+
+import random
+
+from tests.benchmark.timing import best_time, report
+from tests.unit.parse.test_ClassicalChineseParser import _legacy_parsed_tokens
+
+
+def test_parse_large_classical_text(classical_chinese):
+    "Characters per second, per-character regex vs character table."
+    rnd = random.Random(42)
+    chars = "學而時習之不亦說乎有朋自遠方來樂人知慍君子"
+    lines = [
+        "".join(rnd.choice(chars) for _ in range(rnd.randint(4, 12)))
+        + rnd.choice("，。？")
+        for _ in range(80000)
+    ]
+    text = "\n".join(lines)
+    parser = classical_chinese.parser
+
+    results = [
+        (
+            "per-character regex",
+            best_time(lambda: _legacy_parsed_tokens(text, classical_chinese), 3),
+        ),
+        (
+            "character table",
+            best_time(lambda: parser.get_parsed_tokens(text, classical_chinese), 3),
+        ),
+    ]
+    report(f"parse {len(text)} characters", results)
+    for label, secs in results:
+        print(f"  {label:<30} {len(text) / secs / 1e6:10.2f} M chars/sec")
@@ -0,0 +1,50 @@
+"""
+ParseExecutor benchmark: parsing many pages with more worker processes.
+
+Scaling depends on the number of cores; with a single core the pool
+only adds overhead.
+"""
+
+import os
+import random
+
+from lute.parse.executor import ParseExecutor
+from tests.benchmark.timing import best_time, report
+
+
+def _pages(count):
+    "Pages of random sentences."
+    rnd = random.Random(42)
+    words = "the cat sat on a mat and Mr. Smith said it was fine".split()
+    return [
+        "\n".join(
+            ". ".join(
+                " ".join(rnd.choice(words) for _ in range(rnd.randint(4, 20)))
+                for _ in range(rnd.randint(1, 6))
+            )
+            + "."
+            for _ in range(20)
+        )
+        for _ in range(count)
+    ]
+
+
+def test_parse_many_pages(app_context, english):
+    "Time to parse pages, by worker count."
+    pages = _pages(400)
+    cores = os.cpu_count() or 1
+    counts = sorted({0, 2, 4, cores})
+    results = []
+    for n in counts:
+        pe = ParseExecutor()
+        pe.workers = n
+        try:
+            # Start the workers before timing.
+            pe.get_parsed_tokens_many(english, pages[: n * 2])
+            secs = best_time(
+                lambda pe=pe: pe.get_parsed_tokens_many(english, pages), repeat=3
+            )
+        finally:
+            pe.shutdown()
+        results.append((f"{n} workers ({cores} cores)", secs))
+    report(f"parse {len(pages)} pages", results)
@@ -0,0 +1,129 @@
+"""
+Mandarin parse benchmark: cached exceptions map vs re-reading the
+exceptions file for every parse.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import pytest
+import yaml
+
+from lute.models.language import Language
+from lute.parse.base import ParsedToken
+from tests.benchmark.timing import best_time, report
+
+parser_module = pytest.importorskip("lute_mandarin_parser.parser")
+jieba = pytest.importorskip("jieba")
+MandarinParser = parser_module.MandarinParser
+
+
+class LegacyMandarinParser(MandarinParser):
+    "The original: read the file, and split recursively, for every parse."
+
+    @classmethod
+    def _legacy_exceptions_map(cls):
+        ret = {}
+        with open(cls.parser_exceptions_file(), "r", encoding="utf8") as f:
+            for line in f:
+                stripped_line = line.strip()
+                if stripped_line.startswith("#"):
+                    continue
+                parts = [p.strip() for p in stripped_line.split(",")]
+                orig_token = "".join(parts)
+                ret[orig_token] = parts
+        return ret
+
+    def _reparse_with_exceptions_map(self, original_token, exceptions_map):
+        "Check the token s against the map, break down further if needed."
+
+        # pylint: disable=dangerous-default-value
+        def _get_mapped(tok, accum=[]):
+            parts = exceptions_map.get(tok)
+            if parts is None or len(parts) == 1:
+                accum.append(tok)
+            else:
+                for p in parts:
+                    _get_mapped(p, accum)
+            return accum
+
+        return _get_mapped(original_token)
+
+    def get_parsed_tokens(self, text, language):
+        "Original get_parsed_tokens."
+        exceptions_map = self._legacy_exceptions_map()
+        text = text.replace("\r\n", "\n")
+        words = list(jieba.cut(text))
+        tokens = []
+        pattern = f"[{language.word_characters}]"
+        for word in words:
+            is_word_char = re.match(pattern, word) is not None
+            is_end_of_sentence = word in language.regexp_split_sentences
+            if word == "\n":
+                word = "¶"
+            if word == "¶":
+                is_word_char = False
+                is_end_of_sentence = True
+            parts = self._reparse_with_exceptions_map(word, exceptions_map)
+            for p in parts:
+                tokens.append(ParsedToken(p, is_word_char, is_end_of_sentence))
+        return tokens
+
+
+def _mandarin():
+    "Language from the plugin's definition."
+    definition = os.path.join(
+        os.path.dirname(parser_module.__file__), "..", "definition.yaml"
+    )
+    with open(definition, "r", encoding="utf-8") as df:
+        return Language.from_dict(yaml.safe_load(df))
+
+
+def _cold_start_ms():
+    "Time to load jieba's dictionary in a new process."
+    code = (
+        "import time, jieba, logging; jieba.setLogLevel(logging.WARNING); "
+        "t = time.perf_counter(); jieba.initialize(); "
+        "print((time.perf_counter() - t) * 1000)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip())
+
+
+def test_parse_mandarin_page():
+    "Parse a 10k character page."
+    lang = _mandarin()
+    para = "我冒了严寒，回到相隔二千馀里，别了二十馀年的故乡去。清华大学的学生在图书馆里学习中文。"
+    page = "\n".join([para] * (10000 // len(para) + 1))[:10000]
+
+    old_dir = MandarinParser.data_directory
+    with tempfile.TemporaryDirectory() as temp_dir:
+        MandarinParser.data_directory = temp_dir
+        with open(MandarinParser.parser_exceptions_file(), "w", encoding="utf8") as ef:
+            rules = ["清华,大学", "大,学", "二十,馀年", "图书,馆"]
+            rules += [f"词{i},语{i}" for i in range(200)]
+            ef.write("\n".join(rules))
+        try:
+            new, old = MandarinParser(), LegacyMandarinParser()
+            expected = [t.token for t in old.get_parsed_tokens(page, lang)]
+            assert [t.token for t in new.get_parsed_tokens(page, lang)] == expected
+            report(
+                "parse 10k character mandarin page",
+                [
+                    (
+                        "re-read exceptions",
+                        best_time(lambda: old.get_parsed_tokens(page, lang)),
+                    ),
+                    (
+                        "cached exceptions",
+                        best_time(lambda: new.get_parsed_tokens(page, lang)),
+                    ),
+                ],
+            )
+        finally:
+            MandarinParser.data_directory = old_dir
+    print(f"  jieba dictionary load (warmed at startup): {_cold_start_ms():.0f} ms")
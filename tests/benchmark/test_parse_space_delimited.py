@@ -0,0 +1,58 @@
+"""
+SpaceDelimitedParser benchmark: tokens/sec on a 1MB corpus.
+"""
+
+import random
+
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+from tests.benchmark.timing import best_time
+from tests.unit.parse.legacy_space_delimited_parser import (
+    LegacySpaceDelimitedParser,
+)
+
+
+def _corpus(size):
+    "Random English and Spanish sentences, size characters long."
+    rnd = random.Random(42)
+    words = (
+        "the cat sat on a mat and Mr. Smith said it's fine "
+        "el niño tenía un año cuando la Sra. García llegó ¿qué pasa? "
+        "Dr. López vs. Jones p.m. a.m. don´t wouldn’t EE.UU. corazón"
+    ).split()
+    paras = []
+    length = 0
+    while length < size:
+        sentences = []
+        for _ in range(rnd.randint(1, 6)):
+            n = rnd.randint(4, 20)
+            s = " ".join(rnd.choice(words) for _ in range(n))
+            sentences.append(s.capitalize() + rnd.choice([".", "!", "?", "..."]))
+        p = "  ".join(sentences)
+        paras.append(p)
+        length += len(p) + 1
+    return "\n".join(paras)[:size]
+
+
+def _report(name, results):
+    "Print timings and tokens/sec."
+    print(f"\n{name}", flush=True)
+    for label, secs, count in results:
+        rate = count / secs / 1000
+        print(f"  {label:<20} {secs * 1000:10.2f} ms  {rate:8.0f}K tokens/sec")
+
+
+def test_parse_1mb(english, spanish):
+    "Original vs compiled tokenizer."
+    corpus = _corpus(1024 * 1024)
+    results = []
+    for lang in [english, spanish]:
+        for label, parser in [
+            ("legacy", LegacySpaceDelimitedParser()),
+            ("compiled", SpaceDelimitedParser()),
+        ]:
+            count = len(parser.get_parsed_tokens(corpus, lang))
+            secs = best_time(
+                lambda p=parser, lg=lang: p.get_parsed_tokens(corpus, lg), repeat=3
+            )
+            results.append((f"{lang.name} {label}", secs, count))
+    _report("parse 1MB corpus", results)
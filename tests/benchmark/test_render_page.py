@@ -0,0 +1,71 @@
+"""
+Page render benchmark: TextItem creation, memory, and template rendering.
+"""
+
+import gc
+import random
+import tracemalloc
+
+from lute.db import db
+from lute.models.term import Term
+from lute.read.render.service import Service as RenderService
+from tests.benchmark.timing import best_time, report
+
+
+def _page_and_terms(english, word_count):
+    "Page of random words, with saved single and multiword terms."
+    rnd = random.Random(42)
+    vocab = [f"w{i}" for i in range(300)]
+    words = []
+    for i in range(word_count):
+        words.append(rnd.choice(vocab))
+        if i % 12 == 11:
+            words[-1] += "."
+        if i % 100 == 99:
+            words[-1] += "\n"
+    content = " ".join(words)
+
+    for w in vocab[:200]:
+        t = Term(english, w)
+        t.status = rnd.randint(1, 5)
+        db.session.add(t)
+    mwords = set()
+    for _ in range(200):
+        start = rnd.randrange(0, word_count - 3)
+        mwords.add(" ".join(words[start : start + rnd.randint(2, 3)]).strip("\n."))
+    for m in mwords:
+        if "." not in m and "\n" not in m:
+            db.session.add(Term(english, m))
+    db.session.commit()
+    return content
+
+
+def _retained_kb(func):
+    "Memory still allocated by func's result."
+    gc.collect()
+    tracemalloc.start()
+    result = func()  # pylint: disable=unused-variable
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size // 1024
+
+
+def test_render_page_5k_tokens(app, app_context, english):
+    "Parse, calculate TextItems, and render the page template."
+    content = _page_and_terms(english, 2500)
+    rs = RenderService(db.session)
+    template = app.jinja_env.get_template("read/page_content.html")
+    paras = rs.get_paragraphs(content, english)
+    token_count = len(english.get_parsed_tokens(content))
+
+    results = [
+        ("parse", best_time(lambda: english.get_parsed_tokens(content))),
+        ("get_paragraphs", best_time(lambda: rs.get_paragraphs(content, english))),
+        ("render template", best_time(lambda: template.render(paragraphs=paras))),
+    ]
+    report(f"render page, {token_count} tokens", results)
+
+    tokens_kb = _retained_kb(lambda: english.get_parsed_tokens(content))
+    paras_kb = _retained_kb(lambda: rs.get_paragraphs(content, english))
+    print(f"  retained KB: tokens {tokens_kb}, paragraphs {paras_kb}")
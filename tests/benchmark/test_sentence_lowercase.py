@@ -0,0 +1,53 @@
+"""
+Sentence lowercase benchmark: loading sentences.SeTextLC during data
+cleanup, with and without a sqlite connection per sentence.
+"""
+
+from datetime import datetime
+from sqlalchemy import text as sqltext
+
+from lute.db import db
+from lute.db.data_cleanup import clean_data
+import lute.models.book
+from tests.benchmark.timing import best_time, report
+from tests.utils import make_text
+
+
+def _legacy_sqlite_lower(s):
+    "The original: a new in-memory sqlite connection for every call."
+    # pylint: disable=protected-access
+    return lute.models.book._query_sqlite_lower(s)
+
+
+def test_load_sentence_textlc(app_context, spanish, monkeypatch):
+    "Time to load SeTextLC for all sentences."
+    sentence = "Tengo un GATO muy grande. Ábrelo ahora. "
+    for i in range(20):
+        t = make_text(f"t{i}", sentence * 250, spanish)
+        t.read_date = datetime.now()
+        db.session.add(t)
+    db.session.commit()
+    count = db.session.execute(sqltext("select count(*) from sentences")).scalar()
+
+    def _reset():
+        db.session.execute(sqltext("update sentences set SeTextLC = null"))
+        db.session.commit()
+        db.session.expire_all()
+
+    def _cleanup():
+        clean_data(db.session, lambda s: None)
+
+    new = best_time(_cleanup, repeat=3, setup=_reset)
+    expected = db.session.execute(
+        sqltext("select SeTextLC from sentences order by SeID")
+    ).all()
+    monkeypatch.setattr(lute.models.book, "sqlite_lower", _legacy_sqlite_lower)
+    old = best_time(_cleanup, repeat=3, setup=_reset)
+    actual = db.session.execute(
+        sqltext("select SeTextLC from sentences order by SeID")
+    ).all()
+    assert actual == expected
+    report(
+        f"load SeTextLC for {count} sentences",
+        [("sqlite connection per sentence", old), ("python LOWER", new)],
+    )
@@ -0,0 +1,90 @@
+"""
+Term references benchmark: sentence index vs scanning all sentences.
+"""
+
+from datetime import datetime
+import random
+
+from lute.db import db
+from lute.term.model import ReferencesRepository
+from tests.benchmark.timing import best_time, report
+from tests.utils import add_terms, make_text
+
+
+def _make_words(count):
+    "Random letters-only words (digits aren't word characters in Spanish)."
+    rnd = random.Random(1)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rnd.choice(letters) for _ in range(7)) for _ in range(count)]
+
+
+def _add_read_texts(spanish, words):
+    "Add 100 read texts of 200 random sentences; returns sentence count."
+    rnd = random.Random(42)
+    for i in range(100):
+        sentences = [
+            " ".join(rnd.choice(words) for _ in range(rnd.randint(5, 15))) + "."
+            for _ in range(200)
+        ]
+        t = make_text(f"t{i}", " ".join(sentences), spanish)
+        t.read_date = datetime.now()
+        db.session.add(t)
+    db.session.commit()
+    return db.session.execute(db.text("select count(*) from sentences")).scalar()
+
+
+def test_find_references(app_context, spanish, monkeypatch):
+    "Time to find references of a few terms."
+    words = _make_words(2000) + ["gato", "perro", "un", "tengo"]
+    count = _add_read_texts(spanish, words)
+
+    terms = add_terms(spanish, ["gato", words[7], "tengo un", f"{words[1]} {words[2]}"])
+    repo = ReferencesRepository(db.session)
+
+    def _find_all():
+        return [repo.find_references(t) for t in terms]
+
+    def _refs(found):
+        return [[r.sentence for r in f["term"]] for f in found]
+
+    indexed = best_time(_find_all)
+    expected = _refs(_find_all())
+    monkeypatch.setattr(
+        ReferencesRepository, "_sentence_index_filter", lambda self, lc, p: ""
+    )
+    scanned = best_time(_find_all)
+    assert _refs(_find_all()) == expected
+    report(
+        f"find references of {len(terms)} terms in {count} sentences",
+        [("scan all sentences", scanned), ("sentence index", indexed)],
+    )
+
+
+def test_first_sentence_of_many_terms(app_context, spanish):
+    "Time to get the first sentence of many terms, as the Anki export does."
+    words = _make_words(2000)
+    count = _add_read_texts(spanish, words)
+    terms = add_terms(spanish, words[0:500])
+    term_ids = [t.id for t in terms]
+    repo = ReferencesRepository(db.session)
+
+    def _one_at_a_time():
+        ret = {}
+        for tid in term_ids:
+            refs = repo.find_references_by_id(tid)["term"]
+            ret[tid] = refs[0].sentence if refs else ""
+        return ret
+
+    def _batched():
+        refs = repo.find_references_for_terms(term_ids, limit_per_term=1)
+        return {tid: r[0].sentence if r else "" for tid, r in refs.items()}
+
+    assert {k: v != "" for k, v in _batched().items()} == {
+        k: v != "" for k, v in _one_at_a_time().items()
+    }
+    single = best_time(_one_at_a_time, repeat=1)
+    batched = best_time(_batched, repeat=3)
+    report(
+        f"first sentence of {len(term_ids)} terms in {count} sentences",
+        [("find_references_by_id per term", single), ("batched", batched)],
+    )
@@ -0,0 +1,89 @@
+"""
+Term search (autocomplete) benchmark: trigram index vs scanning words.
+"""
+
+import random
+import time
+
+from lute.db import db
+from lute.term.model import Repository
+from tests.benchmark.timing import percentile, report
+
+
+def _add_words(language, count):
+    "Add count random terms, and some parents, with raw sql for speed."
+    rnd = random.Random(42)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {
+        "".join(rnd.choice(letters) for _ in range(rnd.randint(4, 12)))
+        for _ in range(count)
+    }
+    conn = db.session.connection()
+    conn.exec_driver_sql(
+        """insert into words (WoLgID, WoText, WoTextLC, WoStatus, WoTokenCount)
+        values (?, ?, ?, 1, 1)""",
+        [(language.id, w, w) for w in words],
+    )
+    conn.exec_driver_sql(
+        """insert into wordparents (WpWoID, WpParentWoID)
+        select WoID, WoID + 1 from words where WoID % 10 = 0
+        and WoID + 1 in (select WoID from words)"""
+    )
+    db.session.commit()
+    return sorted(words)
+
+
+def _scan_words(repo, language, s):
+    "The original search, a LIKE scan of all the language's words."
+    params = {
+        "text_lc": s,
+        "text_lc_wildcard": f"%{s}%",
+        "text_lc_starts_with": f"{s}%",
+        "langid": language.id,
+        "max_results": 50,
+    }
+    return repo._query_matches("", params)  # pylint: disable=protected-access
+
+
+def _keystroke_times(search, typed):
+    "Search times for each prefix of each of the typed words."
+    times = []
+    for word in typed:
+        for i in range(1, len(word) + 1):
+            start = time.perf_counter()
+            search(word[0:i])
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def test_autocomplete_keystrokes(app_context, spanish):
+    "p50 and p99 latency of searches while typing terms."
+    words = _add_words(spanish, 200000)
+    rnd = random.Random(1)
+    picks = rnd.sample(range(len(words)), 30)
+    typed = [words[i][rnd.randint(0, 2) :] for i in picks]
+    repo = Repository(db.session)
+
+    def _indexed(s):
+        return repo.find_matches(spanish.id, s)
+
+    def _scanned(s):
+        return _scan_words(repo, spanish, s)
+
+    for w in typed:
+        for i in range(1, len(w) + 1):
+            expected = [m.text for m in _scanned(w[0:i])]
+            assert [m.text for m in _indexed(w[0:i])] == expected, w[0:i]
+
+    scanned = _keystroke_times(_scanned, typed)
+    indexed = _keystroke_times(_indexed, typed)
+
+    name = f"autocomplete over {len(words)} terms, {len(indexed)} keystrokes"
+    for pct in [50, 99]:
+        report(
+            f"{name}, p{pct}",
+            [
+                ("LIKE scan of words", percentile(scanned, pct)),
+                ("indexed", percentile(indexed, pct)),
+            ],
+        )
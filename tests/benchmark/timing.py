@@ -0,0 +1,42 @@
+"""
+Timing helpers for benchmarks.
+"""
+
+import time
+
+
+def best_time(func, repeat=5, setup=None):
+    """
+    Return the best wall-clock time of repeat calls to func.
+
+    If given, setup is called (untimed) before each call.
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def report(name, results):
+    """
+    Print benchmark results.
+
+    results is a list of (label, seconds) tuples; the first is
+    the baseline that the others are compared against.
+    """
+    print(f"\n{name}", flush=True)
+    base = results[0][1]
+    for label, secs in results:
+        ratio = f"{base / secs:.1f}x" if secs > 0 else "-"
+        print(f"  {label:<30} {secs * 1000:10.2f} ms   {ratio}", flush=True)
+
+
+def percentile(values, pct):
+    "The pct percentile (nearest rank) of values, e.g. times."
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
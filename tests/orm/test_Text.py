@@ -3,6 +3,7 @@ Text mapping checks.
 """
 
 from datetime import datetime
+from sqlalchemy import event, text as sqltext
 from lute.models.book import Book, Text, TextBookmark, WordsRead
 from lute.db import db
 from tests.dbasserts import assert_record_count_equals
@@ -61,3 +62,52 @@ def test_delete_text_cascade_deletes_bookmarks_leaves_wordsread(empty_db, englis
     assert_record_count_equals(
         "select * from wordsread where wrtxid is null", 1, "nulled"
     )
+
+
+def test_token_cache_saved_and_deleted_with_text(empty_db, english):
+    "Parsed tokens are saved when the text is, and removed with it."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro. Un gato.")
+    db.session.add(t)
+    db.session.commit()
+    assert_record_count_equals("texttokencache", 1, "cached")
+
+    db.session.delete(t)
+    db.session.commit()
+    assert_record_count_equals("texttokencache", 0, "deleted")
+
+
+def test_sentences_only_rebuilt_if_text_or_settings_change(empty_db, english):
+    "Reloading the sentences of an unchanged text doesn't write to the db."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro. Un gato.")
+    t.read_date = datetime.now()
+    db.session.add(t)
+    db.session.commit()
+    sql = "select SeID, SeText from sentences order by SeOrder"
+    original = db.session.execute(sqltext(sql)).all()
+    assert len(original) == 2, "sanity check"
+
+    statements = []
+
+    def _record(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record)
+    try:
+        t.load_sentences()
+        db.session.add(t)
+        db.session.commit()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record)
+    writes = [s for s in statements if not s.lstrip().upper().startswith("SELECT")]
+    assert writes == [], "no writes"
+    assert db.session.execute(sqltext(sql)).all() == original, "same sentences"
+
+    english.character_substitutions = "perro=gato"
+    db.session.add(english)
+    t.load_sentences()
+    db.session.add(t)
+    db.session.commit()
+    texts = [r[1] for r in db.session.execute(sqltext(sql)).all()]
+    assert "\u200Bgato\u200B" in texts[0], "settings changed"
@@ -190,10 +190,27 @@ def test_empty_fields_not_posted():
 
 def test_sentence_lookup_finds_sentence_in_supplied_dict_or_does_db_call():
     refsrepo = Mock()
-    refsrepo.find_references_by_id.return_value = {"term": [Mock(sentence="Db lookup")]}
+    refsrepo.find_references_for_terms.side_effect = lambda ids, limit_per_term: {
+        i: [Mock(sentence="Db lookup")] for i in ids
+    }
     fixed_sentences = {"42": "Hello"}
     lookup = SentenceLookup(fixed_sentences, refsrepo)
     assert lookup.get_sentence_for_term("42") == "Hello", "looks up"
     assert lookup.get_sentence_for_term(42) == "Hello", "int ok, still finds"
     assert lookup.get_sentence_for_term(99) == "Db lookup", "falls back to db lookup"
     assert lookup.get_sentence_for_term("99") == "Db lookup", "falls back to db lookup"
+    refsrepo.find_references_for_terms.assert_called_once_with({99}, limit_per_term=1)
+
+
+def test_sentence_lookup_finds_all_term_sentences_in_one_db_call():
+    refsrepo = Mock()
+    refsrepo.find_references_for_terms.return_value = {
+        1: [Mock(sentence="One")],
+        2: [],
+    }
+    lookup = SentenceLookup({"3": "Three"}, refsrepo, [1, "2", 3])
+    refsrepo.find_references_for_terms.assert_not_called()
+    assert lookup.get_sentence_for_term(2) == "", "no refs"
+    assert lookup.get_sentence_for_term(1) == "One"
+    assert lookup.get_sentence_for_term(3) == "Three"
+    refsrepo.find_references_for_terms.assert_called_once_with({1, 2}, limit_per_term=1)
@@ -8,6 +8,7 @@ and retrieved from DB.
 import pytest
 
 from lute.db import db
+from lute.models.book import Text
 from lute.book.model import Book, Repository
 from tests.dbasserts import assert_sql_result
 
@@ -161,6 +162,43 @@ def test_split_by_paragraphs_scenario(
     assert "/".join(actuals) == "/".join(expected), f"scen {threshold}, {fulltext}"
 
 
+def test_split_large_book_parsed_in_chunks(app_context, repo, english):
+    "Books are parsed in chunks, which doesn't change the pages."
+    paras = [f"Para {i}. Here is a dog. And a cat." for i in range(3000)]
+    b = Book()
+    b.title = "Hola"
+    b.language_id = english.id
+    b.text = "\n".join(paras)
+    b.threshold_page_tokens = 250
+    b.split_by = "paragraphs"
+    dbbook = repo.add(b)
+    actuals = [t.text for t in dbbook.texts]
+    assert len(actuals) == 94, "32 paragraphs (256 words) per page"
+    assert "\n".join(actuals) == b.text
+
+
+def test_new_book_pages_not_kept_in_session(app_context, repo, english):
+    "Pages are flushed in batches, and dropped from the session until commit."
+    paras = [f"Para {i}. Here is a dog. And a cat." for i in range(3000)]
+    b = Book()
+    b.title = "Hola"
+    b.language_id = english.id
+    b.text = "\n".join(paras)
+    b.threshold_page_tokens = 250
+    b.split_by = "paragraphs"
+    dbbook = repo.add(b)
+    assert not [o for o in db.session if isinstance(o, Text)], "no texts in session"
+    count_sql = db.text("select count(*) from texts")
+    assert db.session.execute(count_sql).scalar() == 94, "flushed"
+
+    db.session.rollback()
+    assert_sql_result("select count(*) from texts", ["0"], "not committed")
+
+    dbbook = repo.add(b)
+    repo.commit()
+    assert [t.order for t in dbbook.texts] == list(range(1, 95)), "pages in order"
+
+
 def test_get_tags(app_context, new_book, repo):
     "Helper method test."
     assert repo.get_book_tags() == [], "no tags yet"
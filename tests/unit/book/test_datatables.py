@@ -5,9 +5,11 @@ Book tests.
 from datetime import datetime
 import pytest
 from lute.models.language import Language
+from lute.models.book import BookTag
 from lute.book.datatables import get_data_tables_list
 from lute.db import db
 from lute.db.demo import Service as DemoService
+from tests.dbasserts import assert_record_count_equals, assert_sql_result
 from tests.utils import make_book
 
 
@@ -77,3 +79,61 @@ def test_book_data_says_completed_if_last_page_has_been_read(
     actual = d["data"][0]
     assert actual["BkID"] == b.id, "correct book"
     assert actual["IsCompleted"] == 1, "completed"
+
+
+def test_book_summary_data_updated_when_texts_or_tags_change(
+    app_context, _dt_params, english
+):
+    "Listing data comes from booksummary, which triggers keep current."
+    b = make_book("title", ["Hello there.", "Bye."], english)
+    b.book_tags.append(BookTag.make_book_tag("zz"))
+    b.book_tags.append(BookTag.make_book_tag("aa"))
+    db.session.add(b)
+    db.session.commit()
+    _dt_params["search"] = {"value": "title", "regex": False}
+
+    def _listing():
+        d = get_data_tables_list(_dt_params, False, db.session)
+        assert len(d["data"]) == 1, "one book"
+        r = d["data"][0]
+        return [r["PageCount"], r["WordCount"], r["TagList"], r["IsCompleted"]]
+
+    sql = "select BsPageCount, BsWordCount, BsTagList, BsIsCompleted from booksummary"
+    assert_sql_result(sql, ["2; 3; aa, zz; 0"], "saved with book")
+    assert _listing() == [2, 3, "aa, zz", 0]
+    assert not db.session.dirty and not db.session.new, "listing only reads"
+
+    b.texts[0].word_count = 5
+    b.texts[1].word_count = 1
+    b.texts[1].read_date = datetime.now()
+    db.session.add(b)
+    db.session.commit()
+    assert_sql_result(sql, ["2; 6; aa, zz; 1"], "updated")
+    assert _listing() == [2, 6, "aa, zz", 1]
+
+    b.texts[0].start_date = datetime(2025, 1, 2)
+    db.session.add(b)
+    db.session.commit()
+    assert_sql_result(
+        "select BsLastOpenedDate from booksummary", ["2025-01-02 00:00:00.000000"]
+    )
+    assert _listing() == [2, 6, "aa, zz", 1], "page opened"
+
+    b.book_tags[0].text = "bb"
+    db.session.add(b)
+    db.session.commit()
+    assert _listing() == [2, 6, "aa, bb", 1], "tag changed"
+
+    b.book_tags.pop(0)
+    db.session.add(b)
+    db.session.commit()
+    assert _listing() == [2, 6, "aa", 1], "tag removed"
+
+    b.remove_page(2)
+    db.session.add(b)
+    db.session.commit()
+    assert _listing() == [1, 5, "aa", 0], "page removed"
+
+    db.session.delete(b)
+    db.session.commit()
+    assert_record_count_equals("select * from booksummary", 0, "book deleted")
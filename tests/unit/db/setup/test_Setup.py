@@ -8,7 +8,8 @@ import sqlite3
 from contextlib import closing
 import pytest
 
-from lute.db.setup.main import Setup, BackupManager
+import lute.db.setup.main
+from lute.db.setup.main import Setup, BackupManager, setup_term_search_index
 from lute.db.setup.migrator import SqliteMigrator
 
 
@@ -276,3 +277,44 @@ def test_existing_database_no_outstanding_migrations(tmp_path, migrator):
     setup.setup()
     backup_files = list(backup_dir.glob("*.gz"))
     assert len(backup_files) == 0, "STILL no backups"
+
+
+def test_term_search_index(tmp_path, monkeypatch):
+    """
+    The wordsfts index is loaded with existing words, and its
+    triggers are removed if sqlite can't support it.
+    """
+    dbfile = tmp_path / "testdb.db"
+
+    def _fts_matches(conn, s):
+        sql = "select rowid from wordsfts where wordsfts match ? order by rowid"
+        return [row[0] for row in conn.execute(sql, (f'"{s}"',))]
+
+    def _triggers(conn):
+        sql = "select count(*) from sqlite_master where type = 'trigger'"
+        return conn.execute(sql).fetchone()[0]
+
+    with closing(sqlite3.connect(dbfile)) as conn:
+        conn.execute("create table words (WoID integer primary key, WoTextLC text)")
+        conn.execute("insert into words values (1, 'gato'), (2, 'perro')")
+        conn.commit()
+
+        setup_term_search_index(conn)
+        assert _fts_matches(conn, "ato") == [1], "existing words indexed"
+        conn.execute("insert into words values (3, 'gatos')")
+        assert _fts_matches(conn, "ato") == [1, 3], "new words indexed"
+
+        setup_term_search_index(conn)
+        assert _fts_matches(conn, "ato") == [1, 3], "still same"
+
+        monkeypatch.setattr(
+            lute.db.setup.main, "term_search_index_supported", lambda: False
+        )
+        setup_term_search_index(conn)
+        assert _triggers(conn) == 0, "triggers removed"
+        conn.execute("insert into words values (4, 'ratos')")
+
+        monkeypatch.undo()
+        setup_term_search_index(conn)
+        assert _triggers(conn) == 3, "triggers restored"
+        assert _fts_matches(conn, "ato") == [1, 3, 4], "index rebuilt"
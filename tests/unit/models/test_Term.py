@@ -5,8 +5,10 @@ Term tests.
 import datetime
 import pytest
 from sqlalchemy import text
-from lute.models.term import Term, TermImage
+from lute.models.term import Term, TermImage, set_missing_readings
 from lute.models.repositories import TermRepository
+from lute.term.model import Repository
+from lute.term.service import Service, BulkTermUpdateData
 from lute.db import db
 from tests.dbasserts import assert_record_count_equals, assert_sql_result
 
@@ -261,3 +263,179 @@ def test_changing_status_of_status_0_term_resets_WoCreated(app_context, spanish)
     current_year = str(datetime.datetime.now().year)
     sql_updated = "select strftime('%Y', WoCreated) from words"
     assert_sql_result(sql_updated, [f"{current_year}"], "final")
+
+
+def test_ensure_unknown_terms(app_context, spanish):
+    "New unknowns are inserted and get ids, existing terms are left alone."
+    existing = Term(spanish, "gato")
+    existing.status = 3
+    db.session.add(existing)
+    db.session.commit()
+
+    terms = [Term.create_term_no_parsing(spanish, s) for s in ["Gato", "perro"]]
+    for t in terms:
+        t.status = 0
+    repo = TermRepository(db.session)
+    repo.ensure_unknown_terms(terms)
+    db.session.commit()
+
+    sql = "select WoID, WoText, WoStatus, WoTokenCount from words order by WoTextLC"
+    assert_sql_result(
+        sql,
+        [f"{existing.id}; gato; 3; 1", f"{terms[1].id}; perro; 0; 1"],
+        "perro added",
+    )
+    assert terms[0].id == existing.id, "existing id"
+    assert terms[1] not in db.session, "not added to session"
+
+
+def test_unknown_term_reading_calculated_when_needed(app_context, spanish, monkeypatch):
+    "Terms made from a page don't get a reading until it's asked for."
+    parser_class = type(spanish.parser)
+    monkeypatch.setattr(parser_class, "get_reading", lambda self, s: f"[{s}]")
+
+    t = Term.create_term_no_parsing(spanish, "gato")
+    t.status = 0
+    assert t.romanization is None, "not calculated"
+    assert t.get_romanization() == "[gato]"
+
+    t.status = 1
+    assert t.get_romanization() is None, "only unknowns calculated"
+    t.romanization = "GAH-toh"
+    assert t.get_romanization() == "GAH-toh"
+
+
+@pytest.fixture(name="_readings")
+def fixture_readings(spanish, monkeypatch):
+    "Fake Spanish readings, and a list of each get_readings() call's texts."
+    calls = []
+
+    def _get_readings(self, texts):  # pylint: disable=unused-argument
+        calls.append(list(texts))
+        return [f"[{s}]" for s in texts]
+
+    monkeypatch.setattr(type(spanish.parser), "get_readings", _get_readings)
+    return calls
+
+
+def test_set_missing_readings(app_context, spanish, _readings):
+    "Terms without readings get them in one call, set readings are kept."
+    t = Term(spanish, "gato")
+    assert t.romanization is None, "not set by text"
+    p = Term(spanish, "perro")
+    r = Term(spanish, "rata")
+    r.romanization = "RAH-tah"
+    set_missing_readings([t, p, r, t])
+
+    assert [t.romanization, p.romanization, r.romanization] == [
+        "[gato]",
+        "[perro]",
+        "RAH-tah",
+    ]
+    assert _readings == [["gato", "perro"]], "one call"
+
+
+def test_set_missing_readings_ignores_parser_errors(app_context, spanish, monkeypatch):
+    "A broken parser leaves the readings unset, and the terms can still be saved."
+
+    def _get_readings(self, texts):
+        raise RuntimeError("no mecab")
+
+    monkeypatch.setattr(type(spanish.parser), "get_readings", _get_readings)
+    t = Term(spanish, "gato")
+    set_missing_readings([t])
+    assert t.romanization is None
+    db.session.add(t)
+    db.session.commit()
+    assert_sql_result("select WoText, WoRomanization from words", ["gato; None"])
+
+
+def test_saving_terms_in_other_sessions_doesnt_get_readings(
+    app_context, spanish, _readings
+):
+    "Readings are only set by the term save paths, not on every commit."
+    db.session.add(Term(spanish, "gato"))
+    db.session.commit()
+    assert_sql_result("select WoText, WoRomanization from words", ["gato; None"])
+    assert not _readings, "no calls"
+
+
+def test_repository_new_terms_get_readings(app_context, spanish, _readings):
+    "Known terms get readings in one call, unknowns and set readings don't."
+    repo = Repository(db.session)
+    for text, status, reading in [
+        ("gato", 1, None),
+        ("perro", 1, None),
+        ("pez", 0, None),
+        ("rata", 1, "RAH-tah"),
+    ]:
+        bt = repo.find_or_new(spanish.id, text)
+        bt.status = status
+        bt.romanization = reading
+        repo.add(bt)
+    repo.commit()
+
+    sql = "select WoText, WoRomanization from words order by WoText"
+    expected = ["gato; [gato]", "perro; [perro]", "pez; None", "rata; RAH-tah"]
+    assert_sql_result(sql, expected)
+    assert [sorted(c) for c in _readings] == [["gato", "perro"]], "one call"
+
+
+def test_repository_reading_saved_when_term_leaves_unknown_status(
+    app_context, spanish, _readings
+):
+    "E.g. changing the status with a hotkey."
+    terms = [Term.create_term_no_parsing(spanish, s) for s in ["gato", "perro"]]
+    for t in terms:
+        t.status = 0
+    TermRepository(db.session).ensure_unknown_terms(terms)
+    db.session.commit()
+
+    repo = Repository(db.session)
+    for t in terms:
+        bt = repo.load(t.id)
+        bt.status = 1
+        bt.romanization = None
+        repo.add(bt)
+    repo.commit()
+
+    sql = "select WoText, WoStatus, WoRomanization from words order by WoText"
+    assert_sql_result(sql, ["gato; 1; [gato]", "perro; 1; [perro]"])
+    assert [sorted(c) for c in _readings] == [["gato", "perro"]], "one call"
+
+
+def test_bulk_update_reading_saved_when_term_leaves_unknown_status(
+    app_context, spanish, _readings
+):
+    "Bulk status changes of unknown terms save the readings."
+    terms = [Term.create_term_no_parsing(spanish, s) for s in ["gato", "perro"]]
+    for t in terms:
+        t.status = 0
+    TermRepository(db.session).ensure_unknown_terms(terms)
+    db.session.commit()
+
+    bud = BulkTermUpdateData(
+        term_ids=[t.id for t in terms], change_status=True, status_value=3
+    )
+    Service(db.session).apply_bulk_updates(bud)
+
+    sql = "select WoText, WoStatus, WoRomanization from words order by WoText"
+    assert_sql_result(sql, ["gato; 3; [gato]", "perro; 3; [perro]"])
+    assert [sorted(c) for c in _readings] == [["gato", "perro"]], "one call"
+
+
+def test_set_unknown_terms_status_saves_readings(app_context, spanish, _readings):
+    "Marking the rest as known keeps the readings."
+    terms = [Term.create_term_no_parsing(spanish, s) for s in ["gato", "perro"]]
+    for t in terms:
+        t.status = 0
+    repo = TermRepository(db.session)
+    repo.ensure_unknown_terms(terms)
+    db.session.commit()
+
+    repo.set_unknown_terms_status(spanish.id, ["gato", "perro", "pez"], 99)
+    db.session.commit()
+
+    sql = "select WoText, WoStatus, WoRomanization from words order by WoText"
+    assert_sql_result(sql, ["gato; 99; [gato]", "perro; 99; [perro]"])
+    assert _readings == [["gato", "perro"]], "one call"
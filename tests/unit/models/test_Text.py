@@ -3,7 +3,10 @@ Text tests.
 """
 
 from datetime import datetime
-from lute.models.book import Book, Text
+import sqlite3
+from lute.models.book import Book, Text, sqlite_lower
+from lute.parse.base import ParsedToken
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
 
 
 def transform_sentence(s):
@@ -33,3 +36,96 @@ def test_sentence_lifecycle(english):
     assert len(t.sentences) == 1, "changed"
 
     assert transform_sentence(t.sentences[0]) == "/Tengo/ /un/ /coche/./", "changed"
+
+
+def _token_data(tokens):
+    "Comparable token data."
+    return [
+        (t.token, t.is_word, t.is_end_of_sentence, t.sentence_number, t.order)
+        for t in tokens
+    ]
+
+
+def test_parsed_tokens_round_trip_through_cache(english):
+    "Cached tokens are the same as freshly parsed tokens."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro. Un gato.\nÉl está aquí.")
+    expected = _token_data(english.get_parsed_tokens(t.text))
+    assert _token_data(t.token_cache.get_tokens()) == expected
+
+
+def test_cached_tokens_used_until_text_or_settings_change(english):
+    "The cache key covers the text and the parser settings."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro.")
+    t.token_cache.set_tokens([ParsedToken("cached", True)])
+    assert [p.token for p in t.get_parsed_tokens()] == ["cached"]
+
+    english.character_substitutions = "perro=gato"
+    assert "gato" in [p.token for p in t.get_parsed_tokens()], "settings changed"
+
+    t.token_cache.set_tokens([ParsedToken("cached", True)])
+    t.text = "Un coche."
+    assert "coche" in [p.token for p in t.get_parsed_tokens()], "text changed"
+
+
+def test_cached_tokens_and_sentences_stale_if_parser_state_changes(
+    english, monkeypatch
+):
+    "The cache key covers the parser's own state, e.g. data files."
+    state = ["v1"]
+
+    def _cache_key(self, language):  # pylint: disable=unused-argument
+        return (language.parser_settings, state[0])
+
+    monkeypatch.setattr(SpaceDelimitedParser, "cache_key", _cache_key)
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro.")
+    t.load_sentences()
+    t.token_cache.set_tokens([ParsedToken("cached", True)])
+    sentences_key = t.sentences_key
+    assert [p.token for p in t.get_parsed_tokens()] == ["cached"]
+
+    state[0] = "v2"
+    assert "perro" in [p.token for p in t.get_parsed_tokens()], "re-parsed"
+    t.load_sentences()
+    assert t.sentences_key != sentences_key, "sentences rebuilt"
+
+
+def test_load_parsed_tokens_only_parses_uncached_texts(english):
+    "Texts with current cached tokens are left alone."
+    b = Book("hola", english)
+    cached = Text(b, "Tienes un perro.")
+    cached.token_cache.set_tokens([ParsedToken("cached", True)])
+    stale = Text(b, "Un gato.")
+    stale.token_cache.key = "old"
+
+    Text.load_parsed_tokens([cached, stale])
+    assert [p.token for p in cached.get_parsed_tokens()] == ["cached"]
+    expected = _token_data(english.get_parsed_tokens("Un gato."))
+    assert _token_data(stale.get_parsed_tokens()) == expected
+
+
+def test_text_created_with_parsed_tokens_uses_them(english):
+    "Tokens given to the constructor are cached, so the text isn't parsed."
+    b = Book("hola", english)
+    t = Text(b, "Tienes un perro.", 1, [ParsedToken("given", True)])
+    assert [p.token for p in t.get_parsed_tokens()] == ["given"]
+    assert t.word_count == 1
+
+
+def test_sqlite_lower_same_as_sqlite():
+    "sqlite_lower gives the same results as sqlite's LOWER."
+    strings = [
+        "",
+        "Tienes UN perro.",
+        "Ábrelo ÑANDÚ Über ÇA",
+        "İstanbul ISPARTA ıi",
+        "ΑΒΓ АБВ 學而 ẞ",
+        f"{chr(0x200B)}Hola{chr(0x200B)}",
+    ]
+    with sqlite3.connect(":memory:") as conn:
+        for s in strings:
+            expected = conn.execute("SELECT LOWER(?)", (s,)).fetchone()[0]
+            assert sqlite_lower(s) == expected, s
+    assert sqlite_lower(None) is None
@@ -0,0 +1,94 @@
+"""
+The original SpaceDelimitedParser tokenizing, kept as a reference.
+
+SpaceDelimitedParser must return exactly the same tokens as this does.
+Used for differential tests and benchmarks only.
+"""
+
+import functools
+import re
+from typing import List
+
+from lute.parse.base import ParsedToken
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+
+
+@functools.lru_cache
+def _compile_re_pattern(pattern: str, *args, **kwargs) -> re.Pattern:
+    "Compile regular expression pattern, cache result for fast re-use."
+    return re.compile(pattern, *args, **kwargs)
+
+
+class LegacySpaceDelimitedParser(SpaceDelimitedParser):
+    "Rebuilds the patterns from the language settings for each paragraph."
+
+    def preg_match_capture(self, pattern, subject):
+        "Return the matched text and their start positions in the subject."
+        compiled = _compile_re_pattern(pattern, flags=re.IGNORECASE)
+        matches = compiled.finditer(subject)
+        result = [[match.group(), match.start()] for match in matches]
+        return result
+
+    def _parse_to_tokens(self, text: str, lang):
+        "Returns ParsedToken array for given language."
+        replacements = lang.character_substitutions.split("|")
+        for replacement in replacements:
+            fromto = replacement.strip().split("=")
+            if len(fromto) >= 2:
+                rfrom = fromto[0].strip()
+                rto = fromto[1].strip()
+                text = text.replace(rfrom, rto)
+
+        text = text.replace("\r\n", "\n")
+        text = text.replace("{", "[")
+        text = text.replace("}", "]")
+
+        tokens = []
+        paras = text.split("\n")
+        pcount = len(paras)
+        for i, para in enumerate(paras):
+            self.parse_para(para, lang, tokens)
+            if i != (pcount - 1):
+                tokens.append(ParsedToken("¶", False, True))
+
+        return tokens
+
+    def parse_para(self, text: str, lang, tokens: List[ParsedToken]):
+        "Parse a string, appending the tokens to the list of tokens."
+        termchar = lang.word_characters.strip()
+        if not termchar:
+            termchar = SpaceDelimitedParser.get_default_word_characters()
+
+        splitex = lang.exceptions_split_sentences.replace(".", "\\.")
+        pattern = rf"({splitex}|[{termchar}]*)"
+        if splitex.strip() == "":
+            pattern = rf"([{termchar}]*)"
+
+        m = self.preg_match_capture(pattern, text)
+        wordtoks = list(filter(lambda t: t[0] != "", m))
+
+        def add_non_words(s):
+            "Add non-word token s to the list of tokens."
+            if not s:
+                return
+            splitchar = lang.regexp_split_sentences.strip()
+            if not splitchar:
+                splitchar = SpaceDelimitedParser.get_default_regexp_split_sentences()
+            pattern = f"[{re.escape(splitchar)}]"
+            has_eos = False
+            if pattern != "[]":  # Should never happen, but ...
+                allmatches = self.preg_match_capture(pattern, s)
+                has_eos = len(allmatches) > 0
+            tokens.append(ParsedToken(s, False, has_eos))
+
+        pos = 0
+        for wt in wordtoks:
+            w = wt[0]
+            wp = wt[1]
+            s = text[pos:wp]
+            add_non_words(s)
+            tokens.append(ParsedToken(w, True, False))
+            pos = wp + len(w)
+
+        s = text[pos:]
+        add_non_words(s)
@@ -1,7 +1,9 @@
 """
-JapaneseParser tests.
+ClassicalChineseParser tests.
 """
 
+import random
+import re
 from lute.parse.base import ParsedToken
 
 
@@ -72,3 +74,41 @@ def test_sample_2(classical_chinese):
         ["？", False, True],
     ]
     assert_tokens_equals(s, classical_chinese, expected)
+
+
+def _legacy_parsed_tokens(text, language):
+    "The original per-character regex parse."
+    text = re.sub(r"[ \t]+", "", text)
+    for replacement in language.character_substitutions.split("|"):
+        fromto = replacement.strip().split("=")
+        if len(fromto) >= 2:
+            text = text.replace(fromto[0].strip(), fromto[1].strip())
+    text = text.replace("\r\n", "\n").replace("{", "[").replace("}", "]")
+    text = text.replace("\n", "¶").strip()
+    pattern = f"[{language.word_characters}]"
+    return [
+        ParsedToken(
+            c,
+            re.match(pattern, c) is not None,
+            c in language.regexp_split_sentences or c == "¶",
+        )
+        for c in text
+    ]
+
+
+def test_same_as_per_character_regex(classical_chinese):
+    "The character table gives the same tokens as matching each character."
+    rnd = random.Random(7)
+    chars = "學而時習之不亦說乎有朋自遠方來，。？！；：「」 \t\n\r{}abcAZ1.?'…"
+    texts = ["".join(rnd.choice(chars) for _ in range(500)) for _ in range(20)]
+    for text in texts:
+        expected = [str(t) for t in _legacy_parsed_tokens(text, classical_chinese)]
+        actual = classical_chinese.parser.get_parsed_tokens(text, classical_chinese)
+        assert [str(t) for t in actual] == expected
+
+    classical_chinese.regexp_split_sentences = "，"
+    classical_chinese.word_characters = "a-z學"
+    for text in texts:
+        expected = [str(t) for t in _legacy_parsed_tokens(text, classical_chinese)]
+        actual = classical_chinese.parser.get_parsed_tokens(text, classical_chinese)
+        assert [str(t) for t in actual] == expected, "settings changed"
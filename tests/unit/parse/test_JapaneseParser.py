@@ -2,6 +2,9 @@
 JapaneseParser tests.
 """
 
+import os
+from types import SimpleNamespace
+from lute.parse import mecab_parser
 from lute.parse.mecab_parser import JapaneseParser
 from lute.models.term import Term
 from lute.settings.current import current_settings
@@ -106,3 +109,87 @@ def test_reading_setting(app_context):
     for k, v in cases.items():
         current_settings["japanese_reading"] = k
         assert p.get_reading("強い") == v, k
+
+
+def test_get_readings_same_as_get_reading(app_context):
+    "Batched readings match the single readings, in order."
+    texts = ["強い", "NHK", "どちら", "二人", "強いか"]
+    p = JapaneseParser()
+    assert p.get_readings(texts) == [p.get_reading(t) for t in texts]
+    assert len(p.get_readings([])) == 0
+
+
+class _FakeMeCab:
+    "Stand-in for natto MeCab, counting instances."
+
+    created = 0
+    dicts = []
+
+    def __init__(self, flags):
+        self.flags = flags
+        _FakeMeCab.created += 1
+
+
+def test_mecab_pool_reuses_taggers(monkeypatch):
+    "Taggers are reused per flags, and dropped if the MECAB_PATH changes."
+    monkeypatch.setattr(mecab_parser, "MeCab", _FakeMeCab)
+    monkeypatch.setenv("MECAB_PATH", "/some/path")
+    _FakeMeCab.created = 0
+    pool = mecab_parser.MeCabPool()
+
+    for _ in range(3):
+        with pool.tagger("-O yomi") as nm:
+            assert nm.flags == "-O yomi"
+    assert _FakeMeCab.created == 1, "reused"
+
+    with pool.tagger("-O yomi") as a:
+        with pool.tagger("-O yomi") as b:
+            assert a is not b, "in-use tagger not shared"
+    with pool.tagger("-F x") as nm:
+        assert nm.flags == "-F x"
+    assert _FakeMeCab.created == 3
+
+    monkeypatch.setenv("MECAB_PATH", "/other/path")
+    with pool.tagger("-O yomi"):
+        pass
+    assert _FakeMeCab.created == 4, "new tagger for new path"
+
+
+def test_mecab_pool_drops_tagger_after_error(monkeypatch):
+    "A tagger that raised isn't reused."
+    monkeypatch.setattr(mecab_parser, "MeCab", _FakeMeCab)
+    _FakeMeCab.created = 0
+    pool = mecab_parser.MeCabPool()
+    try:
+        with pool.tagger("-O yomi"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    with pool.tagger("-O yomi"):
+        pass
+    assert _FakeMeCab.created == 2
+
+
+def test_cache_key_covers_mecab_path_and_dictionaries(english, tmp_path, monkeypatch):
+    "Cached parse results are stale if MeCab or its dictionaries change."
+    monkeypatch.setattr(mecab_parser, "MeCab", _FakeMeCab)
+    monkeypatch.setattr(mecab_parser, "mecab_pool", mecab_parser.MeCabPool())
+    monkeypatch.setattr(JapaneseParser, "_dictionaries", {})
+    sysdic = tmp_path / "sys.dic"
+    sysdic.write_text("dic")
+    dicts = [SimpleNamespace(filepath=str(sysdic), version=102, size=1)]
+    monkeypatch.setattr(_FakeMeCab, "dicts", dicts)
+    monkeypatch.setenv("MECAB_PATH", "/some/path")
+
+    # Only the language's parser_settings are used, any language works.
+    p = JapaneseParser()
+    key = p.cache_key(english)
+    assert p.cache_key(english) == key, "unchanged"
+
+    st = os.stat(sysdic)
+    os.utime(sysdic, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    changed = p.cache_key(english)
+    assert changed != key, "dictionary file changed"
+
+    monkeypatch.setenv("MECAB_PATH", "/other/path")
+    assert p.cache_key(english) != changed, "MECAB_PATH changed"
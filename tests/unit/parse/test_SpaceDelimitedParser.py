@@ -281,3 +281,22 @@ def test_all_chars_in_categories_match_default_word_chars():
         c = chr(i)
         if unicodedata.category(c) in categories:
             assert regex.match(c), f"Match for {c}"
+
+
+def test_iter_parsed_tokens_same_as_get_parsed_tokens(english):
+    "Parsing in chunks gives the same tokens as parsing all at once."
+    text = "\n".join(
+        [f"Here is dog {i}.  A  cat {i}!\r\n\nThe end.  " for i in range(50)]
+    )
+    p = SpaceDelimitedParser()
+
+    def _summary(tokens):
+        return [(t.token, t.is_word, t.is_end_of_sentence) for t in tokens]
+
+    expected = _summary(p.get_parsed_tokens(text, english))
+    for chunk_size in [1, 10, 100, 10000]:
+        actual = _summary(p.iter_parsed_tokens(text, english, chunk_size))
+        assert actual == expected, chunk_size
+    lines = text.splitlines(keepends=True)
+    actual = _summary(p.iter_parsed_tokens(lines, english, 100))
+    assert actual == expected, "lines"
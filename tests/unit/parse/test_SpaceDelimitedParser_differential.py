@@ -0,0 +1,103 @@
+"""
+Differential tests: SpaceDelimitedParser vs the original tokenizing.
+"""
+
+import random
+import pytest
+
+from lute.models.language import Language
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+from tests.unit.parse.legacy_space_delimited_parser import (
+    LegacySpaceDelimitedParser,
+)
+
+
+def _random_text(rnd, length):
+    "Random text with words, digits, punctuation, and line breaks."
+    pieces = [
+        "gato",
+        "Perro",
+        "Sr.",
+        "Sra.",
+        "EE.UU.",
+        "niño",
+        "año",
+        "İstanbul",
+        "don't",
+        "2024",
+        "u",
+        "U",
+        "x",
+        " ",
+        " ",
+        "  ",
+        ". ",
+        "? ",
+        "¿",
+        "¡",
+        "!",
+        ", ",
+        "...",
+        ": ",
+        "{",
+        "}",
+        "\n",
+        "\r\n",
+        "—",
+        "。",
+        "\\",
+        "'",
+        "´",
+    ]
+    return "".join(rnd.choice(pieces) for _ in range(length))
+
+
+def _language(word_characters, split_sentences, exceptions, substitutions):
+    "Unsaved language with the settings."
+    lang = Language()
+    lang.name = "Test"
+    lang.parser_type = "spacedel"
+    lang.word_characters = word_characters
+    lang.regexp_split_sentences = split_sentences
+    lang.exceptions_split_sentences = exceptions
+    lang.character_substitutions = substitutions
+    return lang
+
+
+settings = [
+    ("", "", "", ""),
+    ("", ".!?", "Sr.|Sra.|EE.UU.", "´='|`='|’='"),
+    ("a-zA-ZÀ-ÖØ-öø-ȳáéíóúÁÉÍÓÚñÑ", ".!?:;", "Sr.|Sra.", "a=b|b=c"),
+    ("a-zA-Z'", "?!.Uu", "", "x=y"),
+    ("a-zA-Z0-9", "。", "Sr.", ""),
+]
+
+
+@pytest.mark.parametrize("word_characters,split_sentences,exceptions,subs", settings)
+def test_same_tokens_as_legacy(word_characters, split_sentences, exceptions, subs):
+    "Tokens match the original parsing exactly."
+    rnd = random.Random(42)
+    lang = _language(word_characters, split_sentences, exceptions, subs)
+    new_parser = SpaceDelimitedParser()
+    legacy_parser = LegacySpaceDelimitedParser()
+
+    def _summary(tokens):
+        return [(t.token, t.is_word, t.is_end_of_sentence) for t in tokens]
+
+    for _ in range(50):
+        s = _random_text(rnd, 200)
+        expected = _summary(legacy_parser.get_parsed_tokens(s, lang))
+        assert _summary(new_parser.get_parsed_tokens(s, lang)) == expected, s
+
+
+def test_tokenizer_rebuilt_when_settings_change():
+    "A new tokenizer is used when the language settings change."
+    lang = _language("a-z", ".", "", "")
+    p = SpaceDelimitedParser()
+    tokenizer = p.get_tokenizer(lang)
+    assert p.get_tokenizer(lang) is tokenizer, "cached"
+
+    assert [t.token for t in p.get_parsed_tokens("ab1", lang)] == ["ab", "1"]
+    lang.word_characters = "a-z0-9"
+    assert p.get_tokenizer(lang) is not tokenizer, "new settings"
+    assert [t.token for t in p.get_parsed_tokens("ab1", lang)] == ["ab1"]
@@ -0,0 +1,59 @@
+"""
+ParseExecutor tests.
+"""
+
+import pickle
+import pytest
+from lute.parse.executor import ParseExecutor, ParserLanguage, to_compact, from_compact
+
+
+def _token_data(tokens):
+    "Comparable token data."
+    return [
+        (t.token, t.is_word, t.is_end_of_sentence, t.sentence_number, t.order)
+        for t in tokens
+    ]
+
+
+texts = [
+    "Tienes un perro. Un gato.\nÉl está aquí.",
+    "Mr. Smith said hi.  Bye!",
+    "",
+    "Hola.\n\nOtra vez.",
+]
+
+
+@pytest.mark.parametrize("langname", ["english", "turkish", "classical_chinese"])
+def test_parser_language_parses_same_as_language(langname, request):
+    "Parsers only need the ParserLanguage's settings."
+    lang = request.getfixturevalue(langname)
+    pl = pickle.loads(pickle.dumps(ParserLanguage(lang.parser_settings)))
+    assert pl.parser_settings == lang.parser_settings
+    for s in texts:
+        expected = _token_data(lang.get_parsed_tokens(s))
+        compact = to_compact(lang.parser.get_parsed_tokens(s, pl))
+        assert _token_data(from_compact(pickle.loads(pickle.dumps(compact)))) == (
+            expected
+        )
+
+
+def test_no_workers_parses_in_process(english):
+    "Tokens are the same as parsing each text."
+    pe = ParseExecutor()
+    actual = pe.get_parsed_tokens_many(english, texts)
+    assert [_token_data(a) for a in actual] == [
+        _token_data(english.get_parsed_tokens(s)) for s in texts
+    ]
+
+
+def test_worker_processes_give_same_tokens(english):
+    "Smoke test of a real pool."
+    pe = ParseExecutor()
+    pe.workers = 2
+    try:
+        actual = pe.get_parsed_tokens_many(english, texts * 5)
+    finally:
+        pe.shutdown()
+    assert [_token_data(a) for a in actual] == [
+        _token_data(english.get_parsed_tokens(s)) for s in texts * 5
+    ]
@@ -0,0 +1,101 @@
+"""
+The original get_textitems algorithm, kept as a reference.
+
+The current lute.read.render.calculate_textitems get_textitems and
+get_string_indexes must return exactly the same results as these do.
+Used for differential tests and benchmarks only.
+"""
+
+import re
+from collections import Counter
+
+# pylint: disable=protected-access
+from lute.read.render.calculate_textitems import (
+    _create_missing_status_0_terms,
+    _make_textitem,
+    zws,
+)
+
+
+def legacy_get_string_indexes(strings, content):
+    """
+    Returns list of arrays: [[string, index], ...], using one
+    regex search per string.
+    """
+    searchcontent = zws + content + zws
+    zwsindexes = [index for index, letter in enumerate(searchcontent) if letter == zws]
+
+    ret = []
+
+    for s in strings:
+        pattern = rf"(?=({re.escape(zws + s + zws)}))"
+        add_matches = [
+            (s, zwsindexes.index(m.start()))
+            for m in re.finditer(pattern, searchcontent)
+        ]
+        ret.extend(add_matches)
+
+    return ret
+
+
+def legacy_get_textitems(tokens, terms, language, multiword_term_indexer=None):
+    """
+    Create TextItems for all tokens and matches, "write" them to an
+    array in reverse sorted order, and count the ids to get the
+    display counts.
+    """
+    # pylint: disable=too-many-locals
+    new_unknown_terms = _create_missing_status_0_terms(tokens, terms, language)
+
+    all_terms = terms + new_unknown_terms
+    text_to_term = {dt.text_lc: dt for dt in all_terms}
+
+    tokens_orig = [t.token for t in tokens]
+    tokens_lc = [language.parser.get_lowercase(t) for t in tokens_orig]
+
+    textitems = []
+
+    def _add_textitem(index, text_lc, count):
+        "Add a TextItem for position index in tokens."
+        text_orig = tokens_orig[index]
+        if count > 1:
+            text_orig = zws.join(tokens_orig[index : index + count])
+        text_lc = zws.join(tokens_lc[index : index + count])
+        sentence_number = tokens[index].sentence_number
+        term = text_to_term.get(text_lc, None)
+        ti = _make_textitem(index, text_orig, text_lc, count, sentence_number, term)
+        textitems.append(ti)
+
+    for index, _ in enumerate(tokens):
+        _add_textitem(index, tokens_lc[index], 1)
+
+    if multiword_term_indexer is not None:
+        for r in multiword_term_indexer.search_all(tokens_lc):
+            mwt = text_to_term[r[0]]
+            _add_textitem(r[1], r[0], mwt.token_count)
+    else:
+        multiword_terms = [t.text_lc for t in all_terms if t.token_count > 1]
+        for e in legacy_get_string_indexes(multiword_terms, zws.join(tokens_lc)):
+            count = e[0].count(zws) + 1
+            _add_textitem(e[1], e[0], count)
+
+    textitems = sorted(textitems, key=lambda x: (x.index, -x.token_count))
+
+    output_textitem_ids = [None] * len(tokens)
+    for ti in reversed(textitems):
+        for c in range(ti.index, ti.index + ti.token_count):
+            output_textitem_ids[c] = id(ti)
+
+    id_counts = dict(Counter(output_textitem_ids))
+    for ti in textitems:
+        ti.display_count = id_counts.get(id(ti), 0)
+
+    textitems = [ti for ti in textitems if ti.display_count > 0]
+
+    current_paragraph = 0
+    for ti in textitems:
+        ti.paragraph_number = current_paragraph
+        if ti.text == "¶":
+            current_paragraph += 1
+
+    return textitems
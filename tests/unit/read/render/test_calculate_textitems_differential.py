@@ -0,0 +1,93 @@
+"""
+Differential tests: get_textitems vs the original algorithm.
+"""
+
+import random
+import pytest
+
+from lute.models.term import Term
+from lute.parse.base import ParsedToken, ParseContext
+from lute.read.render.calculate_textitems import get_textitems, get_string_indexes
+from lute.read.render.multiword_indexer import MultiwordTermIndexer
+from tests.unit.read.render.legacy_calculate_textitems import (
+    legacy_get_textitems,
+    legacy_get_string_indexes,
+)
+
+
+def _random_page(rnd, word_count):
+    "Random tokens from a small vocabulary, so there are many matches."
+    tokens = []
+    for _ in range(word_count):
+        w = rnd.choice(["a", "b", "c", "A", "d"])
+        tokens.append(ParsedToken(w, True))
+        r = rnd.random()
+        if r < 0.05:
+            tokens.append(ParsedToken("¶", False, True))
+        elif r < 0.15:
+            tokens.append(ParsedToken(". ", False, True))
+        else:
+            tokens.append(ParsedToken(" ", False))
+    return ParseContext().number(tokens)
+
+
+def _random_terms(rnd, language, count):
+    "Random multiword terms, plus a few single words."
+    texts = {"a", "c"}
+    while len(texts) < count:
+        n = rnd.randint(2, 6)
+        texts.add(" ".join(rnd.choice(["a", "b", "c", "d"]) for _ in range(n)))
+    return [Term(language, t) for t in texts]
+
+
+def _summary(textitems):
+    "Comparable summary of textitems."
+    return [
+        (
+            ti.index,
+            ti.text,
+            ti.text_lc,
+            ti.token_count,
+            ti.display_count,
+            ti.display_text,
+            ti.sentence_number,
+            ti.paragraph_number,
+            ti.is_word,
+            ti.term.text_lc if ti.term is not None else None,
+        )
+        for ti in textitems
+    ]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_same_results_as_legacy(english, seed):
+    "Random pages with dense overlapping terms."
+    rnd = random.Random(seed)
+    tokens = _random_page(rnd, rnd.randint(0, 200))
+    terms = _random_terms(rnd, english, rnd.randint(2, 30))
+
+    expected = _summary(legacy_get_textitems(tokens, terms, english))
+    actual = _summary(get_textitems(tokens, terms, english))
+    assert actual == expected
+
+    mw = MultiwordTermIndexer()
+    for t in terms:
+        if t.token_count > 1:
+            mw.add(t.text_lc)
+    expected = _summary(legacy_get_textitems(tokens, terms, english, mw))
+    actual = _summary(get_textitems(tokens, terms, english, mw))
+    assert actual == expected, "with indexer"
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_string_indexes_same_as_legacy(english, seed):
+    "All overlapping matches are found, in any order."
+    rnd = random.Random(seed)
+    tokens = _random_page(rnd, rnd.randint(0, 200))
+    terms = _random_terms(rnd, english, rnd.randint(2, 30))
+    zws = "\u200B"
+    content = zws.join([english.get_lowercase(t.token) for t in tokens])
+    strings = [t.text_lc for t in terms]
+
+    expected = sorted(legacy_get_string_indexes(strings, content))
+    assert sorted(get_string_indexes(strings, content)) == expected
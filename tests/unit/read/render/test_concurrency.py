@@ -0,0 +1,79 @@
+"""
+Rendering pages from several threads at once.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from lute.db import db
+from lute.models.language import Language
+from lute.read.render.service import Service
+
+from tests.utils import add_terms
+
+
+def _pages():
+    "Pages with different numbers of sentences and paragraphs."
+    return [
+        "\n".join(
+            " ".join(f"Sentence {p}.{s} has a dog and a cat." for s in range(i % 7 + 1))
+            for p in range(i % 4 + 1)
+        )
+        for i in range(12)
+    ]
+
+
+def _summary(paragraphs):
+    "What's rendered for each item."
+    return [
+        (ti.span_id, ti.text, ti.paragraph_number, ti.sentence_number, ti.wo_status)
+        for para in paragraphs
+        for sentence in para
+        for ti in sentence
+    ]
+
+
+def test_parallel_parsing_gives_same_sentence_numbers(english):
+    "Parses in different threads don't share token numbering."
+    pages = _pages() * 5
+    expected = [
+        [(t.order, t.sentence_number) for t in english.get_parsed_tokens(p)]
+        for p in pages
+    ]
+
+    def _parse(page):
+        return [(t.order, t.sentence_number) for t in english.get_parsed_tokens(page)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        actual = list(pool.map(_parse, pages))
+    assert actual == expected
+
+
+def test_parallel_rendering_is_deterministic(app, app_context, english):
+    "Many pages rendered from several threads match single-thread renders."
+    add_terms(english, ["a dog", "cat", "Sentence"])
+    pages = _pages()
+    expected = [_summary(Service(db.session).get_paragraphs(p, english)) for p in pages]
+    language_id = english.id
+    start = threading.Barrier(6)
+
+    def _render_all(offset):
+        start.wait()
+        with app.app_context():
+            lang = db.session.get(Language, language_id)
+            svc = Service(db.session)
+            ret = {}
+            for n in range(len(pages) * 3):
+                i = (n + offset) % len(pages)
+                ret.setdefault(i, []).append(
+                    _summary(svc.get_paragraphs(pages[i], lang))
+                )
+            return ret
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(_render_all, range(6)))
+
+    for ret in results:
+        for i, summaries in ret.items():
+            for s in summaries:
+                assert s == expected[i], f"page {i}"
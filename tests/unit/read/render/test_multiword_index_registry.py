@@ -0,0 +1,194 @@
+"""
+Multiword index registry tests.
+"""
+
+import threading
+from sqlalchemy import text as sqltext
+from lute.db import db
+from lute.models.term import Term
+from lute.read.render.multiword_index_registry import (
+    MultiwordIndexRegistry,
+    multiword_index_registry,
+)
+
+from tests.utils import add_terms
+
+zws = "\u200B"  # zero-width space
+
+
+def _found(registry, language, tokens):
+    "Text_lcs found by the registry's indexer."
+    mw = registry.get_indexer(db.session, language)
+    return [r[0].replace(zws, "") for r in mw.search_all(tokens)]
+
+
+def test_index_is_reused_until_terms_change(english, app_context):
+    "Second lookup is a hit, and returns the same indexer."
+    add_terms(english, ["a cat"])
+    reg = MultiwordIndexRegistry()
+    mw1 = reg.get_indexer(db.session, english)
+    mw2 = reg.get_indexer(db.session, english)
+    assert mw1 is mw2, "same indexer"
+    stats = reg.stats()
+    assert stats["misses"] == 1, "first lookup builds"
+    assert stats["hits"] == 1, "second lookup hits"
+    assert stats["rebuilds"] == 1, "one build"
+    assert stats["languages"] == {english.id: 1}
+
+
+def test_saved_and_deleted_terms_update_index(english, app_context):
+    "ORM changes are applied without reloading from the db."
+    tokens = ["a", " ", "cat", " ", "here"]
+    reg = MultiwordIndexRegistry()
+    assert not _found(reg, english, tokens), "nothing yet"
+
+    # Listeners are attached to the global registry only, so
+    # simulate by passing the changes through to this one.
+    t = add_terms(english, ["a cat"])[0]
+    reg.term_added(english.id, t.text_lc, t.id, 1)
+    assert _found(reg, english, tokens) == ["a cat"]
+    assert reg.stats()["misses"] == 1, "still using loaded terms"
+
+    db.session.delete(t)
+    db.session.commit()
+    reg.term_removed(english.id, t.text_lc, 2)
+    assert not _found(reg, english, tokens), "removed"
+    assert reg.stats()["misses"] == 1, "still using loaded terms"
+
+
+def test_global_registry_tracks_orm_changes(english, app_context):
+    "Term saves and deletes go through the listeners."
+    reg = multiword_index_registry
+    tokens = ["a", " ", "cat"]
+    assert not _found(reg, english, tokens), "nothing yet"
+    misses = reg.stats()["misses"]
+
+    t = add_terms(english, ["a cat"])[0]
+    assert _found(reg, english, tokens) == ["a cat"]
+    db.session.delete(t)
+    db.session.commit()
+    assert not _found(reg, english, tokens), "removed"
+    assert reg.stats()["misses"] == misses, "no rebuild from db"
+
+
+def test_rollback_drops_index(english, app_context):
+    "Uncommitted changes are discarded."
+    reg = multiword_index_registry
+    tokens = ["a", " ", "cat"]
+    assert not _found(reg, english, tokens), "nothing yet"
+
+    t = Term(english, "a cat")
+    db.session.add(t)
+    db.session.flush()
+    assert _found(reg, english, tokens) == ["a cat"], "visible in same session"
+    db.session.rollback()
+    assert english.id not in reg.stats()["languages"], "dropped"
+    assert not _found(reg, english, tokens), "gone after rollback"
+
+
+def test_raw_sql_changes_force_rebuild(english, app_context):
+    "Changes outside of the ORM are detected."
+    add_terms(english, ["a cat"])
+    tokens = ["a", " ", "cat"]
+    reg = MultiwordIndexRegistry()
+    assert _found(reg, english, tokens) == ["a cat"]
+
+    db.session.execute(sqltext("delete from words"))
+    db.session.commit()
+    assert not _found(reg, english, tokens), "rebuilt"
+    assert reg.stats()["misses"] == 2, "rebuilt after change"
+
+
+def test_change_not_following_index_version_drops_index(english, app_context):
+    "Changes from versions the index hasn't seen can't be applied."
+    reg = MultiwordIndexRegistry()
+    assert not _found(reg, english, ["a"]), "loaded at version 0"
+    reg.term_added(english.id, "a", 42, 2)
+    assert english.id not in reg.stats()["languages"], "dropped"
+
+
+def test_raw_sql_change_with_same_ids_forces_rebuild(english, app_context):
+    "Same count and WoIDs, but a different term."
+    t = add_terms(english, ["a cat"])[0]
+    tokens = ["a", " ", "dog"]
+    reg = MultiwordIndexRegistry()
+    assert not _found(reg, english, tokens), "no match yet"
+
+    sql = (
+        f"update words set WoText='a dog', WoTextLC='a{zws} {zws}dog' where WoID={t.id}"
+    )
+    db.session.execute(sqltext(sql))
+    db.session.commit()
+    assert _found(reg, english, tokens) == ["a dog"], "rebuilt"
+
+
+def test_token_count_change_forces_rebuild(english, app_context):
+    "A term becoming multiword is picked up."
+    t = add_terms(english, ["a cat"])[0]
+    tokens = ["a", " ", "cat"]
+    reg = MultiwordIndexRegistry()
+    assert _found(reg, english, tokens) == ["a cat"]
+
+    sql = f"update words set WoTokenCount=1 where WoID={t.id}"
+    db.session.execute(sqltext(sql))
+    db.session.commit()
+    assert not _found(reg, english, tokens), "no longer multiword"
+
+
+def test_orm_change_is_applied_only_on_commit(english, app_context):
+    "Other sessions don't see uncommitted changes in the shared index."
+    reg = multiword_index_registry
+    tokens = ["a", " ", "cat"]
+    assert not _found(reg, english, tokens), "nothing yet"
+    db.session.add(Term(english, "a cat"))
+    db.session.flush()
+    assert reg.stats()["languages"][english.id] == 0, "not applied at flush"
+    db.session.commit()
+    assert reg.stats()["languages"][english.id] == 1, "applied at commit"
+    assert _found(reg, english, tokens) == ["a cat"]
+
+
+def test_terms_are_loaded_outside_the_lock(english, app_context):
+    "A language being loaded doesn't block lookups of other languages."
+    add_terms(english, ["a cat"])
+    reg = MultiwordIndexRegistry()
+    load_terms = reg._load_terms  # pylint: disable=protected-access
+    acquired = []
+
+    def _load_terms(session, language_id):
+        def _try_lock():
+            # pylint: disable=protected-access
+            acquired.append(reg._lock.acquire(timeout=1))
+            if acquired[-1]:
+                reg._lock.release()
+
+        th = threading.Thread(target=_try_lock)
+        th.start()
+        th.join()
+        return load_terms(session, language_id)
+
+    reg._load_terms = _load_terms  # pylint: disable=protected-access
+    assert _found(reg, english, ["a", " ", "cat"]) == ["a cat"]
+    assert acquired == [True], "lock free while loading"
+    assert reg.stats()["languages"] == {english.id: 1}, "index installed"
+
+
+def test_older_index_does_not_replace_newer(english, app_context):
+    "A slow load of an older version doesn't replace a newer index."
+    add_terms(english, ["a cat"])
+    reg = MultiwordIndexRegistry()
+    load_terms = reg._load_terms  # pylint: disable=protected-access
+
+    def _load_terms(session, language_id):
+        # Another thread installs the index for a newer version.
+        reg._load_terms = load_terms  # pylint: disable=protected-access
+        add_terms(english, ["a dog"])
+        reg.get_indexer(db.session, english)
+        return load_terms(session, language_id)
+
+    reg._load_terms = _load_terms  # pylint: disable=protected-access
+    stale = reg.get_indexer(db.session, english)
+    assert reg.stats()["misses"] == 2, "both loaded"
+    assert _found(reg, english, ["a", " ", "dog"]) == ["a dog"], "newer kept"
+    assert reg.stats()["hits"] == 1, "newer index used"
+    assert reg.get_indexer(db.session, english) is not stale
@@ -3,6 +3,7 @@ get_string_indexes tests.
 """
 
 import pytest
+from ahocorapy.keywordtree import KeywordTree
 from lute.read.render.multiword_indexer import MultiwordTermIndexer
 
 zws = "\u200B"  # zero-width space
@@ -55,3 +56,31 @@ def test_can_search_multiple_times_with_different_tokens():
     results = list(mw.search_all(["b", "a"]))
     assert len(results) == 1, "one match"
     assert results[0] == ("a", 1)
+
+
+def test_tokens_are_interned_once():
+    "Shared tokens get the same id, unknown page tokens get None."
+    mw = MultiwordTermIndexer()
+    mw.add(f"a{zws}b")
+    mw.add(f"b{zws}c")
+    assert mw.vocab == {"a": 0, "b": 1, "c": 2}
+    assert list(mw.token_ids(["c", "x", "a", "b"])) == [2, None, 0, 1]
+    assert list(mw.search_all(["a", "x", "b", "a", "b", "c"])) == [
+        (f"a{zws}b", 3),
+        (f"b{zws}c", 4),
+    ]
+
+
+def test_keywordtree_supports_int_tuple_keywords():
+    """
+    The indexer relies on KeywordTree accepting tuples of ints as
+    keywords, and any hashable symbols (including None) in the searched
+    sequence.  Checked here in case an ahocorapy version doesn't.
+    """
+    kwtree = KeywordTree()
+    kwtree.add((0, 1))
+    kwtree.add((1,))
+    kwtree.add((1, 1))
+    kwtree.finalize()
+    results = sorted(kwtree.search_all(iter([None, 0, 1, 1, None, 1])))
+    assert results == [((0, 1), 1), ((1,), 2), ((1,), 3), ((1,), 5), ((1, 1), 2)]
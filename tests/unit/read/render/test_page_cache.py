@@ -0,0 +1,136 @@
+"""
+Rendered page cache tests.
+"""
+
+from lute.db import db
+from lute.models.term import Term
+from lute.parse.space_delimited_parser import SpaceDelimitedParser
+from lute.read.render.page_cache import RenderedPageCache, rendered_page_cache
+from lute.read.service import Service
+
+from tests.utils import add_terms, make_book
+
+
+def _summary(paragraphs):
+    "What the reading template renders for each item."
+    return [
+        (
+            ti.span_id,
+            ti.html_class_string,
+            ti.status_class,
+            ti.wo_id,
+            ti.html_display_text,
+            ti.paragraph_number,
+        )
+        for para in paragraphs
+        for sentence in para
+        for ti in sentence
+    ]
+
+
+def _book(english, content="Here is a cat.  Here is a dog."):
+    "Saved single-page book."
+    b = make_book("Hi", content, english)
+    db.session.add(b)
+    db.session.commit()
+    return b
+
+
+def test_cached_page_renders_the_same(english, app_context):
+    "Second read is a cache hit, with the same rendered data."
+    add_terms(english, ["a cat", "dog"])
+    b = _book(english)
+    svc = Service(db.session)
+    rendered_page_cache.reset_counters()
+
+    first = _summary(svc.get_paragraphs(b, 1))
+    second = _summary(svc.get_paragraphs(b, 1))
+    assert second == first
+    stats = rendered_page_cache.stats()
+    assert (stats["misses"], stats["hits"], stats["entries"]) == (1, 1, 1)
+
+
+def test_term_changes_invalidate_page(english, app_context):
+    "Status changes and new multiword terms force a re-render."
+    b = _book(english)
+    svc = Service(db.session)
+    svc.get_paragraphs(b, 1)
+    rendered_page_cache.reset_counters()
+
+    svc.get_paragraphs(b, 1)
+    assert rendered_page_cache.stats()["hits"] == 1, "new unknowns don't invalidate"
+
+    t = db.session.query(Term).filter(Term.text_lc == "dog").one()
+    t.status = 3
+    db.session.add(t)
+    db.session.commit()
+    statuses = [c[2] for c in _summary(svc.get_paragraphs(b, 1)) if c[4] == "dog"]
+    assert statuses == ["status3"], "status updated"
+    assert rendered_page_cache.stats()["misses"] == 1, "re-rendered"
+
+    add_terms(english, ["a cat"])
+    texts = [c[4] for c in _summary(svc.get_paragraphs(b, 1))]
+    assert "a cat" in texts, "new multiword term shown"
+    assert rendered_page_cache.stats()["misses"] == 2, "re-rendered again"
+
+
+def test_rollback_invalidates_page(english, app_context):
+    "Pages rendered with uncommitted changes aren't reused."
+    t = add_terms(english, ["dog"])[0]
+    v = rendered_page_cache.term_version(english.id)
+
+    t.status = 4
+    db.session.add(t)
+    db.session.flush()
+    db.session.rollback()
+    assert rendered_page_cache.term_version(english.id) > v + 1
+
+
+def test_text_change_is_a_cache_miss(english, app_context):
+    "The text content is part of the key."
+    b = _book(english)
+    svc = Service(db.session)
+    svc.get_paragraphs(b, 1)
+    b.texts[0].text = "Something else."
+    db.session.add(b)
+    db.session.commit()
+    texts = [c[4] for c in _summary(svc.get_paragraphs(b, 1))]
+    assert "Something" in texts
+
+
+def test_least_recently_used_pages_are_evicted(english, app_context):
+    "Pages beyond the memory budget are dropped, oldest first."
+    b = make_book("Hi", ["Page a.", "Page b.", "Page c."], english)
+    db.session.add(b)
+    db.session.commit()
+    svc = Service(db.session)
+    pages = [svc.get_paragraphs(b, n) for n in [1, 2, 3]]
+
+    cache = RenderedPageCache()
+    keys = [cache.make_key(t, english) for t in b.texts]
+    cache.put(keys[0], pages[0])
+    one_page = cache.stats()["bytes"]
+    cache.max_bytes = one_page * 2
+    cache.put(keys[1], pages[1])
+    assert cache.get(keys[0]) is not None, "touch page 1"
+    cache.put(keys[2], pages[2])
+
+    assert cache.get(keys[1]) is None, "page 2 evicted"
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_key_changes_if_parser_state_changes(english, app_context, monkeypatch):
+    "E.g. if a parser's exceptions file is edited."
+    b = _book(english)
+    state = ["v1"]
+
+    def _cache_key(self, language):  # pylint: disable=unused-argument
+        return (language.parser_settings, state[0])
+
+    monkeypatch.setattr(SpaceDelimitedParser, "cache_key", _cache_key)
+    key = rendered_page_cache.make_key(b.texts[0], english)
+    assert rendered_page_cache.make_key(b.texts[0], english) == key, "same"
+    state[0] = "v2"
+    assert rendered_page_cache.make_key(b.texts[0], english) != key, "changed"
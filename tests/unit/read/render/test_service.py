@@ -2,7 +2,6 @@
 Render service tests.
 """
 
-from lute.parse.base import ParsedToken
 from lute.read.render.service import Service
 from lute.db import db
 from lute.models.term import Term
@@ -101,7 +100,6 @@ def test_smoke_get_paragraphs(spanish, app_context):
     sql = "select WoText from words order by WoText"
     assert_sql_result(sql, ["perro", "tengo/ /un", "un/ /gato"], "initial")
 
-    ParsedToken.reset_counters()
     service = Service(db.session)
     paras = service.get_paragraphs(t.text, t.book.language)
     assert len(paras) == 2
@@ -0,0 +1,60 @@
+"""
+TextItem tests.
+"""
+
+from lute.db import db
+from lute.models.term import Term
+from lute.read.render.text_item import TextItem
+
+zws = "\u200B"
+
+
+def _textitem(text, term=None):
+    "Make a TextItem for the text."
+    ti = TextItem(term)
+    ti.index = 0
+    ti.text = text
+    ti.text_lc = text.lower()
+    ti.is_word = term is not None
+    ti.token_count = len(text.split(zws))
+    ti.display_count = ti.token_count
+    return ti
+
+
+def test_display_text_follows_display_count(app_context):
+    "The display text is recalculated if the display count changes."
+    ti = _textitem(zws.join(["a", " ", "cat"]))
+    assert ti.html_display_text == "a cat"
+    ti.display_count = 1
+    assert ti.html_display_text == "cat"
+    ti.display_count = 3
+    assert ti.html_display_text == "a cat"
+
+
+def test_overlapped_and_extra_classes(english, app_context):
+    "Class string includes overlapped and any added classes."
+    t = Term(english, "cat")
+    db.session.add(t)
+    db.session.commit()
+    ti = _textitem("cat", t)
+    ti.add_html_class("newpara")
+    assert ti.html_class_string == f"textitem click word word{t.id} newpara"
+
+    ti.token_count = 2
+    expected = f"textitem click word word{t.id} overlapped newpara"
+    assert ti.html_class_string == expected
+
+
+def test_wo_id_available_after_term_saved(english, app_context):
+    "New terms get their id after the TextItem is made."
+    t = Term(english, "dog")
+    ti = _textitem("dog", t)
+    assert ti.wo_id is None
+    assert ti.status_class == "status0"
+
+    db.session.add(t)
+    db.session.commit()
+    assert ti.wo_id == t.id
+    restored = TextItem.from_compact(ti.to_compact())
+    assert restored.wo_id == t.id
+    assert restored.term is None
@@ -0,0 +1,92 @@
+"""
+Page prefetch tests.
+"""
+
+import threading
+
+from lute.db import db
+from lute.read.prefetch import PagePrefetcher
+from lute.read.render.page_cache import rendered_page_cache
+from lute.read.service import Service
+
+from tests.dbasserts import assert_sql_result
+from tests.utils import make_book
+
+
+def _book(english):
+    "Saved four-page book."
+    b = make_book(
+        "Hi", ["Page one.", "Page two.", "Page three.", "Page four."], english
+    )
+    db.session.add(b)
+    db.session.commit()
+    return b
+
+
+def test_next_pages_are_rendered_into_cache(app, app_context, english):
+    "Prefetched pages are cache hits, and their new terms are saved."
+    b = _book(english)
+    p = PagePrefetcher()
+    p.schedule(app, b.id, 1, 2)
+    p.wait()
+    assert p.stats()["rendered"] == 2, "pages 2 and 3"
+
+    sql = "select WoTextLC from words order by WoTextLC"
+    assert_sql_result(sql, ["page", "three", "two"], "new terms saved")
+
+    rendered_page_cache.reset_counters()
+    svc = Service(db.session)
+    svc.get_paragraphs(b, 2)
+    svc.get_paragraphs(b, 3)
+    svc.get_paragraphs(b, 4)
+    stats = rendered_page_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1), "page 4 not prefetched"
+
+
+def test_pages_past_end_of_book_are_skipped(app, app_context, english):
+    "Nothing to render after the last page."
+    b = _book(english)
+    p = PagePrefetcher()
+    p.schedule(app, b.id, 4, 2)
+    p.wait()
+    assert p.stats()["rendered"] == 0
+
+
+def test_rescheduling_cancels_stale_work(app, app_context, english):
+    "Jumping to another page drops the work queued for the old one."
+    b = _book(english)
+    p = PagePrefetcher()
+    p.schedule(app, b.id, 1, 3)
+    p.schedule(app, b.id, 3, 1)
+    p.wait()
+    stats = p.stats()
+    assert stats["scheduled"] == 4
+    assert stats["rendered"] + stats["cancelled"] == 4, "all accounted for"
+    assert stats["rendered"] < 4, "some work skipped"
+
+
+def test_cancel_doesnt_wait_for_running_prefetch(
+    app, app_context, english, monkeypatch
+):
+    "The reader's page doesn't wait on the render of a stale page."
+    b = _book(english)
+    started = threading.Event()
+    release = threading.Event()
+    prefetch_page = Service.prefetch_page
+
+    def _blocked_prefetch_page(self, dbbook, pagenum):
+        started.set()
+        assert release.wait(10), "released"
+        return prefetch_page(self, dbbook, pagenum)
+
+    monkeypatch.setattr(Service, "prefetch_page", _blocked_prefetch_page)
+    p = PagePrefetcher()
+    p.schedule(app, b.id, 1, 2)
+    assert started.wait(10), "page 2 prefetch running"
+    p.cancel_pending()
+    assert not release.is_set(), "returned while page 2 still running"
+
+    release.set()
+    p.wait()
+    stats = p.stats()
+    assert (stats["rendered"], stats["cancelled"]) == (1, 1), "page 3 dropped"
@@ -2,9 +2,11 @@
 Read service tests.
 """
 
-from lute.models.term import Term
+from sqlalchemy import text
+from lute.models.term import Term, Status
 from lute.book.model import Book, Repository
 from lute.read.service import Service
+from lute.read.render.service import Service as RenderService
 from lute.db import db
 
 from tests.dbasserts import assert_record_count_equals, assert_sql_result
@@ -119,3 +121,61 @@ def test_start_reading_creates_Terms_for_unknown_words(english, app_context):
         len(textitems) == 0
     ), f"All text items should have a term, but got {textitems}"
     assert_sql_result(sql, ["cat", "dog"], "after start")
+
+
+def _legacy_set_unknowns_to_known(tx):
+    "The original per-term ORM implementation, for regression checks."
+    rs = RenderService(db.session)
+    paragraphs = rs.get_paragraphs(tx.text, tx.book.language)
+    for ti in [ti for para in paragraphs for s in para for ti in s]:
+        if ti.is_word and ti.term.id is None and ti.term.status == 0:
+            db.session.add(ti.term)
+    db.session.commit()
+    for ti in [ti for para in paragraphs for s in para for ti in s]:
+        if ti.is_word and ti.term.status == 0:
+            ti.term.status = Status.WELLKNOWN
+            db.session.add(ti.term)
+    db.session.commit()
+
+
+def _mark_rest_known_snapshot(english, mark_func):
+    "Words after marking the rest known, with parents and hidden words."
+    db.session.execute(text("delete from words"))
+    db.session.commit()
+    for s, status in [("cat", 1), ("big", 0), ("big dog", 2), ("mouse", 0)]:
+        t = Term(english, s)
+        t.status = status
+        db.session.add(t)
+    db.session.commit()
+    cat = db.session.query(Term).filter(Term.text_lc == "cat").one()
+    child = Term(english, "cats")
+    child.status = 0
+    child.parents.append(cat)
+    child.sync_status = True
+    db.session.add(child)
+    db.session.commit()
+
+    b = Book()
+    b.title = "blah"
+    b.language_id = english.id
+    b.text = "The big dog and cats saw a mouse."
+    r = Repository(db.session)
+    dbbook = r.add(b)
+    r.commit()
+    mark_func(dbbook.texts[0])
+    db.session.expire_all()
+
+    sql = "select WoTextLC, WoStatus, WoSyncStatus from words order by WoTextLC"
+    return db.session.execute(text(sql)).fetchall()
+
+
+def test_set_unknowns_to_known_same_as_legacy(english, app_context):
+    "Set-based updates match the ORM updates, including parent syncing."
+    expected = _mark_rest_known_snapshot(english, _legacy_set_unknowns_to_known)
+    service = Service(db.session)
+    actual = _mark_rest_known_snapshot(english, service.set_unknowns_to_known)
+    assert actual == expected
+    zws = "\u200B"
+    assert ("cat", 99, 0) in actual, "parent synced with child"
+    assert ("big", 0, 0) in actual, "hidden by big dog"
+    assert (f"big{zws} {zws}dog", 2, 0) in actual, "multiword unchanged"
@@ -7,8 +7,10 @@ and retrieved from DB.
 
 from datetime import datetime
 import pytest
+from sqlalchemy import text as sqltext
 
 from lute.db import db
+from lute.db.data_cleanup import clean_data
 from lute.term.model import Term, Repository, ReferencesRepository
 from tests.dbasserts import assert_record_count_equals
 from tests.utils import add_terms, make_text
@@ -267,3 +269,52 @@ def test_can_get_references_by_term_id_including_unread(spanish):
     sentences = [r.sentence for r in refs["term"]]
     expected = ["<b>Tengo</b> un gato."]
     assert sentences == expected, "including unread"
+
+
+@pytest.mark.sentences
+def test_multiword_reference_tokens_must_be_together(spanish, refsrepo):
+    "Sentences with all of the term's tokens, but not together, aren't found."
+    _make_read_text("hola", "Un gato tengo.  Tengo un gato.", spanish)
+    t = add_terms(spanish, ["tengo un", "un tengo"])
+    refs = refsrepo.find_references(t[0])
+    assert [r.sentence for r in refs["term"]] == ["<b>Tengo un</b> gato."]
+    refs = refsrepo.find_references(t[1])
+    assert [r.sentence for r in refs["term"]] == []
+
+
+@pytest.mark.sentences
+def test_references_use_sentence_index_loaded_by_cleanup(spanish, refsrepo):
+    "Sentences are found from the index, which data cleanup loads if missing."
+    _make_read_text("hola", "Tengo un gato.", spanish)
+    t = add_terms(spanish, ["gato"])[0]
+    assert len(refsrepo.find_references(t)["term"]) == 1, "indexed when created"
+
+    db.session.execute(sqltext("delete from sentencetokens"))
+    db.session.commit()
+    assert len(refsrepo.find_references(t)["term"]) == 0, "not indexed"
+
+    clean_data(db.session, lambda s: None)
+    assert len(refsrepo.find_references(t)["term"]) == 1, "indexed by cleanup"
+
+
+@pytest.mark.sentences
+def test_find_references_for_many_terms(spanish):
+    "Each term gets its own references, up to the limit."
+    _make_read_text("hola", "Tengo un gato.  Tengo un perro.  Un gato.", spanish)
+    t = add_terms(spanish, ["tengo", "gato", "tengo un", "nada", "un_gato"])
+    refsrepo = ReferencesRepository(db.session, limit=2)
+    refs = refsrepo.find_references_for_terms([tt.id for tt in t])
+
+    def _sentences(term):
+        return sorted(r.sentence for r in refs[term.id])
+
+    assert _sentences(t[0]) == ["<b>Tengo</b> un gato.", "<b>Tengo</b> un perro."]
+    assert _sentences(t[1]) == ["Tengo un <b>gato</b>.", "Un <b>gato</b>."]
+    assert _sentences(t[2]) == ["<b>Tengo un</b> gato.", "<b>Tengo un</b> perro."]
+    assert _sentences(t[3]) == [], "no refs"
+    single = sorted(r.sentence for r in refsrepo.find_references(t[4])["term"])
+    assert _sentences(t[4]) == single, "wildcard term searched separately"
+    assert refs[t[0].id][0].title == "hola (1/1)"
+
+    refs = refsrepo.find_references_for_terms([t[0].id, t[1].id], limit_per_term=1)
+    assert [len(refs[tt.id]) for tt in t[0:2]] == [1, 1], "limited"
@@ -6,6 +6,7 @@ and retrieved from DB.
 """
 
 import pytest
+from sqlalchemy import text as sqltext
 
 from lute.models.term import Term as DBTerm, TermTag
 from lute.db import db
@@ -760,3 +761,53 @@ def test_find_matches_terms_with_children_go_to_top(spanish, repo):
     )
     assert_find_matches_returns(repo, spanish, "ab", ["abcParent", "abc"])
     assert_find_matches_returns(repo, spanish, "abc", ["abc", "abcParent"])
+
+
+@pytest.mark.find_match
+def test_find_matches_term_search_index_kept_in_sync(spanish, repo):
+    "The wordsfts index is updated when terms are added, changed, or deleted."
+    gato = add_terms(spanish, ["gato", "perro"])[0]
+    assert_find_matches_returns(repo, spanish, "ato", ["gato"])
+
+    db.session.execute(
+        sqltext(
+            "update words set WoText = 'gatos', WoTextLC = 'gatos' where WoID = :id"
+        ),
+        {"id": gato.id},
+    )
+    db.session.commit()
+    assert_find_matches_returns(repo, spanish, "ato", ["gatos"])
+    assert_find_matches_returns(repo, spanish, "tos", ["gatos"])
+
+    db.session.execute(sqltext("delete from words where WoTextLC = 'perro'"))
+    db.session.commit()
+    assert_find_matches_returns(repo, spanish, "err", [])
+    sql = "select rowid from wordsfts where wordsfts match '\"err\"'"
+    assert_sql_result(sql, [], "removed from index")
+
+
+@pytest.mark.find_match
+def test_find_matches_without_term_search_index(spanish, repo, monkeypatch):
+    "If sqlite doesn't support the index, words are scanned."
+    add_terms(spanish, ["tener", "contener"])
+    monkeypatch.setattr(Repository, "_term_search_index_exists", lambda self: False)
+    assert_find_matches_returns(repo, spanish, "ene", ["contener", "tener"])
+
+
+@pytest.mark.find_match
+def test_find_matches_short_search_only_checks_starting_terms_if_enough(spanish, repo):
+    "If there are max_results terms starting with the search, others aren't needed."
+    add_terms(spanish, ["ab", "abc", "cab"])
+    t = Term()
+    t.language_id = spanish.id
+    t.text = "axe"
+    t.parents.append("ad")
+    repo.add(t)
+    repo.commit()
+
+    def _matches(s, max_results):
+        return [m.text for m in repo.find_matches(spanish.id, s, max_results)]
+
+    assert _matches("a", 2) == ["ad", "ab"], "parent first"
+    assert _matches("a", 10) == ["ad", "ab", "abc", "axe", "cab"], "all"
+    assert _matches("b", 1) == ["ab"], "no terms start with b"
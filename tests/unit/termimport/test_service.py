@@ -0,0 +1,63 @@
+"""
+Term import service tests.
+"""
+
+import pytest
+
+from lute.db import db
+from lute.termimport.service import Service
+
+from tests.dbasserts import assert_sql_result
+
+
+@pytest.fixture(name="_readings")
+def fixture_readings(spanish, monkeypatch):
+    "Fake Spanish readings, noting each call."
+    calls = []
+    parser_class = type(spanish.parser)
+
+    def _get_reading(self, s):  # pylint: disable=unused-argument
+        calls.append(s)
+        return f"[{s}]"
+
+    def _get_readings(self, texts):  # pylint: disable=unused-argument
+        calls.append(list(texts))
+        return [f"[{s}]" for s in texts]
+
+    monkeypatch.setattr(parser_class, "get_reading", _get_reading)
+    monkeypatch.setattr(parser_class, "get_readings", _get_readings)
+    return calls
+
+
+def _import(tmp_path, content, new_as_unknowns=False):
+    "Import the csv content."
+    path = tmp_path / "import.csv"
+    path.write_text(content, encoding="utf-8")
+    Service(db.session).import_file(str(path), True, True, new_as_unknowns)
+
+
+def test_new_terms_get_readings_in_one_call(app_context, tmp_path, _readings):
+    "Readings of terms without a pronunciation are got together."
+    content = "language,term,translation\nSpanish,gato,cat\nSpanish,perro,dog\n"
+    _import(tmp_path, content)
+    sql = "select WoText, WoRomanization from words order by WoText"
+    assert_sql_result(sql, ["gato; [gato]", "perro; [perro]"])
+    assert [sorted(c) for c in _readings] == [["gato", "perro"]], "one batch call"
+
+
+def test_imported_pronunciation_is_kept(app_context, tmp_path, _readings):
+    "The file's pronunciation is used, even if empty."
+    content = "language,term,pronunciation\nSpanish,gato,GAH-toh\nSpanish,perro,\n"
+    _import(tmp_path, content)
+    sql = "select WoText, WoRomanization from words order by WoText"
+    assert_sql_result(sql, ["gato; GAH-toh", "perro; "])
+    assert len(_readings) == 0, "not calculated"
+
+
+def test_terms_imported_as_unknown_have_no_readings(app_context, tmp_path, _readings):
+    "Readings of unknowns are calculated when needed."
+    content = "language,term\nSpanish,gato\n"
+    _import(tmp_path, content, new_as_unknowns=True)
+    sql = "select WoText, WoStatus, WoRomanization from words"
+    assert_sql_result(sql, ["gato; 0; None"])
+    assert len(_readings) == 0, "not calculated"
@@ -2,8 +2,11 @@
 DataTables sqlite tests.
 """
 
+import random
 import re
 import pytest
+from sqlalchemy import text
+from lute.db import db
 from lute.utils.data_tables import DataTablesSqliteQuery
 
 # pylint: disable=line-too-long
@@ -122,3 +125,108 @@ def test_search_regex_markers(basesql, parameters):
     assert_where_equals(
         "^XXX$", "(Color LIKE '' || :s0 || '' OR Food LIKE '' || :s0 || '')"
     )
+
+
+def test_key_column_and_seek(basesql, parameters):
+    "The key column is added to the sort, and seeking replaces the offset."
+    actual = DataTablesSqliteQuery.get_sql(
+        basesql, parameters, "CatID", ["red", "red", None, 7]
+    )
+    expected = "SELECT * FROM (select * from (select CatID, Color, Food from Cats) realbase WHERE (Color > :seek0 OR (Color = :seek0 AND (Food IS NOT NULL OR (Food IS NULL AND CatID > :seek2)))) ORDER BY Color asc, Color, Food, CatID LIMIT 50) src ORDER BY Color asc, Color, Food, CatID"
+    assert actual["data"] == expected
+    assert actual["params"] == {"seek0": "red", "seek2": 7}
+
+
+@pytest.fixture(name="cats")
+def fixture_cats(app_context):
+    "Cats table with some nulls and duplicate values."
+    rnd = random.Random(42)
+    colors = ["red", "black", None, "white"]
+    foods = ["fish", None, "mice"]
+    db.session.execute(
+        text("create temp table Cats (CatID integer primary key, Color, Food)")
+    )
+    for i in range(1, 101):
+        db.session.execute(
+            text("insert into Cats values (:i, :c, :f)"),
+            {"i": i, "c": rnd.choice(colors), "f": rnd.choice(foods)},
+        )
+    yield
+    db.session.execute(text("drop table Cats"))
+
+
+def _all_pages(basesql, parameters, key_column, length):
+    "Data of all pages, read in order."
+    ret = []
+    parameters["length"] = length
+    for start in range(0, 100, length):
+        parameters["start"] = start
+        conn = db.session.connection()
+        d = DataTablesSqliteQuery.get_data(basesql, parameters, conn, key_column)
+        ret.append([r["CatID"] for r in d["data"]])
+    return ret
+
+
+@pytest.mark.parametrize(
+    "order",
+    [
+        [{"column": "1", "dir": "asc"}],
+        [{"column": "1", "dir": "desc"}],
+        [{"column": "2", "dir": "desc"}, {"column": "1", "dir": "asc"}],
+    ],
+)
+def test_keyset_pages_same_as_offset_pages(
+    cats, basesql, parameters, monkeypatch, order
+):  # pylint: disable=unused-argument,too-many-arguments,too-many-positional-arguments
+    "Seeking past the previous page gets the same pages as using offsets."
+    parameters["order"] = order
+    seeks = []
+    get_sql = DataTablesSqliteQuery.get_sql
+
+    def _get_sql(base_sql, params, key_column=None, seek_after=None):
+        seeks.append(seek_after)
+        return get_sql(base_sql, params, key_column, seek_after)
+
+    expected = _all_pages(basesql, parameters, "CatID", 100)[0]
+    assert len(set(expected)) == 100, "sanity check"
+    offset_pages = _all_pages(basesql, parameters, None, 7)
+    monkeypatch.setattr(DataTablesSqliteQuery, "get_sql", _get_sql)
+    keyset_pages = _all_pages(basesql, parameters, "CatID", 7)
+
+    assert [i for p in keyset_pages for i in p] == expected
+    assert len([s for s in seeks if s is not None]) == 14, "seek used"
+    # The offset pages don't have a unique sort, but have the same rows.
+    assert [sorted(p) for p in offset_pages] == [sorted(p) for p in keyset_pages]
+
+
+def test_counts_cached_until_data_changes(cats, basesql, parameters, monkeypatch):
+    "The total count is only rerun if the data changes."
+    # pylint: disable=unused-argument
+    counts = []
+    conn = db.session.connection()
+    execute = conn.execute
+
+    def _execute(sql, prms=None):
+        if "count(*)" in str(sql):
+            counts.append(str(sql))
+        return execute(sql, prms)
+
+    monkeypatch.setattr(conn, "execute", _execute)
+
+    def _totals():
+        d = DataTablesSqliteQuery.get_data(basesql, parameters, conn)
+        return [d["recordsTotal"], d["recordsFiltered"]]
+
+    assert _totals() == [100, 100]
+    assert len(counts) == 1, "no filtered count without search"
+    assert _totals() == [100, 100]
+    assert len(counts) == 1, "total cached"
+
+    execute(text("delete from Cats where CatID > 90"))
+    assert _totals() == [90, 90]
+    assert len(counts) == 2, "total recounted"
+
+    parameters["search"]["value"] = "red"
+    execute(text("update Cats set Color = 'red', Food = 'fish' where CatID = 1"))
+    filtered = execute(text("select count(*) from Cats where Color = 'red'")).scalar()
+    assert _totals() == [90, filtered]